@@ -55,6 +55,7 @@ INSTALLED_APPS = [
     "faculty",
     "schedule",
     "ticket",
+    "eventcalendar",
 ]
 
 MIDDLEWARE = [
@@ -145,6 +146,68 @@ SOCIAL_AUTH_GOOGLE_OAUTH2_AUTH_EXTRA_ARGUMENTS = {
     "prompt": "consent",
 }
 
+# Google Calendar
+GOOGLE_CALENDAR_CLIENT_CACHE_SIZE = int(
+    os.environ.get("GOOGLE_CALENDAR_CLIENT_CACHE_SIZE", 512)
+)
+# Deadline (seconds) of every socket operation of a google call
+GOOGLE_CALENDAR_HTTP_TIMEOUT = int(os.environ.get("GOOGLE_CALENDAR_HTTP_TIMEOUT", 5))
+# Circuit breaker around google calls: this many failures within the window
+# (seconds) open it, and it stays open for the reset timeout (seconds)
+GOOGLE_CALENDAR_BREAKER_THRESHOLD = int(
+    os.environ.get("GOOGLE_CALENDAR_BREAKER_THRESHOLD", 5)
+)
+GOOGLE_CALENDAR_BREAKER_WINDOW = int(
+    os.environ.get("GOOGLE_CALENDAR_BREAKER_WINDOW", 30)
+)
+GOOGLE_CALENDAR_BREAKER_RESET_TIMEOUT = int(
+    os.environ.get("GOOGLE_CALENDAR_BREAKER_RESET_TIMEOUT", 30)
+)
+# Point these at `manage.py fake_google_calendar` to run without google
+GOOGLE_CALENDAR_API_URL = os.environ.get(
+    "GOOGLE_CALENDAR_API_URL", "https://www.googleapis.com/calendar/v3"
+)
+GOOGLE_TOKEN_URI = os.environ.get(
+    "GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token"
+)
+# Async client: requests in flight per process and per user, retries of
+# 429/5xx answers and the backoff base (seconds) used with full jitter
+GOOGLE_CALENDAR_ASYNC_CONCURRENCY = int(
+    os.environ.get("GOOGLE_CALENDAR_ASYNC_CONCURRENCY", 100)
+)
+GOOGLE_CALENDAR_ASYNC_USER_CONCURRENCY = int(
+    os.environ.get("GOOGLE_CALENDAR_ASYNC_USER_CONCURRENCY", 4)
+)
+GOOGLE_CALENDAR_ASYNC_RETRIES = int(os.environ.get("GOOGLE_CALENDAR_ASYNC_RETRIES", 3))
+GOOGLE_CALENDAR_ASYNC_BACKOFF = float(
+    os.environ.get("GOOGLE_CALENDAR_ASYNC_BACKOFF", 0.5)
+)
+# Stored events older than this (seconds) trigger a background sync
+GOOGLE_CALENDAR_SYNC_STALE_AFTER = int(
+    os.environ.get("GOOGLE_CALENDAR_SYNC_STALE_AFTER", 5 * 60)
+)
+# How many past days a full sync fetches
+GOOGLE_CALENDAR_SYNC_WINDOW_DAYS = int(
+    os.environ.get("GOOGLE_CALENDAR_SYNC_WINDOW_DAYS", 7)
+)
+# Push notification channels lifetime and how early (seconds) they are renewed
+GOOGLE_CALENDAR_CHANNEL_TTL = int(
+    os.environ.get("GOOGLE_CALENDAR_CHANNEL_TTL", 7 * 24 * 60 * 60)
+)
+GOOGLE_CALENDAR_CHANNEL_RENEW_BEFORE = int(
+    os.environ.get("GOOGLE_CALENDAR_CHANNEL_RENEW_BEFORE", 24 * 60 * 60)
+)
+# Access tokens expiring within this many seconds are refreshed in the background
+GOOGLE_TOKEN_REFRESH_BEFORE = int(
+    os.environ.get("GOOGLE_TOKEN_REFRESH_BEFORE", 15 * 60)
+)
+GOOGLE_TOKEN_REFRESH_BATCH_SIZE = int(
+    os.environ.get("GOOGLE_TOKEN_REFRESH_BATCH_SIZE", 200)
+)
+GOOGLE_TOKEN_REFRESH_CONCURRENCY = int(
+    os.environ.get("GOOGLE_TOKEN_REFRESH_CONCURRENCY", 20)
+)
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -180,7 +243,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "utils.api.custom_pagination.CustomLimitOffsetPagination",
     "PAGE_SIZE": 36,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedPrincipalJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_THROTTLE_CLASSES": [
@@ -196,6 +259,51 @@ REST_FRAMEWORK = {
     "ALLOWED_VERSIONS": ["v1"],
 }
 
+# Password checks run in a small thread pool per worker (see users.passwords),
+# logins past WORKERS + QUEUE_SIZE concurrent checks get a 503
+PASSWORD_HASHER_OFFLOAD = os.environ.get("PASSWORD_HASHER_OFFLOAD", "1") == "1"
+PASSWORD_HASHER_WORKERS = int(os.environ.get("PASSWORD_HASHER_WORKERS", 2))
+PASSWORD_HASHER_QUEUE_SIZE = int(os.environ.get("PASSWORD_HASHER_QUEUE_SIZE", 8))
+
+# Seconds a cached principal (see users.principal) lives without invalidation
+PRINCIPAL_CACHE_TIMEOUT = int(os.environ.get("PRINCIPAL_CACHE_TIMEOUT", 15 * 60))
+# Seconds a cached /auth/me document (see users.profile) lives
+PROFILE_CACHE_TIMEOUT = int(os.environ.get("PROFILE_CACHE_TIMEOUT", 60 * 60))
+# Seconds a worker serves its in-memory faculty catalog (see faculty.catalog)
+# before checking the version again
+CATALOG_VERSION_CHECK_INTERVAL = float(
+    os.environ.get("CATALOG_VERSION_CHECK_INTERVAL", 1)
+)
+# Seconds a cached instructor directory response (see utils.api.response_cache)
+# lives, change the namespace to drop all of them
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 10 * 60))
+RESPONSE_CACHE_NAMESPACE = os.environ.get("RESPONSE_CACHE_NAMESPACE", "1")
+# Instructors read per round trip of the directory export (see users.export)
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 500))
+
+# Denied refresh tokens live in redis (see users.denylist), every process
+# keeps a bloom filter of them and catches up every SYNC_INTERVAL seconds
+JWT_DENYLIST_BLOOM_CAPACITY = int(
+    os.environ.get("JWT_DENYLIST_BLOOM_CAPACITY", 1_000_000)
+)
+JWT_DENYLIST_BLOOM_ERROR_RATE = float(
+    os.environ.get("JWT_DENYLIST_BLOOM_ERROR_RATE", 0.001)
+)
+JWT_DENYLIST_SYNC_INTERVAL = int(os.environ.get("JWT_DENYLIST_SYNC_INTERVAL", 5))
+JWT_DENYLIST_REBUILD_INTERVAL = int(
+    os.environ.get("JWT_DENYLIST_REBUILD_INTERVAL", 60 * 60)
+)
+OUTSTANDING_TOKEN_PURGE_BATCH_SIZE = int(
+    os.environ.get("OUTSTANDING_TOKEN_PURGE_BATCH_SIZE", 1000)
+)
+
+# last_login and outstanding token writes are buffered in redis and flushed
+# in bulk every FLUSH_INTERVAL seconds (see users.writebehind)
+AUTH_WRITE_BEHIND_FLUSH_INTERVAL = float(
+    os.environ.get("AUTH_WRITE_BEHIND_FLUSH_INTERVAL", 10)
+)
+AUTH_WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("AUTH_WRITE_BEHIND_BATCH_SIZE", 500))
+
 # simple jwt configs
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=4),
@@ -323,8 +431,28 @@ CELERY_BEAT_SCHEDULE = {
         "task": "users.tasks.check_instructors_meetings",
         "schedule": crontab(minute=0),  # Executes every minute
     },
+    "renew_calendar_channels": {
+        "task": "eventcalendar.tasks.renew_calendar_channels",
+        "schedule": crontab(minute=30),  # Executes every hour
+    },
+    "refresh_expiring_google_credentials": {
+        "task": "eventcalendar.tasks.refresh_expiring_google_credentials",
+        "schedule": crontab(minute="*/5"),  # Executes every 5 minutes
+    },
+    "flush_auth_writes": {
+        "task": "users.tasks.flush_auth_writes",
+        "schedule": AUTH_WRITE_BEHIND_FLUSH_INTERVAL,
+    },
+    "purge_expired_tokens": {
+        "task": "users.tasks.purge_expired_tokens",
+        "schedule": crontab(hour=3, minute=15),  # Executes every day
+    },
 }
 
+# Instructors checked per meetings sweep shard, and shards run in parallel
+MEETINGS_SWEEP_SHARD_SIZE = int(os.environ.get("MEETINGS_SWEEP_SHARD_SIZE", 50))
+MEETINGS_SWEEP_CONCURRENCY = int(os.environ.get("MEETINGS_SWEEP_CONCURRENCY", 8))
+
 # Cache settings
 CACHES = {
     "default": {
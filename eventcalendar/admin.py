@@ -0,0 +1,59 @@
+from django.contrib import admin
+
+from eventcalendar.models import (CalendarChannel, CalendarEvent, CalendarSync,
+                                  EventCreationJob, GoogleCredentialStatus)
+
+
+class CalendarSyncAdmin(admin.ModelAdmin):
+    model = CalendarSync
+    list_display = [
+        "instructor",
+        "synced_at",
+    ]
+
+
+class CalendarEventAdmin(admin.ModelAdmin):
+    model = CalendarEvent
+    list_display = [
+        "summary",
+        "instructor",
+        "start",
+        "end",
+    ]
+
+
+class CalendarChannelAdmin(admin.ModelAdmin):
+    model = CalendarChannel
+    list_display = [
+        "channel_id",
+        "instructor",
+        "expiration",
+    ]
+
+
+class GoogleCredentialStatusAdmin(admin.ModelAdmin):
+    model = GoogleCredentialStatus
+    list_display = [
+        "user",
+        "expires_at",
+        "is_valid",
+    ]
+    list_filter = ["is_valid"]
+
+
+class EventCreationJobAdmin(admin.ModelAdmin):
+    model = EventCreationJob
+    list_display = [
+        "id",
+        "instructor",
+        "status",
+        "created_at",
+    ]
+    list_filter = ["status"]
+
+
+admin.site.register(CalendarSync, CalendarSyncAdmin)
+admin.site.register(CalendarEvent, CalendarEventAdmin)
+admin.site.register(CalendarChannel, CalendarChannelAdmin)
+admin.site.register(GoogleCredentialStatus, GoogleCredentialStatusAdmin)
+admin.site.register(EventCreationJob, EventCreationJobAdmin)
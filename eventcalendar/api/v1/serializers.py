@@ -5,6 +5,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from rest_framework import serializers
 
+from eventcalendar.models import EventCreationJob
+
 
 class StartEndSerializer(serializers.Serializer):
     dateTime = serializers.DateTimeField()
@@ -97,3 +99,17 @@ class GoogleCalendarEventInputSerializer(serializers.Serializer):
             )
 
         return data
+
+
+class EventCreationJobSerializer(serializers.ModelSerializer):
+    event = GoogleCalendarEventSerializer(allow_null=True)
+
+    class Meta:
+        model = EventCreationJob
+        fields = [
+            "id",
+            "status",
+            "event",
+            "error",
+            "created_at",
+        ]
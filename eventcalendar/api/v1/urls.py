@@ -1,6 +1,8 @@
 from django.urls import path
 
-from eventcalendar.api.v1.views import InstructorEventsListAPIView
+from eventcalendar.api.v1.views import (CalendarNotificationAPIView,
+                                        InstructorEventJobAPIView,
+                                        InstructorEventsListAPIView)
 
 app_name = "v1"
 
@@ -10,4 +12,14 @@ urlpatterns = [
         InstructorEventsListAPIView.as_view(),
         name="instructor_events_list",
     ),
+    path(
+        "instructor/events/jobs/<uuid:job_id>/",
+        InstructorEventJobAPIView.as_view(),
+        name="instructor_event_job",
+    ),
+    path(
+        "calendar/notifications/",
+        CalendarNotificationAPIView.as_view(),
+        name="calendar_notifications",
+    ),
 ]
@@ -1,14 +1,32 @@
+import hmac
+import uuid
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from drf_spectacular.utils import extend_schema
+from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
 from rest_framework import status
 from rest_framework.generics import ListAPIView
-from google.auth.exceptions import RefreshError
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
 
 from eventcalendar.api.v1.serializers import (
-    GoogleCalendarEventInputSerializer, GoogleCalendarEventSerializer)
+    EventCreationJobSerializer, GoogleCalendarEventInputSerializer,
+    GoogleCalendarEventSerializer)
+from eventcalendar.breaker import google_breaker, is_outage
+from eventcalendar.models import (CalendarChannel, CalendarEvent, CalendarSync,
+                                  EventCreationJob)
+from eventcalendar.sync import sync_instructor_events
+from eventcalendar.tasks import (calendar_sync_lock, create_instructor_event,
+                                 request_calendar_sync)
 from utils.api.error_objects import ErrorObject
 from utils.api.mixins import BadRequestSerializerMixin
 from utils.api.responses import error_response, success_response
 from utils.permissions import IsAuthenticatedAndActive, IsInstructor
+from utils.validators import CustomValidationError
+
+STALE_WARNING = '110 - "Response is Stale"'
 
 
 class InstructorEventsListAPIView(BadRequestSerializerMixin, ListAPIView):
@@ -27,39 +45,86 @@ class InstructorEventsListAPIView(BadRequestSerializerMixin, ListAPIView):
         get an instructor's current week meetings from Google Calender if has logged in with google
         otherwise return GOOGLE_CREDENTIAL_NOT_FOUND
 
+        meetings are served from the synced local copy, which is refreshed in background when stale.
+        stale answers, e.g. while google is down, have a `Warning: 110` header
+
         signup your google acount with requesting to /google-auth/login/google-oauth2/
         """
         user_obj = request.user
+        instructor_obj = user_obj.instructor
+        calendar_sync = CalendarSync.objects.filter(instructor=instructor_obj).first()
+        stale = False
         try:
-            events_list = user_obj.get_google_calendar_events()
+            if calendar_sync is None or calendar_sync.synced_at is None:
+                # Nothing stored yet, fill the local events before answering,
+                # unless another request or a worker is already doing it
+                with calendar_sync_lock(instructor_obj.id) as locked:
+                    if locked:
+                        sync_instructor_events(instructor_obj)
+                    else:
+                        stale = True
+            elif google_breaker.is_open:
+                # Google is down, answer with the last synced week
+                stale = True
+            elif calendar_sync.is_stale:
+                stale = True
+                request_calendar_sync(instructor_obj.id)
         except RefreshError:
             return error_response(
                 error=ErrorObject.GOOGLE_CREDENTIAL_NOT_FOUND,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        except Exception as e:
+        except HttpError:
+            return error_response(
+                error=ErrorObject.SERVICE_UNAVAILABLE,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        except CustomValidationError as e:
             return error_response(
                 error=e.error_object,
                 status_code=e.status_code,
             )
-
-        serializer = GoogleCalendarEventSerializer(data=events_list, many=True)
-        if not serializer.is_valid():
+        except Exception as e:
+            if not is_outage(e):
+                raise
             return error_response(
-                error=ErrorObject.NOT_VALID_EVENTS_ERROR,
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                error=ErrorObject.SERVICE_UNAVAILABLE,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        return success_response(data=serializer.data, status_code=status.HTTP_200_OK)
+
+        time_min, time_max = user_obj.get_current_week_range()
+        event_objs = CalendarEvent.objects.filter(
+            instructor=instructor_obj,
+            end__gt=parse_datetime(time_min),
+            start__lt=parse_datetime(time_max),
+        ).order_by("start")
+
+        serializer = GoogleCalendarEventSerializer(
+            [event_obj.as_google_event() for event_obj in event_objs], many=True
+        )
+        response = success_response(
+            data=serializer.data, status_code=status.HTTP_200_OK
+        )
+        if stale:
+            response["Warning"] = STALE_WARNING
+        return response
 
     @extend_schema(
         request=GoogleCalendarEventInputSerializer,
         parameters=[],
-        responses={200: GoogleCalendarEventSerializer},
+        responses={202: EventCreationJobSerializer},
         auth=None,
         operation_id="EventCreation",
         tags=["Event"],
     )
     def post(self, request, *args, **kwargs):
+        """
+        queue creating an event with a google meet link on the instructor's calendar
+        and return the job, poll the job until its status is succeeded or failed
+
+        send an `Idempotency-Key` header to safely retry the request, a retried request
+        returns the job of the first one instead of creating another event
+        """
         serializer = GoogleCalendarEventInputSerializer(data=request.data)
         if not serializer.is_valid():
             return error_response(
@@ -67,25 +132,103 @@ class InstructorEventsListAPIView(BadRequestSerializerMixin, ListAPIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_obj = request.user
+        validated_data = serializer.validated_data
+        payload = {
+            "summary": validated_data.get("summary"),
+            "start": validated_data.get("start").get("dateTime").isoformat(),
+            "end": validated_data.get("end").get("dateTime").isoformat(),
+            "time_zone": validated_data.get("start").get("timeZone"),
+            "attendees_emails": validated_data.get("attendees_emails", []),
+        }
+        idempotency_key = request.headers.get("Idempotency-Key") or uuid.uuid4().hex
+
+        job_obj, created = EventCreationJob.objects.get_or_create(
+            instructor=request.user.instructor,
+            idempotency_key=idempotency_key,
+            defaults={"payload": payload},
+        )
+        if created:
+            create_instructor_event.delay(str(job_obj.id))
+        elif job_obj.payload != payload:
+            return error_response(
+                error=ErrorObject.IDEMPOTENCY_KEY_REUSED,
+                status_code=status.HTTP_409_CONFLICT,
+            )
+
+        output = EventCreationJobSerializer(job_obj)
+        return success_response(data=output.data, status_code=status.HTTP_202_ACCEPTED)
+
+
+class InstructorEventJobAPIView(BadRequestSerializerMixin, APIView):
+    permission_classes = [IsAuthenticatedAndActive, IsInstructor]
+
+    @extend_schema(
+        request=None,
+        parameters=[],
+        responses={200: EventCreationJobSerializer},
+        auth=None,
+        operation_id="EventCreationJob",
+        tags=["Event"],
+    )
+    def get(self, request, job_id, *args, **kwargs):
+        """
+        get an event creation job, `event` is filled once the status is succeeded
+        """
+        job_obj = EventCreationJob.objects.filter(
+            id=job_id, instructor__user=request.user
+        ).first()
+        if job_obj is None:
+            return error_response(
+                error=ErrorObject.EVENT_JOB_NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        output = EventCreationJobSerializer(job_obj)
+        return success_response(data=output.data, status_code=status.HTTP_200_OK)
+
+
+class CalendarNotificationAPIView(APIView):
+    """
+    Receives google calendar push notifications (events.watch channels).
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = []
+
+    @extend_schema(
+        request=None,
+        responses={200: {}},
+        auth=None,
+        operation_id="CalendarNotification",
+        tags=["Event"],
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        google sends the channel info in `X-Goog-*` headers with an empty body
+        """
+        channel_id = request.headers.get("X-Goog-Channel-ID")
+        resource_id = request.headers.get("X-Goog-Resource-ID")
+        token = request.headers.get("X-Goog-Channel-Token") or ""
+
         try:
-            created_event = user_obj.create_google_calendar_event(
-                summary=serializer.validated_data.get("summary"),
-                start=serializer.validated_data.get("start").get("dateTime"),
-                end=serializer.validated_data.get("end").get("dateTime"),
-                attendees_emails=serializer.validated_data.get("attendees_emails", []),
-                time_zone=serializer.validated_data.get("start").get("timeZone"),
+            channel_obj = CalendarChannel.objects.get(
+                channel_id=channel_id,
+                resource_id=resource_id,
+                expiration__gt=timezone.now(),
             )
-        except RefreshError:
+        except CalendarChannel.DoesNotExist:
             return error_response(
-                error=ErrorObject.GOOGLE_CREDENTIAL_NOT_FOUND,
+                error=ErrorObject.NOT_FOUND,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        except Exception as e:
+        if not hmac.compare_digest(channel_obj.token, token):
             return error_response(
-                error=e.error_object,
-                status_code=e.status_code,
+                error=ErrorObject.FORBIDDEN,
+                status_code=status.HTTP_403_FORBIDDEN,
             )
 
-        output = GoogleCalendarEventSerializer(created_event)
-        return success_response(data=output.data, status_code=status.HTTP_200_OK)
+        # "sync" confirms that the channel is open, the store catches up with
+        # whatever changed before it too
+        request_calendar_sync(channel_obj.instructor_id)
+        return success_response(data={}, status_code=status.HTTP_200_OK)
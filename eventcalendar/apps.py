@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EventcalendarConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "eventcalendar"
+
+    def ready(self):
+        import eventcalendar.signals  # noqa: F401
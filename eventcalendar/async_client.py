@@ -0,0 +1,318 @@
+import asyncio
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+
+import httpx
+from django.conf import settings
+from social_django.models import UserSocialAuth
+
+from eventcalendar.breaker import CircuitOpenError, google_breaker
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.credentials import save_refreshed_credentials
+from eventcalendar.models import GoogleCredentialStatus
+from utils.loggers import stdout_logger
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncCalendarError(Exception):
+    def __init__(self, status_code, content):
+        super().__init__(f"{status_code}: {content}")
+        self.status_code = status_code
+        self.content = content
+
+
+@dataclass
+class AsyncCredentials:
+    social_user: UserSocialAuth
+    access_token: str
+    refresh_token: str
+    refreshed: bool = False
+    expires_in: int = None
+
+    @classmethod
+    def from_social_user(cls, social_user):
+        return cls(
+            social_user=social_user,
+            access_token=social_user.extra_data["access_token"],
+            refresh_token=social_user.extra_data["refresh_token"],
+        )
+
+    @property
+    def user_id(self):
+        return self.social_user.user_id
+
+
+class AsyncCalendarClient:
+    """
+    Google Calendar REST client for fetching many calendars concurrently from
+    one process. All requests share one pooled httpx client, the number of
+    in-flight requests is capped in total and per user, and 429/5xx answers
+    are retried with jittered exponential backoff.
+
+    Semaphores are bound to the running event loop, so create the client
+    inside the loop:
+
+        async with AsyncCalendarClient() as client:
+            await client.list_events(credentials, timeMin=...)
+    """
+
+    def __init__(
+        self,
+        max_concurrency=None,
+        per_user_concurrency=None,
+        max_retries=None,
+        transport=None,
+    ):
+        max_concurrency = (
+            max_concurrency or settings.GOOGLE_CALENDAR_ASYNC_CONCURRENCY
+        )
+        per_user_concurrency = (
+            per_user_concurrency or settings.GOOGLE_CALENDAR_ASYNC_USER_CONCURRENCY
+        )
+        if max_retries is None:
+            max_retries = settings.GOOGLE_CALENDAR_ASYNC_RETRIES
+        self.max_retries = max_retries
+        self._http = httpx.AsyncClient(
+            timeout=settings.GOOGLE_CALENDAR_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._user_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(per_user_concurrency)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _backoff(self, attempt):
+        # Full jitter, see "Exponential Backoff And Jitter"
+        base = settings.GOOGLE_CALENDAR_ASYNC_BACKOFF
+        await asyncio.sleep(random.uniform(0, base * 2**attempt))
+
+    async def _send(self, method, url, **kwargs):
+        # The breaker state is in redis, its calls block, so they run in a
+        # thread instead of the event loop
+        for attempt in range(self.max_retries + 1):
+            await asyncio.to_thread(google_breaker.check)
+            try:
+                response = await self._http.request(method, url, **kwargs)
+            except httpx.TransportError:
+                await asyncio.to_thread(google_breaker.record_failure)
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    await asyncio.to_thread(google_breaker.record_success)
+                    return response
+                await asyncio.to_thread(google_breaker.record_failure)
+                if attempt == self.max_retries:
+                    return response
+            await self._backoff(attempt)
+
+    async def refresh(self, credentials):
+        response = await self._send(
+            "POST",
+            settings.GOOGLE_TOKEN_URI,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": credentials.refresh_token,
+                "client_id": settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY,
+                "client_secret": settings.SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET,
+            },
+        )
+        if response.status_code != 200:
+            raise AsyncCalendarError(response.status_code, response.text)
+        token = response.json()
+        credentials.access_token = token["access_token"]
+        credentials.expires_in = token.get("expires_in")
+        credentials.refreshed = True
+
+    async def request(self, credentials, method, path, **kwargs):
+        url = settings.GOOGLE_CALENDAR_API_URL + path
+        async with self._semaphore, self._user_semaphores[credentials.user_id]:
+            for refreshed in [False, True]:
+                headers = {"Authorization": f"Bearer {credentials.access_token}"}
+                response = await self._send(method, url, headers=headers, **kwargs)
+                if response.status_code == 401 and not refreshed:
+                    await self.refresh(credentials)
+                    continue
+                break
+        if response.status_code >= 400:
+            raise AsyncCalendarError(response.status_code, response.text)
+        return response.json()
+
+    async def list_events(self, credentials, calendar_id="primary", **params):
+        items = []
+        params = {"singleEvents": "true", **params}
+        while True:
+            result = await self.request(
+                credentials, "GET", f"/calendars/{calendar_id}/events", params=params
+            )
+            items.extend(result.get("items", []))
+            if not result.get("nextPageToken"):
+                return items
+            params["pageToken"] = result["nextPageToken"]
+
+    async def free_busy(self, credentials, time_min, time_max, calendar_id="primary"):
+        """
+        Return the busy intervals of a calendar, without the event bodies.
+        """
+        result = await self.request(
+            credentials,
+            "POST",
+            "/freeBusy",
+            json={
+                "timeMin": time_min.isoformat(),
+                "timeMax": time_max.isoformat(),
+                "items": [{"id": calendar_id}],
+            },
+        )
+        calendar = result["calendars"][calendar_id]
+        if calendar.get("errors"):
+            raise AsyncCalendarError(200, calendar["errors"])
+        return calendar.get("busy", [])
+
+
+def get_instructors_credentials(instructors):
+    """
+    Return {instructor_id: AsyncCredentials} with a single query.
+    """
+    user_instructor_ids = {
+        instructor.user_id: instructor.id for instructor in instructors
+    }
+    social_users = UserSocialAuth.objects.filter(
+        user_id__in=user_instructor_ids.keys(), provider=GOOGLE_PROVIDER
+    ).order_by("id")
+    # Like `.last()`, the newest social auth of a user wins
+    return {
+        user_instructor_ids[social_user.user_id]: AsyncCredentials.from_social_user(
+            social_user
+        )
+        for social_user in social_users
+        if "refresh_token" in (social_user.extra_data or {})
+    }
+
+
+def _run_for_instructors(instructors, fetch_one, without_credentials=None):
+    """
+    Run `fetch_one(client, credentials)` for every instructor concurrently.
+    Returns {instructor_id: result}, None for instructors that failed and
+    `without_credentials` for the ones not connected to google.
+    """
+    credentials_map = get_instructors_credentials(instructors)
+
+    async def fetch(client, instructor_id, credentials):
+        try:
+            return instructor_id, await fetch_one(client, credentials)
+        except (AsyncCalendarError, CircuitOpenError, httpx.HTTPError) as error:
+            stdout_logger.error(f"Get instructor {instructor_id} faild.{error}")
+            return instructor_id, None
+
+    async def fetch_all():
+        async with AsyncCalendarClient() as client:
+            return await asyncio.gather(
+                *[
+                    fetch(client, instructor_id, credentials)
+                    for instructor_id, credentials in credentials_map.items()
+                ]
+            )
+
+    results = dict(asyncio.run(fetch_all())) if credentials_map else {}
+    save_refreshed_credentials(credentials_map.values())
+    for instructor in instructors:
+        results.setdefault(instructor.id, without_credentials)
+    return results
+
+
+def list_instructors_events(instructors, time_min, time_max):
+    """
+    Fetch the events of many instructors between time_min and time_max
+    concurrently. Returns {instructor_id: events}, None for instructors whose
+    calendar could not be read.
+    """
+    params = {
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "orderBy": "startTime",
+    }
+    return _run_for_instructors(
+        instructors,
+        lambda client, credentials: client.list_events(credentials, **params),
+    )
+
+
+def get_instructors_busy(instructors, time_min, time_max):
+    """
+    Same as list_instructors_events but with freeBusy, which only returns the
+    busy intervals: {instructor_id: [{"start": ..., "end": ...}] or None}.
+    Instructors not connected to google have no calendar to be busy in, so
+    no intervals.
+    """
+    return _run_for_instructors(
+        instructors,
+        lambda client, credentials: client.free_busy(credentials, time_min, time_max),
+        without_credentials=[],
+    )
+
+
+def refresh_credential_statuses(statuses, max_concurrency=None):
+    """
+    Refresh the access tokens of the given credential statuses concurrently
+    and save them in bulk. Credentials google refuses to refresh, or that have
+    no refresh token, are marked as invalid.
+    Returns {"refreshed": int, "invalid": int, "failed": int}.
+    """
+    invalid_ids = []
+    credentials_map = {}
+    for credential_status in statuses:
+        extra_data = credential_status.social_auth.extra_data or {}
+        if "refresh_token" in extra_data and "access_token" in extra_data:
+            credentials_map[credential_status.id] = AsyncCredentials.from_social_user(
+                credential_status.social_auth
+            )
+        else:
+            invalid_ids.append(credential_status.id)
+
+    async def refresh(client, status_id, credentials):
+        try:
+            await client.refresh(credentials)
+        except AsyncCalendarError as error:
+            stdout_logger.error(f"Refresh credential {status_id} faild.{error}")
+            # invalid_grant, the refresh token was revoked or has expired
+            if error.status_code in [400, 401]:
+                invalid_ids.append(status_id)
+        except (CircuitOpenError, httpx.HTTPError) as error:
+            stdout_logger.error(f"Refresh credential {status_id} faild.{error}")
+
+    async def refresh_all():
+        async with AsyncCalendarClient(max_concurrency=max_concurrency) as client:
+            await asyncio.gather(
+                *[
+                    refresh(client, status_id, credentials)
+                    for status_id, credentials in credentials_map.items()
+                ]
+            )
+
+    if credentials_map:
+        asyncio.run(refresh_all())
+    save_refreshed_credentials(credentials_map.values())
+    GoogleCredentialStatus.objects.filter(id__in=invalid_ids).update(is_valid=False)
+
+    refreshed = sum(credentials.refreshed for credentials in credentials_map.values())
+    return {
+        "refreshed": refreshed,
+        "invalid": len(invalid_ids),
+        "failed": len(statuses) - refreshed - len(invalid_ids),
+    }
@@ -0,0 +1,223 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from social_django.models import UserSocialAuth
+
+from eventcalendar.clients import GOOGLE_PROVIDER
+from faculty.models import Department, Faculty
+from users.models import Instructor, User
+from users.tasks import MEETINGS_SWEEP_SUMMARY_KEY, check_instructors_meetings
+
+BENCHMARK_PREFIX = "benchmark-"
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    instructors: int
+    # Operations done, requests or instructors swept
+    count: int
+    seconds: float
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def throughput(self):
+        return self.count / self.seconds if self.seconds else 0.0
+
+    def percentile(self, percent):
+        """
+        Nearest-rank percentile of the latencies, in seconds.
+        """
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        rank = math.ceil(percent / 100 * len(latencies))
+        return latencies[max(rank, 1) - 1]
+
+    def as_dict(self):
+        return {
+            "scenario": self.scenario,
+            "instructors": self.instructors,
+            "count": self.count,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput": round(self.throughput, 2),
+            "p50": round(self.percentile(50), 4),
+            "p95": round(self.percentile(95), 4),
+            "p99": round(self.percentile(99), 4),
+            "max": round(self.percentile(100), 4),
+        }
+
+
+def create_benchmark_instructors(count):
+    """
+    Create `count` instructors connected to google, with tokens the fake
+    google server accepts (access token == refresh token).
+    """
+    faculty, _ = Faculty.objects.get_or_create(name=BENCHMARK_PREFIX + "faculty")
+    department, _ = Department.objects.get_or_create(
+        name=BENCHMARK_PREFIX + "department", faculty=faculty
+    )
+    usernames = [f"{BENCHMARK_PREFIX}{index}" for index in range(count)]
+    User.objects.bulk_create(
+        [
+            User(username=username, email=f"{username}@didar.com")
+            for username in usernames
+        ]
+    )
+    user_objs = list(User.objects.filter(username__in=usernames))
+    Instructor.objects.bulk_create(
+        [Instructor(user=user_obj, department=department) for user_obj in user_objs]
+    )
+    UserSocialAuth.objects.bulk_create(
+        [
+            UserSocialAuth(
+                user=user_obj,
+                provider=GOOGLE_PROVIDER,
+                uid=user_obj.email,
+                extra_data={
+                    "access_token": user_obj.username,
+                    "refresh_token": user_obj.username,
+                    "auth_time": int(time.time()),
+                    "expires": 3600,
+                },
+            )
+            for user_obj in user_objs
+        ]
+    )
+    return list(Instructor.objects.filter(user__in=user_objs).select_related("user"))
+
+
+def delete_benchmark_instructors():
+    User.objects.filter(username__startswith=BENCHMARK_PREFIX).delete()
+
+
+def _run_requests(scenario, instructors, requests, concurrency, send):
+    """
+    Call `send(client, instructor)` `requests` times round robin over the
+    instructors, from `concurrency` threads, and time every call.
+    """
+
+    def run(index):
+        instructor = instructors[index % len(instructors)]
+        client = APIClient()
+        client.force_authenticate(instructor.user)
+        started = time.perf_counter()
+        try:
+            response = send(client, instructor)
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        return time.perf_counter() - started, failed
+
+    def run_in_thread(index):
+        try:
+            return run(index)
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(run_in_thread, range(requests)))
+    else:
+        results = [run(index) for index in range(requests)]
+    return BenchmarkResult(
+        scenario=scenario,
+        instructors=len(instructors),
+        count=requests,
+        seconds=time.perf_counter() - started,
+        latencies=[latency for latency, _ in results],
+        errors=sum(failed for _, failed in results),
+    )
+
+
+def benchmark_events_cold(instructors, requests, concurrency):
+    """
+    First events request of every instructor, synced inline from google.
+    """
+    url = reverse("eventcalendar:v1:instructor_events_list")
+    return _run_requests(
+        "events_cold",
+        instructors,
+        min(requests, len(instructors)),
+        concurrency,
+        lambda client, instructor: client.get(url),
+    )
+
+
+def benchmark_events_warm(instructors, requests, concurrency):
+    """
+    Events requests answered from the synced local store.
+    """
+    url = reverse("eventcalendar:v1:instructor_events_list")
+    return _run_requests(
+        "events_warm",
+        instructors,
+        requests,
+        concurrency,
+        lambda client, instructor: client.get(url),
+    )
+
+
+def benchmark_event_create(instructors, requests, concurrency):
+    """
+    Event creation end to end, the celery task has to run eagerly.
+    """
+    url = reverse("eventcalendar:v1:instructor_events_list")
+    start = timezone.now() + timedelta(days=1)
+    data = {
+        "summary": "benchmark",
+        "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Tehran"},
+        "end": {
+            "dateTime": (start + timedelta(hours=1)).isoformat(),
+            "timeZone": "Asia/Tehran",
+        },
+    }
+    return _run_requests(
+        "event_create",
+        instructors,
+        requests,
+        concurrency,
+        lambda client, instructor: client.post(url, data, format="json"),
+    )
+
+
+def benchmark_meetings_sweep(instructors, requests, concurrency):
+    """
+    One meetings sweep over all instructors, latencies are per shard.
+    """
+    cache.delete(MEETINGS_SWEEP_SUMMARY_KEY)
+    started = time.perf_counter()
+    check_instructors_meetings()
+    seconds = time.perf_counter() - started
+    summary = cache.get(MEETINGS_SWEEP_SUMMARY_KEY) or {
+        "shards": [],
+        "instructors": 0,
+        "failed": 0,
+    }
+    return BenchmarkResult(
+        scenario="meetings_sweep",
+        instructors=len(instructors),
+        count=summary["instructors"],
+        seconds=seconds,
+        latencies=[shard["seconds"] for shard in summary["shards"]],
+        errors=summary["failed"],
+    )
+
+
+SCENARIOS = {
+    "events_cold": benchmark_events_cold,
+    "events_warm": benchmark_events_warm,
+    "event_create": benchmark_event_create,
+    "meetings_sweep": benchmark_meetings_sweep,
+}
@@ -0,0 +1,147 @@
+import socket
+import time
+from contextlib import contextmanager
+
+import httplib2
+from django.conf import settings
+from django.core.cache import cache
+from google.auth.exceptions import TransportError
+from googleapiclient.errors import HttpError
+from rest_framework import status
+
+from utils.api.error_objects import ErrorObject
+from utils.loggers import stdout_logger
+from utils.validators import CustomValidationError
+
+OUTAGE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(CustomValidationError):
+    def __init__(self, name):
+        super().__init__(
+            detail=f"{name} is unavailable, try again later.",
+            error_object=ErrorObject.SERVICE_UNAVAILABLE,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+def is_outage(error):
+    """
+    Whether an exception of a google call means google is down or overloaded,
+    as opposed to a problem with the request itself.
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status in OUTAGE_STATUSES
+    return isinstance(
+        error, (socket.timeout, ConnectionError, httplib2.HttpLib2Error, TransportError)
+    )
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker with its state in the shared cache, so every worker and
+    node agrees on it. After `threshold` failures within `window` seconds the
+    circuit opens and calls fail fast for `reset_timeout` seconds. Then a
+    single probe call is let through (half open): success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, name, threshold=None, window=None, reset_timeout=None):
+        self.name = name
+        self._threshold = threshold
+        self._window = window
+        self._reset_timeout = reset_timeout
+
+    @property
+    def threshold(self):
+        return self._threshold or settings.GOOGLE_CALENDAR_BREAKER_THRESHOLD
+
+    @property
+    def window(self):
+        return self._window or settings.GOOGLE_CALENDAR_BREAKER_WINDOW
+
+    @property
+    def reset_timeout(self):
+        return self._reset_timeout or settings.GOOGLE_CALENDAR_BREAKER_RESET_TIMEOUT
+
+    def _key(self, part):
+        return f"circuit-breaker:{self.name}:{part}"
+
+    @property
+    def state(self):
+        open_until = cache.get(self._key("open-until"))
+        if open_until is None:
+            return "closed"
+        return "open" if time.time() < open_until else "half_open"
+
+    @property
+    def is_open(self):
+        return self.state == "open"
+
+    def allow_request(self):
+        open_until = cache.get(self._key("open-until"))
+        if open_until is None:
+            return True
+        if time.time() < open_until:
+            return False
+        # Half open, only one probe at a time
+        return cache.add(
+            self._key("probe"), 1, timeout=settings.GOOGLE_CALENDAR_HTTP_TIMEOUT
+        )
+
+    def check(self):
+        if not self.allow_request():
+            raise CircuitOpenError(self.name)
+
+    def reset(self):
+        cache.delete_many(
+            [self._key("failures"), self._key("open-until"), self._key("probe")]
+        )
+
+    def record_success(self):
+        # Only the probe of a half open circuit closes it. Successes in
+        # between do not clear the failures counted within the window, a
+        # partial outage must still open the circuit.
+        if self.state == "half_open":
+            stdout_logger.info(f"Circuit {self.name} closed.")
+            self.reset()
+
+    def record_failure(self):
+        failures_key = self._key("failures")
+        cache.add(failures_key, 0, timeout=self.window)
+        try:
+            failures = cache.incr(failures_key)
+        except ValueError:
+            # The window expired between add and incr
+            cache.add(failures_key, 1, timeout=self.window)
+            failures = 1
+
+        half_open = self.state == "half_open"
+        if failures >= self.threshold or half_open:
+            open_until = time.time() + self.reset_timeout
+            # Keep the key after opening, so the circuit goes half open
+            cache.set(self._key("open-until"), open_until, timeout=None)
+            cache.delete(self._key("probe"))
+            stdout_logger.error(f"Circuit {self.name} opened, {failures} failures.")
+
+    @contextmanager
+    def guard(self):
+        """
+        Usage:
+            with breaker.guard():
+                service.events().list(calendarId="primary").execute()
+        """
+        self.check()
+        try:
+            yield
+        except Exception as error:
+            if is_outage(error):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        else:
+            self.record_success()
+
+
+google_breaker = CircuitBreaker("google-calendar")
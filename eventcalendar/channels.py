@@ -0,0 +1,73 @@
+import secrets
+import uuid
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from django.utils import timezone
+
+from eventcalendar.clients import calendar_service
+from eventcalendar.models import CalendarChannel
+from utils.loggers import stdout_logger
+
+
+def get_notification_url():
+    if not settings.BACKEND_URL:
+        raise ImproperlyConfigured("BACKEND_URL must be set to watch calendars.")
+    return settings.BACKEND_URL + reverse("eventcalendar:v1:calendar_notifications")
+
+
+def watch_instructor_calendar(instructor):
+    """
+    Open a push notification channel on the instructor primary calendar.
+    """
+    body = {
+        "id": str(uuid.uuid4()),
+        "type": "web_hook",
+        "address": get_notification_url(),
+        "token": secrets.token_urlsafe(32),
+        "params": {"ttl": str(settings.GOOGLE_CALENDAR_CHANNEL_TTL)},
+    }
+    stdout_logger.info(f"Watching {instructor} google calender...")
+    with calendar_service(instructor.user) as service:
+        result = service.events().watch(calendarId="primary", body=body).execute()
+
+    # Google sends the expiration as milliseconds since epoch
+    expiration = datetime.fromtimestamp(int(result["expiration"]) / 1000, tz=pytz.utc)
+    return CalendarChannel.objects.create(
+        instructor=instructor,
+        channel_id=body["id"],
+        resource_id=result["resourceId"],
+        token=body["token"],
+        expiration=expiration,
+    )
+
+
+def stop_channel(channel):
+    try:
+        with calendar_service(channel.instructor.user) as service:
+            service.channels().stop(
+                body={"id": channel.channel_id, "resourceId": channel.resource_id}
+            ).execute()
+    except Exception:
+        # The channel expires by itself anyway
+        stdout_logger.error(f"Stopping channel {channel.channel_id} faild.")
+    channel.delete()
+
+
+def get_renew_threshold():
+    renew_before = timedelta(seconds=settings.GOOGLE_CALENDAR_CHANNEL_RENEW_BEFORE)
+    return timezone.now() + renew_before
+
+
+def get_replaced_channels():
+    """
+    Channels about to lapse whose instructor already has a fresher channel.
+    """
+    renew_threshold = get_renew_threshold()
+    return CalendarChannel.objects.filter(
+        expiration__lte=renew_threshold,
+        instructor__calendar_channels__expiration__gt=renew_threshold,
+    ).select_related("instructor__user").distinct()
@@ -0,0 +1,114 @@
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import httplib2
+from cachetools import LRUCache
+from django.conf import settings
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from rest_framework import status
+
+from eventcalendar.breaker import google_breaker
+from utils.api.error_objects import ErrorObject
+from utils.validators import CustomValidationError
+
+GOOGLE_PROVIDER = "google-oauth2"
+
+# The discovery document shipped with googleapiclient, parsed once per process.
+CALENDAR_DISCOVERY_DOCUMENT = json.loads(get_static_doc("calendar", "v3"))
+
+
+@dataclass
+class CalendarClient:
+    service: object
+    fingerprint: tuple
+    # httplib2 connections are not safe to share between concurrent requests
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_clients = LRUCache(maxsize=settings.GOOGLE_CALENDAR_CLIENT_CACHE_SIZE)
+_clients_lock = threading.Lock()
+
+
+def get_google_social_auth(user):
+    return user.social_auth.filter(provider=GOOGLE_PROVIDER).last()
+
+
+def _credentials_fingerprint(social_user):
+    extra_data = social_user.extra_data or {}
+    return (
+        social_user.pk,
+        extra_data.get("access_token"),
+        extra_data.get("refresh_token"),
+    )
+
+
+def build_credentials(social_user):
+    return Credentials(
+        token=social_user.extra_data["access_token"],
+        refresh_token=social_user.extra_data["refresh_token"],
+        client_id=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY,
+        client_secret=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET,
+        token_uri=settings.GOOGLE_TOKEN_URI,
+    )
+
+
+def _build_client(social_user, fingerprint):
+    # One keep-alive httplib2 connection per user, reused across calls
+    http = AuthorizedHttp(
+        build_credentials(social_user),
+        http=httplib2.Http(timeout=settings.GOOGLE_CALENDAR_HTTP_TIMEOUT),
+    )
+    service = build_from_document(
+        CALENDAR_DISCOVERY_DOCUMENT,
+        http=http,
+        client_options={"api_endpoint": settings.GOOGLE_CALENDAR_API_URL + "/"},
+    )
+    return CalendarClient(service=service, fingerprint=fingerprint)
+
+
+def get_calendar_client(user, social_user=None):
+    """
+    Return the cached calendar client of the user, rebuilding it when the
+    stored google credentials have changed since it was created.
+    """
+    if social_user is None:
+        social_user = get_google_social_auth(user)
+    if social_user is None:
+        raise CustomValidationError(
+            detail="Google credential not found.",
+            error_object=ErrorObject.GOOGLE_CREDENTIAL_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    fingerprint = _credentials_fingerprint(social_user)
+    with _clients_lock:
+        client = _clients.get(user.pk)
+        if client is None or client.fingerprint != fingerprint:
+            client = _build_client(social_user, fingerprint)
+            _clients[user.pk] = client
+    return client
+
+
+@contextmanager
+def calendar_service(user, social_user=None):
+    """
+    Usage:
+        with calendar_service(user) as service:
+            service.events().list(calendarId="primary").execute()
+
+    Calls go through the google circuit breaker, CircuitOpenError is raised
+    while google is considered down.
+    """
+    client = get_calendar_client(user, social_user=social_user)
+    with google_breaker.guard(), client.lock:
+        yield client.service
+
+
+def evict_calendar_client(user_id):
+    with _clients_lock:
+        _clients.pop(user_id, None)
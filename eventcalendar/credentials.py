@@ -0,0 +1,69 @@
+import time
+
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from eventcalendar.models import GoogleCredentialStatus
+
+
+def get_token_expiry(social_user):
+    expiration = social_user.expiration_timedelta()
+    if expiration is None:
+        # Unknown lifetime, let the refresher take care of it
+        return timezone.now()
+    return timezone.now() + expiration
+
+
+def update_credential_status(social_user):
+    GoogleCredentialStatus.objects.update_or_create(
+        user_id=social_user.user_id,
+        defaults={
+            "social_auth": social_user,
+            "expires_at": get_token_expiry(social_user),
+            "is_valid": "access_token" in (social_user.extra_data or {}),
+        },
+    )
+
+
+def save_refreshed_credentials(credentials_list):
+    """
+    Write the refreshed access tokens back to extra_data and to the credential
+    statuses, with one bulk update each.
+    """
+    social_users = []
+    auth_time = int(time.time())
+    for credentials in credentials_list:
+        if credentials.refreshed:
+            social_user = credentials.social_user
+            social_user.extra_data["access_token"] = credentials.access_token
+            social_user.extra_data["auth_time"] = auth_time
+            if credentials.expires_in:
+                social_user.extra_data["expires"] = credentials.expires_in
+            social_users.append(social_user)
+    if not social_users:
+        return
+    UserSocialAuth.objects.bulk_update(social_users, ["extra_data"])
+
+    expiry_map = {
+        social_user.id: get_token_expiry(social_user) for social_user in social_users
+    }
+    statuses = list(
+        GoogleCredentialStatus.objects.filter(social_auth_id__in=expiry_map.keys())
+    )
+    for credential_status in statuses:
+        credential_status.expires_at = expiry_map[credential_status.social_auth_id]
+        credential_status.is_valid = True
+    GoogleCredentialStatus.objects.bulk_update(statuses, ["expires_at", "is_valid"])
+
+
+def get_expiring_statuses(refresh_before):
+    """
+    Valid credential statuses whose access token expires within refresh_before.
+    """
+    return (
+        GoogleCredentialStatus.objects.filter(
+            is_valid=True, expires_at__lte=timezone.now() + refresh_before
+        )
+        .select_related("social_auth")
+        .order_by("expires_at")
+    )
@@ -0,0 +1,327 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytz
+
+
+@dataclass
+class FakeGoogleConfig:
+    # Seconds added to every answer, plus up to `jitter` random seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of requests answered with a 503 (or a 429, see rate_limit_share)
+    error_rate: float = 0.0
+    rate_limit_share: float = 0.5
+    # events.list page size when the client does not ask for one
+    page_size: int = 250
+    # Events generated for every calendar the first time it is read
+    events_per_calendar: int = 20
+    token_ttl: int = 3600
+    channel_ttl: int = 7 * 24 * 60 * 60
+
+
+def _format_time(value):
+    return value.astimezone(pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class FakeCalendar:
+    def __init__(self, key, events_count):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.events = {}
+        # Deterministic per calendar, the same key always gets the same week
+        rng = random.Random(key)
+        week_start = datetime.now(pytz.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=datetime.now(pytz.utc).weekday())
+        for _ in range(events_count):
+            start = week_start + timedelta(
+                days=rng.randrange(7), hours=rng.randrange(8, 18)
+            )
+            self.add(
+                {
+                    "summary": "meeting",
+                    "start": {"dateTime": _format_time(start), "timeZone": "UTC"},
+                    "end": {
+                        "dateTime": _format_time(start + timedelta(hours=1)),
+                        "timeZone": "UTC",
+                    },
+                }
+            )
+
+    def add(self, body):
+        self.version += 1
+        event = {
+            **body,
+            "id": body.get("id") or uuid.uuid4().hex,
+            "status": "confirmed",
+            "htmlLink": "https://calendar.google.com/event",
+            "_version": self.version,
+        }
+        if body.get("conferenceData", {}).get("createRequest"):
+            event["hangoutLink"] = "https://meet.google.com/" + event["id"][:10]
+        self.events[event["id"]] = event
+        return event
+
+    def between(self, time_min, time_max):
+        for event in sorted(self.events.values(), key=lambda e: e["start"]["dateTime"]):
+            start = _parse_time(event["start"]["dateTime"])
+            end = _parse_time(event["end"]["dateTime"])
+            if time_min and end <= time_min:
+                continue
+            if time_max and start >= time_max:
+                continue
+            yield event
+
+
+class FakeGoogleState:
+    """
+    In-memory calendars, keyed by the bearer token of the request. The token
+    endpoint hands out the refresh token itself as the access token, so seed
+    users with access_token == refresh_token.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.calendars = {}
+        self.requests = 0
+
+    def calendar(self, key):
+        with self.lock:
+            if key not in self.calendars:
+                self.calendars[key] = FakeCalendar(
+                    key, self.config.events_per_calendar
+                )
+            return self.calendars[key]
+
+
+def _public(event):
+    return {key: value for key, value in event.items() if not key.startswith("_")}
+
+
+class FakeGoogleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    routes = [
+        ("POST", r"/token", "token"),
+        ("GET", r"/calendar/v3/calendars/([^/]+)/events", "events_list"),
+        ("POST", r"/calendar/v3/calendars/([^/]+)/events/watch", "events_watch"),
+        ("POST", r"/calendar/v3/calendars/([^/]+)/events", "events_insert"),
+        ("GET", r"/calendar/v3/calendars/([^/]+)/events/([^/]+)", "events_get"),
+        ("POST", r"/calendar/v3/freeBusy", "free_busy"),
+        ("POST", r"/calendar/v3/channels/stop", "channels_stop"),
+    ]
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        config = self.state.config
+        with self.state.lock:
+            self.state.requests += 1
+
+        url = urlparse(self.path)
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+        if random.random() < config.error_rate:
+            if random.random() < config.rate_limit_share:
+                return self.respond(429, {"error": {"code": 429}})
+            return self.respond(503, {"error": {"code": 503}})
+
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                return getattr(self, name)(*match.groups())
+        return self.respond(404, {"error": {"code": 404}})
+
+    def respond(self, status_code, data=None):
+        content = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def json_body(self):
+        return json.loads(self.body or b"{}")
+
+    def calendar(self):
+        authorization = self.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return None
+        return self.state.calendar(authorization[len("Bearer ") :])
+
+    def token(self):
+        form = {key: values[0] for key, values in parse_qs(self.body.decode()).items()}
+        if form.get("grant_type") != "refresh_token" or not form.get("refresh_token"):
+            return self.respond(400, {"error": "invalid_grant"})
+        return self.respond(
+            200,
+            {
+                "access_token": form["refresh_token"],
+                "expires_in": self.state.config.token_ttl,
+                "token_type": "Bearer",
+            },
+        )
+
+    def events_list(self, calendar_id):
+        calendar = self.calendar()
+        if calendar is None:
+            return self.respond(401, {"error": {"code": 401}})
+
+        page_size = int(self.query.get("maxResults") or self.state.config.page_size)
+        offset = int(self.query.get("pageToken") or 0)
+        with calendar.lock:
+            if "syncToken" in self.query:
+                since = int(self.query["syncToken"])
+                events = [
+                    e for e in calendar.between(None, None) if e["_version"] > since
+                ]
+            else:
+                time_min = self.query.get("timeMin")
+                time_max = self.query.get("timeMax")
+                events = list(
+                    calendar.between(
+                        _parse_time(time_min) if time_min else None,
+                        _parse_time(time_max) if time_max else None,
+                    )
+                )
+            version = calendar.version
+
+        page = events[offset : offset + page_size]
+        result = {"kind": "calendar#events", "items": [_public(e) for e in page]}
+        if offset + page_size < len(events):
+            result["nextPageToken"] = str(offset + page_size)
+        else:
+            result["nextSyncToken"] = str(version)
+        return self.respond(200, result)
+
+    def events_insert(self, calendar_id):
+        calendar = self.calendar()
+        if calendar is None:
+            return self.respond(401, {"error": {"code": 401}})
+
+        body = self.json_body()
+        with calendar.lock:
+            if body.get("id") in calendar.events:
+                return self.respond(409, {"error": {"code": 409}})
+            event = calendar.add(body)
+        return self.respond(200, _public(event))
+
+    def events_get(self, calendar_id, event_id):
+        calendar = self.calendar()
+        if calendar is None:
+            return self.respond(401, {"error": {"code": 401}})
+        event = calendar.events.get(event_id)
+        if event is None:
+            return self.respond(404, {"error": {"code": 404}})
+        return self.respond(200, _public(event))
+
+    def events_watch(self, calendar_id):
+        if self.calendar() is None:
+            return self.respond(401, {"error": {"code": 401}})
+        body = self.json_body()
+        expiration = time.time() + self.state.config.channel_ttl
+        return self.respond(
+            200,
+            {
+                "kind": "api#channel",
+                "id": body.get("id"),
+                "resourceId": uuid.uuid4().hex,
+                "expiration": str(int(expiration * 1000)),
+            },
+        )
+
+    def channels_stop(self):
+        return self.respond(204)
+
+    def free_busy(self):
+        calendar = self.calendar()
+        if calendar is None:
+            return self.respond(401, {"error": {"code": 401}})
+
+        body = self.json_body()
+        time_min = _parse_time(body["timeMin"])
+        time_max = _parse_time(body["timeMax"])
+        with calendar.lock:
+            busy = [
+                {"start": e["start"]["dateTime"], "end": e["end"]["dateTime"]}
+                for e in calendar.between(time_min, time_max)
+            ]
+        calendars = {item["id"]: {"busy": busy} for item in body.get("items", [])}
+        return self.respond(200, {"kind": "calendar#freeBusy", "calendars": calendars})
+
+
+class FakeGoogleServer(ThreadingHTTPServer):
+    """
+    A stand-in for the google calendar and oauth token APIs, for load tests
+    and benchmarks. Point GOOGLE_CALENDAR_API_URL at `api_url` and
+    GOOGLE_TOKEN_URI at `token_uri`.
+
+        with FakeGoogleServer(FakeGoogleConfig(latency=0.1)) as server:
+            ...
+    """
+
+    daemon_threads = True
+    # The default of 5 drops connections under benchmark load
+    request_queue_size = 1024
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.state = FakeGoogleState(config or FakeGoogleConfig())
+        super().__init__((host, port), FakeGoogleHandler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return self.base_url + "/calendar/v3"
+
+    @property
+    def token_uri(self):
+        return self.base_url + "/token"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
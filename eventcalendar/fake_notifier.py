@@ -0,0 +1,49 @@
+import requests
+from django.utils import timezone
+
+from eventcalendar.channels import get_notification_url
+
+
+class FakeNotifier:
+    """
+    Posts push notifications for a channel with the same headers google sends,
+    so the notification endpoint can be exercised locally and in tests.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.message_number = 0
+
+    def headers(self, resource_state="exists"):
+        self.message_number += 1
+        expiration = timezone.localtime(self.channel.expiration, timezone.utc)
+        return {
+            "X-Goog-Channel-ID": self.channel.channel_id,
+            "X-Goog-Channel-Token": self.channel.token,
+            "X-Goog-Channel-Expiration": expiration.strftime(
+                "%a, %d %b %Y %H:%M:%S GMT"
+            ),
+            "X-Goog-Resource-ID": self.channel.resource_id,
+            "X-Goog-Resource-URI": (
+                "https://www.googleapis.com/calendar/v3/calendars/primary/events"
+            ),
+            "X-Goog-Resource-State": resource_state,
+            "X-Goog-Message-Number": str(self.message_number),
+        }
+
+    def send(self, url=None, resource_state="exists"):
+        return requests.post(
+            url or get_notification_url(),
+            headers=self.headers(resource_state),
+            timeout=10,
+        )
+
+    def send_with_client(self, client, url, resource_state="exists"):
+        """
+        Send through a django/DRF test client.
+        """
+        meta = {
+            "HTTP_" + name.upper().replace("-", "_"): value
+            for name, value in self.headers(resource_state).items()
+        }
+        return client.post(url, **meta)
@@ -0,0 +1,89 @@
+import json
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.views import APIView
+
+from eventcalendar.benchmark import (SCENARIOS, create_benchmark_instructors,
+                                     delete_benchmark_instructors)
+from eventcalendar.fake_google import FakeGoogleConfig, FakeGoogleServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the calendar code paths against the fake google server, "
+        "in a throwaway test database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--instructors", default="10,100,1000")
+        parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=None,
+            help="Requests per scenario, defaults to the number of instructors",
+        )
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--latency", type=float, default=0.05)
+        parser.add_argument("--jitter", type=float, default=0.05)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--page-size", type=int, default=250)
+        parser.add_argument("--events", type=int, default=20)
+        parser.add_argument("--json", action="store_true")
+
+    def handle(self, *args, **options):
+        scenarios = options["scenarios"].split(",")
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scales = [int(count) for count in options["instructors"].split(",")]
+
+        config = FakeGoogleConfig(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            page_size=options["page_size"],
+            events_per_calendar=options["events"],
+        )
+
+        # Run the celery tasks inline, there is no worker in the benchmark
+        from didar.celery_conf import app
+
+        app.conf.task_always_eager = True
+
+        old_database_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        results = []
+        try:
+            with FakeGoogleServer(config) as server, override_settings(
+                GOOGLE_CALENDAR_API_URL=server.api_url,
+                GOOGLE_TOKEN_URI=server.token_uri,
+            ), mock.patch.object(APIView, "get_throttles", return_value=[]):
+                for count in scales:
+                    instructors = create_benchmark_instructors(count)
+                    for scenario in scenarios:
+                        result = SCENARIOS[scenario](
+                            instructors,
+                            options["requests"] or count,
+                            options["concurrency"],
+                        )
+                        results.append(result.as_dict())
+                        if not options["json"]:
+                            self.write_result(results[-1])
+                    delete_benchmark_instructors()
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+
+    def write_result(self, result):
+        self.stdout.write(
+            "{scenario:<15} instructors={instructors:<5} count={count:<5} "
+            "errors={errors:<4} {throughput:>9.2f}/s  p50={p50:.4f}s "
+            "p95={p95:.4f}s p99={p99:.4f}s max={max:.4f}s".format(**result)
+        )
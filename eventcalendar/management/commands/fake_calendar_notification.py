@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from eventcalendar.fake_notifier import FakeNotifier
+from eventcalendar.models import CalendarChannel
+
+
+class Command(BaseCommand):
+    help = "Post a fake google calendar push notification for a channel"
+
+    def add_arguments(self, parser):
+        parser.add_argument("channel_id")
+        parser.add_argument("--state", default="exists")
+        parser.add_argument("--url", default=None)
+
+    def handle(self, *args, **options):
+        try:
+            channel = CalendarChannel.objects.get(channel_id=options["channel_id"])
+        except CalendarChannel.DoesNotExist:
+            raise CommandError("Channel does not exist!")
+
+        response = FakeNotifier(channel).send(
+            url=options["url"], resource_state=options["state"]
+        )
+        self.stdout.write(f"Notification answered with {response.status_code}")
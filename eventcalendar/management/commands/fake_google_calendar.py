@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from eventcalendar.fake_google import FakeGoogleConfig, FakeGoogleServer
+
+
+class Command(BaseCommand):
+    help = "Run a fake google calendar and oauth token server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=0.0)
+        parser.add_argument("--jitter", type=float, default=0.0)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--page-size", type=int, default=250)
+        parser.add_argument("--events", type=int, default=20)
+
+    def handle(self, *args, **options):
+        config = FakeGoogleConfig(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            page_size=options["page_size"],
+            events_per_calendar=options["events"],
+        )
+        server = FakeGoogleServer(config, host=options["host"], port=options["port"])
+        self.stdout.write(
+            f"GOOGLE_CALENDAR_API_URL={server.api_url}\n"
+            f"GOOGLE_TOKEN_URI={server.token_uri}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
@@ -0,0 +1,48 @@
+# Generated by Django 3.2.9 on 2026-10-18 12:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0004_auto_20250131_1944'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarSync',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sync_token', models.CharField(blank=True, max_length=255, null=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('instructor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_sync', to='users.instructor')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CalendarEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('google_id', models.CharField(max_length=1024)),
+                ('summary', models.CharField(blank=True, max_length=1024, null=True)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('start_time_zone', models.CharField(blank=True, max_length=64, null=True)),
+                ('end_time_zone', models.CharField(blank=True, max_length=64, null=True)),
+                ('html_link', models.URLField(blank=True, max_length=1024, null=True)),
+                ('hangout_link', models.URLField(blank=True, max_length=1024, null=True)),
+                ('instructor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_events', to='users.instructor')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['instructor', 'start'], name='eventcalend_instruc_378d9d_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='calendarevent',
+            unique_together={('instructor', 'google_id')},
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2.9 on 2026-10-18 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def create_credential_statuses(apps, schema_editor):
+    UserSocialAuth = apps.get_model("social_django", "UserSocialAuth")
+    GoogleCredentialStatus = apps.get_model("eventcalendar", "GoogleCredentialStatus")
+
+    # The newest social auth of a user wins, expiry is set by the first refresh
+    statuses = {
+        social_user.user_id: GoogleCredentialStatus(
+            user_id=social_user.user_id,
+            social_auth_id=social_user.id,
+            expires_at=timezone.now(),
+            is_valid="access_token" in (social_user.extra_data or {}),
+        )
+        for social_user in UserSocialAuth.objects.filter(
+            provider="google-oauth2"
+        ).order_by("id")
+    }
+    GoogleCredentialStatus.objects.bulk_create(statuses.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('social_django', '0016_alter_usersocialauth_extra_data'),
+        ('eventcalendar', '0002_calendarchannel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoogleCredentialStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('is_valid', models.BooleanField(default=True)),
+                ('social_auth', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='credential_status', to='social_django.usersocialauth')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='google_credential', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(create_credential_statuses, migrations.RunPython.noop),
+    ]
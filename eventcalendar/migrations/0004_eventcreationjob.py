@@ -0,0 +1,33 @@
+# Generated by Django 3.2.9 on 2026-10-18 12:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_auto_20250131_1944'),
+        ('eventcalendar', '0003_googlecredentialstatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventCreationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=255)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('event', models.JSONField(blank=True, null=True)),
+                ('error', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('instructor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_jobs', to='users.instructor')),
+            ],
+            options={
+                'unique_together': {('instructor', 'idempotency_key')},
+            },
+        ),
+    ]
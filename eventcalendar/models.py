@@ -1,3 +1,137 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+
+class CalendarSync(models.Model):
+    instructor = models.OneToOneField(
+        "users.Instructor", on_delete=models.CASCADE, related_name="calendar_sync"
+    )
+    sync_token = models.CharField(max_length=255, null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.instructor} - {self.synced_at}"
+
+    @property
+    def is_stale(self):
+        if self.synced_at is None:
+            return True
+        stale_after = timedelta(seconds=settings.GOOGLE_CALENDAR_SYNC_STALE_AFTER)
+        return timezone.now() - self.synced_at > stale_after
+
+
+class CalendarEvent(models.Model):
+    instructor = models.ForeignKey(
+        "users.Instructor", on_delete=models.CASCADE, related_name="calendar_events"
+    )
+    google_id = models.CharField(max_length=1024)
+    summary = models.CharField(max_length=1024, null=True, blank=True)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    start_time_zone = models.CharField(max_length=64, null=True, blank=True)
+    end_time_zone = models.CharField(max_length=64, null=True, blank=True)
+    html_link = models.URLField(max_length=1024, null=True, blank=True)
+    hangout_link = models.URLField(max_length=1024, null=True, blank=True)
+
+    class Meta:
+        unique_together = ("instructor", "google_id")
+        indexes = [models.Index(fields=["instructor", "start"])]
+
+    def __str__(self):
+        return f"{self.instructor} - {self.summary}"
+
+    def as_google_event(self):
+        """
+        Return the event in the shape of a google calendar event resource.
+        """
+        event = {
+            "summary": self.summary,
+            "start": {"dateTime": self.start, "timeZone": self.start_time_zone},
+            "end": {"dateTime": self.end, "timeZone": self.end_time_zone},
+        }
+        if self.html_link:
+            event["htmlLink"] = self.html_link
+        if self.hangout_link:
+            event["hangoutLink"] = self.hangout_link
+        return event
+
+
+class CalendarChannel(models.Model):
+    """
+    A google calendar push notification channel (events.watch) of an instructor.
+    """
+
+    instructor = models.ForeignKey(
+        "users.Instructor", on_delete=models.CASCADE, related_name="calendar_channels"
+    )
+    channel_id = models.CharField(max_length=64, unique=True)
+    resource_id = models.CharField(max_length=255)
+    token = models.CharField(max_length=64)
+    expiration = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.instructor} - {self.expiration}"
+
+
+class GoogleCredentialStatus(models.Model):
+    """
+    Access token expiry and health of a user's google-oauth2 social auth, kept
+    in columns so expiring tokens and broken credentials are indexed lookups.
+    """
+
+    user = models.OneToOneField(
+        "users.User", on_delete=models.CASCADE, related_name="google_credential"
+    )
+    social_auth = models.OneToOneField(
+        "social_django.UserSocialAuth",
+        on_delete=models.CASCADE,
+        related_name="credential_status",
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    is_valid = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.expires_at}"
+
+
+class EventCreationJob(models.Model):
+    """
+    An event creation queued for the celery workers. The job id doubles as
+    the google event id and the meet requestId, so retries are idempotent.
+    """
+
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    instructor = models.ForeignKey(
+        "users.Instructor", on_delete=models.CASCADE, related_name="event_jobs"
+    )
+    idempotency_key = models.CharField(max_length=255)
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    event = models.JSONField(null=True, blank=True)
+    error = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("instructor", "idempotency_key")
+
+    def __str__(self):
+        return f"{self.instructor} - {self.status}"
 
-# Create your models here.
+    @property
+    def google_event_id(self):
+        # google event ids are base32hex, which hex digits are a subset of
+        return self.id.hex
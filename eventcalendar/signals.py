@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from social_django.models import UserSocialAuth
+
+from eventcalendar.clients import GOOGLE_PROVIDER, evict_calendar_client
+from eventcalendar.credentials import update_credential_status
+
+
+@receiver(post_save, sender=UserSocialAuth)
+@receiver(post_delete, sender=UserSocialAuth)
+def evict_client_on_credential_change(sender, instance, **kwargs):
+    if instance.provider == GOOGLE_PROVIDER:
+        evict_calendar_client(instance.user_id)
+
+
+@receiver(post_save, sender=UserSocialAuth)
+def update_credential_status_on_save(sender, instance, **kwargs):
+    if instance.provider == GOOGLE_PROVIDER:
+        update_credential_status(instance)
@@ -0,0 +1,140 @@
+from datetime import datetime, time, timedelta
+
+import pytz
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from googleapiclient.errors import HttpError
+
+from eventcalendar.clients import calendar_service
+from eventcalendar.models import CalendarEvent, CalendarSync
+from utils.loggers import stdout_logger
+
+EVENT_FIELDS = [
+    "summary",
+    "start",
+    "end",
+    "start_time_zone",
+    "end_time_zone",
+    "html_link",
+    "hangout_link",
+]
+
+
+def _parse_event_time(value):
+    """
+    Google sends `dateTime` for timed events and `date` for all-day events.
+    """
+    time_zone = value.get("timeZone") or settings.TIME_ZONE
+    if value.get("dateTime"):
+        return parse_datetime(value["dateTime"]), time_zone
+    day = datetime.combine(parse_date(value["date"]), time.min)
+    return pytz.timezone(time_zone).localize(day), time_zone
+
+
+def _event_from_resource(instructor, resource):
+    start, start_time_zone = _parse_event_time(resource["start"])
+    end, end_time_zone = _parse_event_time(resource["end"])
+    return CalendarEvent(
+        instructor=instructor,
+        google_id=resource["id"],
+        summary=resource.get("summary"),
+        start=start,
+        end=end,
+        start_time_zone=start_time_zone,
+        end_time_zone=end_time_zone,
+        html_link=resource.get("htmlLink"),
+        hangout_link=resource.get("hangoutLink"),
+    )
+
+
+def _list_changes(instructor, sync_token):
+    """
+    Page through events.list and return (changed resources, next sync token).
+    Without a sync token this is a full sync starting from the sync window.
+    """
+    params = {"calendarId": "primary", "singleEvents": True}
+    if sync_token:
+        params["syncToken"] = sync_token
+    else:
+        window = timedelta(days=settings.GOOGLE_CALENDAR_SYNC_WINDOW_DAYS)
+        params["timeMin"] = (timezone.now() - window).isoformat()
+
+    resources = []
+    page_token = None
+    with calendar_service(instructor.user) as service:
+        while True:
+            result = service.events().list(pageToken=page_token, **params).execute()
+            resources.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return resources, result.get("nextSyncToken")
+
+
+@transaction.atomic
+def _apply_changes(instructor, resources, full_sync):
+    if full_sync:
+        CalendarEvent.objects.filter(instructor=instructor).delete()
+
+    cancelled_ids = [r["id"] for r in resources if r.get("status") == "cancelled"]
+    changed = {
+        r["id"]: _event_from_resource(instructor, r)
+        for r in resources
+        if r.get("status") != "cancelled"
+    }
+
+    CalendarEvent.objects.filter(
+        instructor=instructor, google_id__in=cancelled_ids
+    ).delete()
+
+    existing_ids = dict(
+        CalendarEvent.objects.filter(
+            instructor=instructor, google_id__in=changed.keys()
+        ).values_list("google_id", "id")
+    )
+    to_update = []
+    to_create = []
+    for google_id, event in changed.items():
+        if google_id in existing_ids:
+            event.id = existing_ids[google_id]
+            to_update.append(event)
+        else:
+            to_create.append(event)
+
+    CalendarEvent.objects.bulk_update(to_update, EVENT_FIELDS)
+    CalendarEvent.objects.bulk_create(to_create)
+
+
+def store_event(instructor, resource):
+    """
+    Save a single event resource, e.g. one we just created on google calendar.
+    """
+    _apply_changes(instructor, [resource], full_sync=False)
+
+
+def sync_instructor_events(instructor):
+    """
+    Bring the stored events of the instructor up to date with google calendar
+    using the incremental sync protocol. A 410 response means the sync token
+    has expired, so the stored events are dropped and a full sync is done.
+    """
+    calendar_sync, _ = CalendarSync.objects.get_or_create(instructor=instructor)
+    sync_token = calendar_sync.sync_token
+
+    stdout_logger.info(f"Syncing {instructor} events from google calender...")
+    try:
+        resources, next_sync_token = _list_changes(instructor, sync_token)
+    except HttpError as error:
+        if error.resp.status != 410 or not sync_token:
+            raise
+        stdout_logger.info(f"Sync token of {instructor} expired, doing full sync.")
+        sync_token = None
+        resources, next_sync_token = _list_changes(instructor, sync_token)
+
+    _apply_changes(instructor, resources, full_sync=sync_token is None)
+
+    calendar_sync.sync_token = next_sync_token
+    calendar_sync.synced_at = timezone.now()
+    calendar_sync.save(update_fields=["sync_token", "synced_at"])
+    return calendar_sync
@@ -0,0 +1,216 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from google.auth.exceptions import RefreshError
+from rest_framework import status
+
+from eventcalendar.async_client import refresh_credential_statuses
+from eventcalendar.breaker import CircuitOpenError, is_outage
+from eventcalendar.channels import (get_notification_url, get_renew_threshold,
+                                    get_replaced_channels, stop_channel,
+                                    watch_instructor_calendar)
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.credentials import get_expiring_statuses
+from eventcalendar.models import CalendarChannel, EventCreationJob
+from eventcalendar.sync import store_event, sync_instructor_events
+from users.models import Instructor
+from utils.api.error_objects import ErrorObject
+from utils.loggers import stdout_logger
+from utils.validators import CustomValidationError
+
+SYNC_LOCK_TIMEOUT = 5 * 60
+EVENT_CREATION_MAX_RETRIES = 3
+EVENT_CREATION_RETRY_DELAY = 5
+
+
+def _sync_lock_key(instructor_id):
+    return f"calendar-sync-lock:{instructor_id}"
+
+
+def _sync_queued_key(instructor_id):
+    return f"calendar-sync-queued:{instructor_id}"
+
+
+def request_calendar_sync(instructor_id):
+    """
+    Enqueue a sync of the instructor calendar unless one is already queued.
+    """
+    if cache.add(
+        _sync_queued_key(instructor_id),
+        1,
+        timeout=settings.GOOGLE_CALENDAR_SYNC_STALE_AFTER,
+    ):
+        sync_instructor_calendar.delay(instructor_id)
+
+
+@contextmanager
+def calendar_sync_lock(instructor_id):
+    """
+    Only one sync per instructor at a time, the sync token is not shareable.
+    Yields whether the lock was taken, the sync is skipped otherwise.
+    """
+    locked = cache.add(_sync_lock_key(instructor_id), 1, timeout=SYNC_LOCK_TIMEOUT)
+    try:
+        yield locked
+    finally:
+        if locked:
+            cache.delete(_sync_lock_key(instructor_id))
+
+
+@shared_task
+def sync_instructor_calendar(instructor_id):
+    cache.delete(_sync_queued_key(instructor_id))
+    with calendar_sync_lock(instructor_id) as locked:
+        if not locked:
+            return
+        try:
+            instructor = Instructor.objects.select_related("user").get(
+                id=instructor_id
+            )
+            sync_instructor_events(instructor)
+        except Instructor.DoesNotExist:
+            stdout_logger.error(f"Instructor {instructor_id} does not exist!")
+        except CircuitOpenError:
+            stdout_logger.info(f"Google is down, skipped syncing {instructor_id}.")
+        except Exception:
+            stdout_logger.exception(
+                f"Syncing instructor {instructor_id} events faild."
+            )
+
+
+@shared_task
+def renew_calendar_channels():
+    """
+    Open a fresh notification channel for every instructor connected to google
+    whose channels lapse soon (or who has none), then stop the replaced ones.
+    """
+    CalendarChannel.objects.filter(expiration__lte=timezone.now()).delete()
+
+    try:
+        get_notification_url()
+    except ImproperlyConfigured as error:
+        # Every watch would fail the same way
+        stdout_logger.error(f"Not renewing calendar channels: {error}")
+        return
+
+    instructor_objs = (
+        Instructor.objects.filter(user__social_auth__provider=GOOGLE_PROVIDER)
+        .exclude(calendar_channels__expiration__gt=get_renew_threshold())
+        .select_related("user")
+        .distinct()
+    )
+    for instructor in instructor_objs:
+        try:
+            watch_instructor_calendar(instructor)
+        except Exception:
+            stdout_logger.error(f"Watching {instructor} calender faild.")
+            continue
+        # A channel only reports the changes after it opens, the store may
+        # have never been filled or missed some while no channel was open
+        request_calendar_sync(instructor.id)
+
+    for channel in get_replaced_channels():
+        stop_channel(channel)
+
+
+@shared_task
+def refresh_expiring_google_credentials():
+    """
+    Refresh the google access tokens that expire within
+    GOOGLE_TOKEN_REFRESH_BEFORE, in batches, so request paths never have to.
+    """
+    refresh_before = timedelta(seconds=settings.GOOGLE_TOKEN_REFRESH_BEFORE)
+    batch_size = settings.GOOGLE_TOKEN_REFRESH_BATCH_SIZE
+    summary = {"refreshed": 0, "invalid": 0, "failed": 0}
+    seen_ids = set()
+    while True:
+        # Failed refreshes keep their expiry, skip them until the next run
+        statuses = list(
+            get_expiring_statuses(refresh_before).exclude(id__in=seen_ids)[
+                :batch_size
+            ]
+        )
+        if not statuses:
+            break
+        seen_ids.update(credential_status.id for credential_status in statuses)
+        result = refresh_credential_statuses(
+            statuses, max_concurrency=settings.GOOGLE_TOKEN_REFRESH_CONCURRENCY
+        )
+        for counter in summary:
+            summary[counter] += result[counter]
+
+    stdout_logger.info(
+        f"Refreshed {summary['refreshed']} google credentials, "
+        f"{summary['invalid']} invalid, {summary['failed']} failed."
+    )
+    return summary
+
+
+def _fail_event_job(job, error_object, detail=None):
+    job.status = EventCreationJob.FAILED
+    job.error = {**error_object, "detail": detail}
+    job.save(update_fields=["status", "error", "updated_at"])
+
+
+@shared_task(bind=True, max_retries=EVENT_CREATION_MAX_RETRIES)
+def create_instructor_event(self, job_id):
+    """
+    Create the event of a queued EventCreationJob on the instructor's google
+    calendar. Rate limits and google server errors are retried with backoff.
+    """
+    try:
+        job = EventCreationJob.objects.select_related("instructor__user").get(
+            id=job_id
+        )
+    except EventCreationJob.DoesNotExist:
+        stdout_logger.error(f"Event creation job {job_id} does not exist!")
+        return
+    if job.status != EventCreationJob.PENDING:
+        return
+
+    payload = job.payload
+    try:
+        created_event = job.instructor.user.create_google_calendar_event(
+            summary=payload["summary"],
+            start=parse_datetime(payload["start"]),
+            end=parse_datetime(payload["end"]),
+            attendees_emails=payload["attendees_emails"],
+            time_zone=payload["time_zone"],
+            request_id=job.google_event_id,
+            event_id=job.google_event_id,
+        )
+    except RefreshError:
+        _fail_event_job(job, ErrorObject.GOOGLE_CREDENTIAL_NOT_FOUND)
+        return
+    except CustomValidationError as error:
+        retryable = error.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        if retryable and self.request.retries < self.max_retries:
+            raise self.retry(
+                countdown=EVENT_CREATION_RETRY_DELAY * 2**self.request.retries
+            )
+        _fail_event_job(job, error.error_object, error.detail)
+        return
+    except Exception as error:
+        # Anything else ends the job too, clients poll it until it does
+        if is_outage(error):
+            if self.request.retries < self.max_retries:
+                raise self.retry(
+                    countdown=EVENT_CREATION_RETRY_DELAY * 2**self.request.retries
+                )
+            _fail_event_job(job, ErrorObject.SERVICE_UNAVAILABLE, str(error))
+            return
+        stdout_logger.exception(f"Event creation job {job_id} faild.")
+        _fail_event_job(job, ErrorObject.SERVER_ERROR, str(error))
+        return
+
+    store_event(job.instructor, created_event)
+    job.status = EventCreationJob.SUCCEEDED
+    job.event = created_event
+    job.error = None
+    job.save(update_fields=["status", "event", "error", "updated_at"])
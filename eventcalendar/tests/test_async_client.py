@@ -0,0 +1,116 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from eventcalendar.async_client import (AsyncCalendarClient, AsyncCalendarError,
+                                        AsyncCredentials)
+from eventcalendar.breaker import google_breaker
+from eventcalendar.clients import GOOGLE_PROVIDER
+from users.factories import UserFactory
+
+
+@override_settings(GOOGLE_CALENDAR_ASYNC_BACKOFF=0)
+class TestAsyncCalendarClient(TestCase):
+    def setUp(self):
+        google_breaker.reset()
+        user = UserFactory()
+        self.social_user = UserSocialAuth(
+            user=user,
+            provider=GOOGLE_PROVIDER,
+            extra_data={"access_token": "expired", "refresh_token": "refresh"},
+        )
+        self.requests = []
+
+    def run_client(self, handler, coroutine_factory, **kwargs):
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        async def main():
+            transport = httpx.MockTransport(record)
+            async with AsyncCalendarClient(transport=transport, **kwargs) as client:
+                return await coroutine_factory(client)
+
+        return asyncio.run(main())
+
+    def test_list_events_follows_pages(self):
+        def handler(request):
+            if "pageToken" in request.url.params:
+                return httpx.Response(200, json={"items": [{"id": "b"}]})
+            return httpx.Response(
+                200, json={"items": [{"id": "a"}], "nextPageToken": "2"}
+            )
+
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+        items = self.run_client(handler, lambda c: c.list_events(credentials))
+        self.assertEqual([item["id"] for item in items], ["a", "b"])
+
+    def test_retries_server_errors(self):
+        statuses = iter([503, 500, 200])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json={"items": []})
+
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+        self.run_client(handler, lambda c: c.list_events(credentials), max_retries=2)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_gives_up_after_retries(self):
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+        with self.assertRaises(AsyncCalendarError):
+            self.run_client(
+                lambda request: httpx.Response(503),
+                lambda c: c.list_events(credentials),
+                max_retries=1,
+            )
+        self.assertEqual(len(self.requests), 2)
+
+    def test_refreshes_expired_token(self):
+        def handler(request):
+            if request.url.host == "oauth2.googleapis.com":
+                return httpx.Response(200, json={"access_token": "fresh"})
+            if request.headers["Authorization"] == "Bearer expired":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"items": []})
+
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+        self.run_client(handler, lambda c: c.list_events(credentials))
+        self.assertTrue(credentials.refreshed)
+        self.assertEqual(credentials.access_token, "fresh")
+
+    def test_concurrency_is_bounded_per_user(self):
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return httpx.Response(200, json={"items": []})
+
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+
+        async def fetch_many(client):
+            await asyncio.gather(*[client.list_events(credentials) for _ in range(10)])
+
+        self.run_client(handler, fetch_many, per_user_concurrency=2)
+        self.assertEqual(max(peak), 2)
+
+    def test_free_busy_returns_busy_intervals(self):
+        busy = [{"start": "2024-10-05T07:00:00Z", "end": "2024-10-05T08:00:00Z"}]
+
+        def handler(request):
+            return httpx.Response(200, json={"calendars": {"primary": {"busy": busy}}})
+
+        credentials = AsyncCredentials.from_social_user(self.social_user)
+        now = timezone.now()
+        result = self.run_client(
+            handler, lambda c: c.free_busy(credentials, now, now + timedelta(hours=1))
+        )
+        self.assertEqual(result, busy)
+        self.assertEqual(self.requests[0].url.path, "/calendar/v3/freeBusy")
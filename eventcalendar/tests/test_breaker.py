@@ -0,0 +1,134 @@
+from datetime import timedelta
+from unittest import mock
+
+import httplib2
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from googleapiclient.errors import HttpError
+from rest_framework.test import APITestCase
+from social_django.models import UserSocialAuth
+
+from eventcalendar.breaker import CircuitBreaker, CircuitOpenError, google_breaker
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.models import CalendarEvent, CalendarSync
+from users.factories import InstructorFactory
+from utils.api.error_objects import ErrorObject
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+def socket_timeout():
+    return TimeoutError("timed out")
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("test", threshold=2, window=30, reset_timeout=30)
+        self.breaker.reset()
+
+    def tearDown(self):
+        self.breaker.reset()
+
+    def fail(self, error):
+        with self.assertRaises(type(error)):
+            with self.breaker.guard():
+                raise error
+
+    def test_opens_after_threshold(self):
+        self.fail(http_error(503))
+        self.assertEqual(self.breaker.state, "closed")
+        self.fail(socket_timeout())
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            with self.breaker.guard():
+                pass
+
+    def test_client_errors_do_not_count(self):
+        for _ in range(3):
+            self.fail(http_error(404))
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_successes_do_not_reset_failures(self):
+        self.fail(http_error(500))
+        with self.breaker.guard():
+            pass
+        self.fail(http_error(500))
+        self.assertEqual(self.breaker.state, "open")
+
+    def test_failures_expire_with_the_window(self):
+        self.fail(http_error(500))
+        # The window runs out
+        cache.delete(self.breaker._key("failures"))
+        self.fail(http_error(500))
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_lets_one_probe_through(self):
+        self.fail(http_error(503))
+        self.fail(http_error(503))
+        with mock.patch("eventcalendar.breaker.time.time") as now:
+            now.return_value = timezone.now().timestamp() + 60
+            self.assertEqual(self.breaker.state, "half_open")
+            self.assertTrue(self.breaker.allow_request())
+            self.assertFalse(self.breaker.allow_request())
+
+            # The probe failed, open again
+            self.breaker.record_failure()
+            self.assertEqual(self.breaker.state, "open")
+
+    def test_successful_probe_closes(self):
+        self.fail(http_error(503))
+        self.fail(http_error(503))
+        with mock.patch("eventcalendar.breaker.time.time") as now:
+            now.return_value = timezone.now().timestamp() + 60
+            with self.breaker.guard():
+                pass
+        self.assertEqual(self.breaker.state, "closed")
+
+
+@override_settings(GOOGLE_CALENDAR_BREAKER_THRESHOLD=1)
+class TestEventsWhileGoogleIsDown(APITestCase):
+    def setUp(self):
+        self.url = reverse("eventcalendar:v1:instructor_events_list")
+        self.instructor = InstructorFactory()
+        self.client.force_login(self.instructor.user)
+        google_breaker.reset()
+        google_breaker.record_failure()
+
+    def tearDown(self):
+        google_breaker.reset()
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_serves_stale_week(self, request_calendar_sync):
+        CalendarSync.objects.create(
+            instructor=self.instructor,
+            synced_at=timezone.now() - timedelta(days=1),
+        )
+        CalendarEvent.objects.create(
+            instructor=self.instructor,
+            google_id="upcoming",
+            summary="upcoming",
+            start=timezone.now() + timedelta(minutes=10),
+            end=timezone.now() + timedelta(minutes=70),
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 1)
+        self.assertTrue(response["Warning"].startswith("110"))
+        request_calendar_sync.assert_not_called()
+
+    def test_nothing_synced_fail_fast(self):
+        UserSocialAuth.objects.create(
+            user=self.instructor.user,
+            provider=GOOGLE_PROVIDER,
+            uid=self.instructor.user.email,
+            extra_data={"access_token": "access", "refresh_token": "refresh"},
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["error"]["code"], ErrorObject.SERVICE_UNAVAILABLE["code"]
+        )
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from social_django.models import UserSocialAuth
+
+from eventcalendar.api.v1.views import CalendarNotificationAPIView
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.fake_notifier import FakeNotifier
+from eventcalendar.models import CalendarChannel
+from eventcalendar.tasks import renew_calendar_channels
+from users.factories import InstructorFactory
+
+
+def create_channel(instructor, channel_id="channel-1", expires_in=timedelta(days=6)):
+    return CalendarChannel.objects.create(
+        instructor=instructor,
+        channel_id=channel_id,
+        resource_id="resource-1",
+        token="secret-token",
+        expiration=timezone.now() + expires_in,
+    )
+
+
+class TestCalendarNotificationAPIView(APITestCase):
+    def setUp(self):
+        self.url = reverse("eventcalendar:v1:calendar_notifications")
+        self.instructor = InstructorFactory()
+        self.channel = create_channel(self.instructor)
+        self.notifier = FakeNotifier(self.channel)
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_notification_requests_sync(self, request_calendar_sync):
+        response = self.notifier.send_with_client(self.client, self.url)
+        self.assertEqual(response.status_code, 200)
+        request_calendar_sync.assert_called_once_with(self.instructor.id)
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_sync_notification_requests_sync(self, request_calendar_sync):
+        response = self.notifier.send_with_client(
+            self.client, self.url, resource_state="sync"
+        )
+        self.assertEqual(response.status_code, 200)
+        request_calendar_sync.assert_called_once_with(self.instructor.id)
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_invalid_token_fail(self, request_calendar_sync):
+        self.channel.token = "other-token"
+        response = self.notifier.send_with_client(self.client, self.url)
+        self.assertEqual(response.status_code, 403)
+        request_calendar_sync.assert_not_called()
+
+    def test_unknown_channel_fail(self):
+        self.channel.channel_id = "unknown"
+        response = self.notifier.send_with_client(self.client, self.url)
+        self.assertEqual(response.status_code, 404)
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_expired_channel_fail(self, request_calendar_sync):
+        CalendarChannel.objects.filter(pk=self.channel.pk).update(
+            expiration=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.notifier.send_with_client(self.client, self.url)
+        self.assertEqual(response.status_code, 404)
+        request_calendar_sync.assert_not_called()
+
+    def test_resolve_url(self):
+        resolver = resolve("/api/v1/calendar/notifications/")
+        self.assertEqual(resolver.view_name, "eventcalendar:v1:calendar_notifications")
+        self.assertEqual(resolver.func.view_class, CalendarNotificationAPIView)
+        self.assertEqual(resolver.namespace, "eventcalendar:v1")
+        self.assertEqual(resolver.url_name, "calendar_notifications")
+
+
+@override_settings(BACKEND_URL="https://api.didar.com")
+class TestRenewCalendarChannels(APITestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+        UserSocialAuth.objects.create(
+            user=self.instructor.user,
+            provider=GOOGLE_PROVIDER,
+            uid=self.instructor.user.email,
+            extra_data={"access_token": "access", "refresh_token": "refresh"},
+        )
+
+    def fake_watch(self, instructor):
+        return create_channel(instructor, channel_id="renewed")
+
+    @mock.patch("eventcalendar.tasks.request_calendar_sync")
+    @mock.patch("eventcalendar.tasks.stop_channel")
+    def test_expiring_channel_is_renewed_and_stopped(
+        self, stop_channel, request_calendar_sync
+    ):
+        expiring = create_channel(self.instructor, expires_in=timedelta(hours=1))
+        with mock.patch(
+            "eventcalendar.tasks.watch_instructor_calendar", side_effect=self.fake_watch
+        ) as watch:
+            renew_calendar_channels()
+        watch.assert_called_once_with(self.instructor)
+        stop_channel.assert_called_once_with(expiring)
+        request_calendar_sync.assert_called_once_with(self.instructor.id)
+
+    @mock.patch("eventcalendar.tasks.stop_channel")
+    def test_live_channel_is_kept(self, stop_channel):
+        create_channel(self.instructor)
+        with mock.patch("eventcalendar.tasks.watch_instructor_calendar") as watch:
+            renew_calendar_channels()
+        watch.assert_not_called()
+        stop_channel.assert_not_called()
+
+    @override_settings(BACKEND_URL=None)
+    @mock.patch("eventcalendar.tasks.stdout_logger")
+    def test_nothing_is_watched_without_backend_url(self, stdout_logger):
+        create_channel(self.instructor, expires_in=timedelta(hours=1))
+        with mock.patch("eventcalendar.tasks.watch_instructor_calendar") as watch:
+            renew_calendar_channels()
+        watch.assert_not_called()
+        stdout_logger.error.assert_called_once()
+        self.assertIn("BACKEND_URL", stdout_logger.error.call_args[0][0])
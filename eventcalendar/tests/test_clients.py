@@ -0,0 +1,34 @@
+from django.test import TestCase
+from social_django.models import UserSocialAuth
+
+from eventcalendar.clients import (GOOGLE_PROVIDER, evict_calendar_client,
+                                   get_calendar_client)
+from users.factories import UserFactory
+from utils.validators import CustomValidationError
+
+
+class TestCalendarClientCache(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.social_user = UserSocialAuth.objects.create(
+            user=self.user,
+            provider=GOOGLE_PROVIDER,
+            uid=self.user.email,
+            extra_data={"access_token": "access-1", "refresh_token": "refresh-1"},
+        )
+        evict_calendar_client(self.user.pk)
+
+    def test_client_is_reused(self):
+        client = get_calendar_client(self.user)
+        self.assertIs(get_calendar_client(self.user), client)
+
+    def test_client_rebuilt_on_credential_change(self):
+        client = get_calendar_client(self.user)
+        self.social_user.extra_data["access_token"] = "access-2"
+        self.social_user.save()
+        self.assertIsNot(get_calendar_client(self.user), client)
+
+    def test_missing_credential_fail(self):
+        self.social_user.delete()
+        with self.assertRaises(CustomValidationError):
+            get_calendar_client(self.user)
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from eventcalendar.async_client import AsyncCalendarError
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.models import GoogleCredentialStatus
+from eventcalendar.tasks import refresh_expiring_google_credentials
+from users.factories import UserFactory
+
+
+def create_social_user(user, expires=3600, **extra_data):
+    return UserSocialAuth.objects.create(
+        user=user,
+        provider=GOOGLE_PROVIDER,
+        uid=user.email,
+        extra_data={
+            "access_token": "access",
+            "refresh_token": "refresh",
+            "auth_time": int(timezone.now().timestamp()),
+            "expires": expires,
+            **extra_data,
+        },
+    )
+
+
+async def refresh_ok(self, credentials):
+    credentials.access_token = f"new-{credentials.refresh_token}"
+    credentials.expires_in = 3599
+    credentials.refreshed = True
+
+
+async def refresh_revoked(self, credentials):
+    raise AsyncCalendarError(400, '{"error": "invalid_grant"}')
+
+
+class TestGoogleCredentialStatus(TestCase):
+    def test_status_follows_social_auth(self):
+        user = UserFactory()
+        social_user = create_social_user(user, expires=3600)
+
+        credential_status = GoogleCredentialStatus.objects.get(user=user)
+        self.assertEqual(credential_status.social_auth, social_user)
+        self.assertTrue(credential_status.is_valid)
+        self.assertAlmostEqual(
+            credential_status.expires_at,
+            timezone.now() + timedelta(seconds=3600),
+            delta=timedelta(seconds=5),
+        )
+
+    @patch("eventcalendar.async_client.AsyncCalendarClient.refresh", refresh_ok)
+    def test_refreshes_only_expiring_credentials(self):
+        expiring = create_social_user(UserFactory(), expires=60)
+        fresh = create_social_user(UserFactory(), expires=3600)
+
+        summary = refresh_expiring_google_credentials()
+
+        self.assertEqual(summary, {"refreshed": 1, "invalid": 0, "failed": 0})
+        expiring.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(expiring.extra_data["access_token"], "new-refresh")
+        self.assertEqual(expiring.extra_data["expires"], 3599)
+        self.assertEqual(fresh.extra_data["access_token"], "access")
+        self.assertGreater(
+            GoogleCredentialStatus.objects.get(social_auth=expiring).expires_at,
+            timezone.now() + timedelta(minutes=30),
+        )
+
+    @patch("eventcalendar.async_client.AsyncCalendarClient.refresh", refresh_ok)
+    def test_refreshes_in_batches(self):
+        for _ in range(5):
+            create_social_user(UserFactory(), expires=0)
+
+        with self.settings(GOOGLE_TOKEN_REFRESH_BATCH_SIZE=2):
+            summary = refresh_expiring_google_credentials()
+
+        self.assertEqual(summary["refreshed"], 5)
+        self.assertFalse(
+            GoogleCredentialStatus.objects.filter(
+                expires_at__lte=timezone.now()
+            ).exists()
+        )
+
+    @patch("eventcalendar.async_client.AsyncCalendarClient.refresh", refresh_revoked)
+    def test_revoked_credentials_are_invalid(self):
+        social_user = create_social_user(UserFactory(), expires=0)
+
+        summary = refresh_expiring_google_credentials()
+
+        self.assertEqual(summary, {"refreshed": 0, "invalid": 1, "failed": 0})
+        self.assertFalse(
+            GoogleCredentialStatus.objects.get(social_auth=social_user).is_valid
+        )
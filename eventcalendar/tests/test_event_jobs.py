@@ -0,0 +1,147 @@
+import socket
+from contextlib import contextmanager
+from unittest import mock
+
+import httplib2
+from django.test import TestCase
+from googleapiclient.errors import HttpError
+
+from eventcalendar.models import CalendarEvent, EventCreationJob
+from eventcalendar.tasks import create_instructor_event
+from users.factories import InstructorFactory
+from utils.api.error_objects import ErrorObject
+
+PAYLOAD = {
+    "summary": "meeting",
+    "start": "2030-10-05T10:00:00+03:30",
+    "end": "2030-10-05T11:00:00+03:30",
+    "time_zone": "Asia/Tehran",
+    "attendees_emails": ["student@didar.com"],
+}
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+class FakeEventsService:
+    def __init__(self, insert_results):
+        self.insert_results = list(insert_results)
+        self.inserted = []
+        self.stored = {}
+        self._result = None
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body, conferenceDataVersion):
+        self.inserted.append(body)
+        result = self.insert_results.pop(0)
+        if result is None:
+            result = {**body, "hangoutLink": "https://meet.google.com/abc"}
+            self.stored[body["id"]] = result
+        self._result = result
+        return self
+
+    def get(self, calendarId, eventId):
+        self._result = self.stored.get(eventId, http_error(404))
+        return self
+
+    def execute(self):
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+class TestCreateInstructorEvent(TestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+        self.job = EventCreationJob.objects.create(
+            instructor=self.instructor, idempotency_key="key", payload=PAYLOAD
+        )
+
+    def run_job(self, service):
+        @contextmanager
+        def fake_calendar_service(user, social_user=None):
+            yield service
+
+        with mock.patch("users.models.calendar_service", fake_calendar_service):
+            with mock.patch("eventcalendar.tasks.EVENT_CREATION_RETRY_DELAY", 0):
+                create_instructor_event.apply(args=[str(self.job.id)])
+        self.job.refresh_from_db()
+
+    def test_creates_event_with_job_ids(self):
+        service = FakeEventsService([None])
+        self.run_job(service)
+
+        body = service.inserted[0]
+        self.assertEqual(body["id"], self.job.google_event_id)
+        self.assertEqual(
+            body["conferenceData"]["createRequest"]["requestId"],
+            self.job.google_event_id,
+        )
+        self.assertEqual(self.job.status, EventCreationJob.SUCCEEDED)
+        self.assertEqual(self.job.event["hangoutLink"], "https://meet.google.com/abc")
+        self.assertTrue(
+            CalendarEvent.objects.filter(
+                instructor=self.instructor, google_id=self.job.google_event_id
+            ).exists()
+        )
+
+    def test_finished_job_is_not_created_again(self):
+        self.job.status = EventCreationJob.SUCCEEDED
+        self.job.save()
+        service = FakeEventsService([])
+        self.run_job(service)
+        self.assertEqual(service.inserted, [])
+
+    def test_retries_unavailable_google(self):
+        service = FakeEventsService([http_error(503), None])
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 2)
+        self.assertEqual(self.job.status, EventCreationJob.SUCCEEDED)
+
+    def test_duplicate_insert_returns_existing_event(self):
+        service = FakeEventsService([None, http_error(409)])
+        self.run_job(service)
+        self.job.status = EventCreationJob.PENDING
+        self.job.save()
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 2)
+        self.assertEqual(self.job.status, EventCreationJob.SUCCEEDED)
+        self.assertEqual(self.job.event["id"], self.job.google_event_id)
+
+    def test_bad_request_fails_job(self):
+        service = FakeEventsService([http_error(400)])
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 1)
+        self.assertEqual(self.job.status, EventCreationJob.FAILED)
+        self.assertEqual(self.job.error["code"], ErrorObject.BAD_REQUEST["code"])
+
+    def test_retries_timeouts(self):
+        service = FakeEventsService([socket.timeout("timed out"), None])
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 2)
+        self.assertEqual(self.job.status, EventCreationJob.SUCCEEDED)
+
+    def test_lasting_timeouts_fail_job(self):
+        service = FakeEventsService([socket.timeout("timed out")] * 4)
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 4)
+        self.assertEqual(self.job.status, EventCreationJob.FAILED)
+        self.assertEqual(
+            self.job.error["code"], ErrorObject.SERVICE_UNAVAILABLE["code"]
+        )
+
+    def test_unexpected_error_fails_job(self):
+        service = FakeEventsService([KeyError("id")])
+        self.run_job(service)
+        self.assertEqual(len(service.inserted), 1)
+        self.assertEqual(self.job.status, EventCreationJob.FAILED)
+        self.assertEqual(self.job.error["code"], ErrorObject.SERVER_ERROR["code"])
+
+    def test_failed_get_after_duplicate_insert_fails_job(self):
+        service = FakeEventsService([http_error(409)])
+        self.run_job(service)
+        self.assertEqual(self.job.status, EventCreationJob.FAILED)
+        self.assertEqual(self.job.error["code"], ErrorObject.BAD_REQUEST["code"])
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from eventcalendar.async_client import get_instructors_busy
+from eventcalendar.benchmark import BenchmarkResult, create_benchmark_instructors
+from eventcalendar.clients import evict_calendar_client
+from eventcalendar.fake_google import FakeGoogleConfig, FakeGoogleServer
+from eventcalendar.models import CalendarEvent
+from eventcalendar.sync import sync_instructor_events
+
+
+class TestFakeGoogleServer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeGoogleServer(
+            FakeGoogleConfig(page_size=5, events_per_calendar=12)
+        ).start()
+        cls.settings_override = override_settings(
+            GOOGLE_CALENDAR_API_URL=cls.server.api_url,
+            GOOGLE_TOKEN_URI=cls.server.token_uri,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.instructors = create_benchmark_instructors(2)
+        for instructor in self.instructors:
+            evict_calendar_client(instructor.user_id)
+
+    def test_sync_pages_through_events(self):
+        instructor = self.instructors[0]
+        calendar = self.server.state.calendar(instructor.user.username)
+        expected = list(calendar.between(timezone.now() - timedelta(days=7), None))
+
+        calendar_sync = sync_instructor_events(instructor)
+        self.assertEqual(
+            CalendarEvent.objects.filter(instructor=instructor).count(), len(expected)
+        )
+        self.assertIsNotNone(calendar_sync.sync_token)
+
+    def test_create_event_is_idempotent(self):
+        user = self.instructors[0].user
+        kwargs = {
+            "summary": "meeting",
+            "start": timezone.now() + timedelta(days=1),
+            "end": timezone.now() + timedelta(days=1, hours=1),
+            "attendees_emails": [],
+            "request_id": "abcdef0123",
+            "event_id": "abcdef0123",
+        }
+        created_event = user.create_google_calendar_event(**kwargs)
+        self.assertIn("hangoutLink", created_event)
+        self.assertEqual(user.create_google_calendar_event(**kwargs), created_event)
+
+    def test_free_busy_for_many_instructors(self):
+        now = timezone.now()
+        busy = get_instructors_busy(
+            self.instructors, now - timedelta(days=7), now + timedelta(days=7)
+        )
+        self.assertEqual(set(busy), {instructor.id for instructor in self.instructors})
+        self.assertTrue(all(intervals for intervals in busy.values()))
+
+
+class TestBenchmarkResult(TestCase):
+    def test_percentiles(self):
+        result = BenchmarkResult(
+            scenario="events_warm",
+            instructors=10,
+            count=100,
+            seconds=2,
+            latencies=[index / 100 for index in range(1, 101)],
+        )
+        self.assertEqual(result.percentile(50), 0.5)
+        self.assertEqual(result.percentile(99), 0.99)
+        self.assertEqual(result.as_dict()["throughput"], 50)
@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from unittest import mock
+
+import httplib2
+from django.test import TestCase
+from googleapiclient.errors import HttpError
+
+from eventcalendar.models import CalendarEvent, CalendarSync
+from eventcalendar.sync import sync_instructor_events
+from users.factories import InstructorFactory
+
+
+class FakeCalendarService:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        return self
+
+    def execute(self):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def google_event(event_id, summary="meeting", status="confirmed"):
+    return {
+        "id": event_id,
+        "status": status,
+        "summary": summary,
+        "start": {"dateTime": "2024-10-05T10:00:00+03:30", "timeZone": "Asia/Tehran"},
+        "end": {"dateTime": "2024-10-05T11:00:00+03:30", "timeZone": "Asia/Tehran"},
+    }
+
+
+class TestSyncInstructorEvents(TestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+
+    def sync(self, responses):
+        service = FakeCalendarService(responses)
+
+        @contextmanager
+        def fake_calendar_service(user):
+            yield service
+
+        with mock.patch("eventcalendar.sync.calendar_service", fake_calendar_service):
+            sync_instructor_events(self.instructor)
+        return service
+
+    def test_full_sync_stores_events_and_token(self):
+        self.sync(
+            [
+                {"items": [google_event("a")], "nextPageToken": "page-2"},
+                {"items": [google_event("b")], "nextSyncToken": "token-1"},
+            ]
+        )
+        self.assertEqual(CalendarEvent.objects.count(), 2)
+        calendar_sync = CalendarSync.objects.get(instructor=self.instructor)
+        self.assertEqual(calendar_sync.sync_token, "token-1")
+        self.assertIsNotNone(calendar_sync.synced_at)
+
+    def test_incremental_sync_applies_changes(self):
+        self.sync(
+            [{"items": [google_event("a"), google_event("b")], "nextSyncToken": "t1"}]
+        )
+        service = self.sync(
+            [
+                {
+                    "items": [
+                        google_event("a", summary="renamed"),
+                        google_event("b", status="cancelled"),
+                    ],
+                    "nextSyncToken": "t2",
+                }
+            ]
+        )
+        self.assertEqual(service.calls[0]["syncToken"], "t1")
+        self.assertEqual(
+            list(CalendarEvent.objects.values_list("google_id", "summary")),
+            [("a", "renamed")],
+        )
+
+    def test_expired_sync_token_does_full_sync(self):
+        self.sync([{"items": [google_event("a")], "nextSyncToken": "t1"}])
+        gone = HttpError(httplib2.Response({"status": 410}), b"gone")
+        service = self.sync(
+            [gone, {"items": [google_event("b")], "nextSyncToken": "t2"}]
+        )
+        self.assertNotIn("syncToken", service.calls[1])
+        self.assertEqual(
+            list(CalendarEvent.objects.values_list("google_id", flat=True)), ["b"]
+        )
+        calendar_sync = CalendarSync.objects.get(instructor=self.instructor)
+        self.assertEqual(calendar_sync.sync_token, "t2")
@@ -1,2 +1,198 @@
+import socket
+from datetime import timedelta
+from unittest import mock
+
 from django.urls import resolve, reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
+
+from eventcalendar.api.v1.views import (STALE_WARNING,
+                                        InstructorEventsListAPIView)
+from eventcalendar.models import CalendarEvent, CalendarSync, EventCreationJob
+from eventcalendar.tasks import calendar_sync_lock
+from users.factories import InstructorFactory, UserFactory
+from utils.api.error_objects import ErrorObject
+
+
+class TestInstructorEventsListAPIView(APITestCase):
+    def setUp(self):
+        self.url = reverse("eventcalendar:v1:instructor_events_list")
+        self.user = UserFactory()
+        self.instructor = InstructorFactory(user=self.user)
+        self.calendar_sync = CalendarSync.objects.create(
+            instructor=self.instructor, sync_token="token", synced_at=timezone.now()
+        )
+        now = timezone.now()
+        self.event = CalendarEvent.objects.create(
+            instructor=self.instructor,
+            google_id="upcoming",
+            summary="upcoming",
+            start=now + timedelta(minutes=10),
+            end=now + timedelta(minutes=70),
+            start_time_zone="Asia/Tehran",
+            end_time_zone="Asia/Tehran",
+        )
+        CalendarEvent.objects.create(
+            instructor=self.instructor,
+            google_id="past",
+            summary="past",
+            start=now - timedelta(hours=3),
+            end=now - timedelta(hours=2),
+            start_time_zone="Asia/Tehran",
+            end_time_zone="Asia/Tehran",
+        )
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_get_events_from_local_store_success(self, request_calendar_sync):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        json_response = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response.get("success"), True)
+        self.assertEqual(
+            [event["summary"] for event in json_response.get("data")], ["upcoming"]
+        )
+        self.assertIn("date_time", json_response.get("data")[0].get("start"))
+        request_calendar_sync.assert_not_called()
+
+    @mock.patch("eventcalendar.api.v1.views.request_calendar_sync")
+    def test_get_stale_events_requests_sync(self, request_calendar_sync):
+        self.calendar_sync.synced_at = timezone.now() - timedelta(days=1)
+        self.calendar_sync.save()
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        request_calendar_sync.assert_called_once_with(self.instructor.id)
+
+    @mock.patch("eventcalendar.api.v1.views.sync_instructor_events")
+    def test_first_sync_in_progress_answers_stale(self, sync_instructor_events):
+        self.calendar_sync.delete()
+        self.client.force_login(self.user)
+
+        with calendar_sync_lock(self.instructor.id):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Warning"], STALE_WARNING)
+        sync_instructor_events.assert_not_called()
+
+    @mock.patch(
+        "eventcalendar.api.v1.views.sync_instructor_events",
+        side_effect=socket.timeout,
+    )
+    def test_first_sync_timeout_fail(self, sync_instructor_events):
+        self.calendar_sync.delete()
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["error"]["code"],
+            ErrorObject.SERVICE_UNAVAILABLE["code"],
+        )
+        # The lock is given back
+        with calendar_sync_lock(self.instructor.id) as locked:
+            self.assertTrue(locked)
+
+    def test_get_events_not_instructor_fail(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_resolve_url(self):
+        resolver = resolve("/api/v1/instructor/events/")
+        self.assertEqual(resolver.view_name, "eventcalendar:v1:instructor_events_list")
+        self.assertEqual(resolver.func.view_class, InstructorEventsListAPIView)
+        self.assertEqual(resolver.namespace, "eventcalendar:v1")
+        self.assertEqual(resolver.url_name, "instructor_events_list")
+
+
+class TestInstructorEventCreation(APITestCase):
+    def setUp(self):
+        self.url = reverse("eventcalendar:v1:instructor_events_list")
+        self.user = UserFactory()
+        self.instructor = InstructorFactory(user=self.user)
+        start = timezone.now() + timedelta(days=1)
+        self.data = {
+            "summary": "meeting",
+            "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Tehran"},
+            "end": {
+                "dateTime": (start + timedelta(hours=1)).isoformat(),
+                "timeZone": "Asia/Tehran",
+            },
+            "attendees_emails": ["student@didar.com"],
+        }
+
+    @mock.patch("eventcalendar.api.v1.views.create_instructor_event")
+    def test_create_event_queues_job(self, create_instructor_event):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, self.data, format="json")
+        json_response = response.json()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(json_response["data"]["status"], EventCreationJob.PENDING)
+        self.assertIsNone(json_response["data"]["event"])
+        create_instructor_event.delay.assert_called_once_with(
+            json_response["data"]["id"]
+        )
+
+    @mock.patch("eventcalendar.api.v1.views.create_instructor_event")
+    def test_retried_request_returns_same_job(self, create_instructor_event):
+        self.client.force_login(self.user)
+        first = self.client.post(
+            self.url, self.data, format="json", HTTP_IDEMPOTENCY_KEY="key"
+        )
+        second = self.client.post(
+            self.url, self.data, format="json", HTTP_IDEMPOTENCY_KEY="key"
+        )
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(first.json()["data"]["id"], second.json()["data"]["id"])
+        self.assertEqual(EventCreationJob.objects.count(), 1)
+        create_instructor_event.delay.assert_called_once()
+
+    @mock.patch("eventcalendar.api.v1.views.create_instructor_event")
+    def test_reused_key_with_other_payload_fail(self, create_instructor_event):
+        self.client.force_login(self.user)
+        self.client.post(self.url, self.data, format="json", HTTP_IDEMPOTENCY_KEY="key")
+        self.data["summary"] = "another meeting"
+        response = self.client.post(
+            self.url, self.data, format="json", HTTP_IDEMPOTENCY_KEY="key"
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            response.json()["error"]["code"],
+            ErrorObject.IDEMPOTENCY_KEY_REUSED["code"],
+        )
+
+    def test_get_job(self):
+        job = EventCreationJob.objects.create(
+            instructor=self.instructor,
+            idempotency_key="key",
+            payload={},
+            status=EventCreationJob.SUCCEEDED,
+            event={
+                "summary": "meeting",
+                "start": {"dateTime": "2030-10-05T10:00:00+03:30", "timeZone": "UTC"},
+                "end": {"dateTime": "2030-10-05T11:00:00+03:30", "timeZone": "UTC"},
+                "hangoutLink": "https://meet.google.com/abc",
+            },
+        )
+        url = reverse("eventcalendar:v1:instructor_event_job", args=[job.id])
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        json_response = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["data"]["status"], EventCreationJob.SUCCEEDED)
+        self.assertEqual(
+            json_response["data"]["event"]["hangout_link"],
+            "https://meet.google.com/abc",
+        )
+
+    def test_get_job_of_another_instructor_fail(self):
+        job = EventCreationJob.objects.create(
+            instructor=InstructorFactory(), idempotency_key="key", payload={}
+        )
+        url = reverse("eventcalendar:v1:instructor_event_job", args=[job.id])
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
@@ -8,6 +8,7 @@ from faculty.api.v1.views import (
     FacultyListAPIView,
     InstructorListAPIView,
     InstructorByIDAPIView,
+    InstructorExportAPIView,
 )
 
 app_name = "v1"
@@ -39,6 +40,11 @@ urlpatterns = [
         InstructorListAPIView.as_view(),
         name="instructors",
     ),
+    path(
+        "instructors/export.<str:file_format>",
+        InstructorExportAPIView.as_view(),
+        name="instructors_export",
+    ),
     path(
         "instructors/<int:instructor_id>/",
         InstructorByIDAPIView.as_view(),
@@ -1,5 +1,10 @@
 from django.conf import settings
-from drf_spectacular.utils import extend_schema
+from django.http import StreamingHttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
@@ -10,18 +15,28 @@ from faculty.api.v1.serializers import (DepartmentDetailsSerializer,
                                         DepartmentSerializer,
                                         FacultyDetailsSerializer,
                                         FacultySerializer)
+from faculty.catalog import catalog_cache
 from faculty.models import Department, Faculty
 from users.api.v1.serializers import InstructorListSerializer, InstructorSerializer
-from users.models import Instructor
+from users.export import EXPORT_FORMATS, iter_instructor_chunks
+from users.models import Instructor, User
+from users.search import InstructorSearchFilter
+from utils.api.custom_pagination import CustomLimitOffsetOrCursorPagination
 from utils.api.error_objects import ErrorObject
-from utils.api.mixins import BadRequestSerializerMixin
-from utils.api.responses import error_response, success_response
+from utils.api.mixins import BadRequestSerializerMixin, QueryPlanMixin
+from utils.api.response_cache import ResponseCache, model_tag
+from utils.api.responses import (conditional_response, error_response,
+                                 success_response)
 from utils.permissions import IsAuthenticatedAndActive
 
+department_instructors_cache = ResponseCache("department_instructors")
+instructor_cache = ResponseCache("instructor_by_id")
+
 
 class FacultyListAPIView(BadRequestSerializerMixin, ListAPIView):
     permission_classes = [AllowAny]
     serializer_class = FacultySerializer
+    # Only for the schema, the list is served from the catalog
     queryset = Faculty.objects.all()
 
     @extend_schema(
@@ -36,7 +51,14 @@ class FacultyListAPIView(BadRequestSerializerMixin, ListAPIView):
         """
         get list of the faculties
         """
-        return super().get(request, *args, **kwargs)
+        catalog = catalog_cache.get()
+        return conditional_response(
+            request,
+            catalog.etag,
+            lambda: self.get_paginated_response(
+                self.paginate_queryset(catalog.faculties)
+            ),
+        )
 
 
 class FacultyByIdAPIView(BadRequestSerializerMixin, APIView):
@@ -53,30 +75,24 @@ class FacultyByIdAPIView(BadRequestSerializerMixin, APIView):
         """
         get a faculty details
         """
-        faculty_id = kwargs.get("faculty_id")
-        try:
-            faculty_obj = Faculty.objects.get(id=faculty_id)
-        except Faculty.DoesNotExist:
+        catalog = catalog_cache.get()
+        faculty = catalog.faculty_by_id.get(kwargs.get("faculty_id"))
+        if faculty is None:
             return error_response(
                 error=ErrorObject.FACULTY_NOT_EXISTS,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        response = FacultyDetailsSerializer(faculty_obj)
-        return success_response(data=response.data, status_code=status.HTTP_200_OK)
+        return conditional_response(
+            request,
+            catalog.etag,
+            lambda: success_response(data=faculty, status_code=status.HTTP_200_OK),
+        )
 
 
 class FacultyDepartmentListAPIView(BadRequestSerializerMixin, ListAPIView):
     permission_classes = [AllowAny]
     serializer_class = DepartmentSerializer
 
-    def get_queryset(self):
-        faculty_id = self.kwargs.get("faculty_id")
-        try:
-            faculty_obj = Faculty.objects.get(id=faculty_id)
-        except Faculty.DoesNotExist:
-            raise Faculty.DoesNotExist
-        return Department.objects.filter(faculty=faculty_obj)
-
     @extend_schema(
         request=None,
         parameters=[],
@@ -89,13 +105,18 @@ class FacultyDepartmentListAPIView(BadRequestSerializerMixin, ListAPIView):
         """
         get list of the departments of a faculty
         """
-        try:
-            return super().get(request, *args, **kwargs)
-        except Faculty.DoesNotExist:
+        catalog = catalog_cache.get()
+        departments = catalog.faculty_departments.get(kwargs.get("faculty_id"))
+        if departments is None:
             return error_response(
                 error=ErrorObject.FACULTY_NOT_EXISTS,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+        return conditional_response(
+            request,
+            catalog.etag,
+            lambda: self.get_paginated_response(self.paginate_queryset(departments)),
+        )
 
 
 class DepartmentByIdAPIView(BadRequestSerializerMixin, APIView):
@@ -112,19 +133,23 @@ class DepartmentByIdAPIView(BadRequestSerializerMixin, APIView):
         """
         get a department details
         """
-        department_id = kwargs.get("department_id")
-        try:
-            department_obj = Department.objects.get(id=department_id)
-        except Department.DoesNotExist:
+        catalog = catalog_cache.get()
+        department = catalog.department_by_id.get(kwargs.get("department_id"))
+        if department is None:
             return error_response(
                 error=ErrorObject.DEPARTMENT_NOT_EXISTS,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        response = DepartmentDetailsSerializer(department_obj)
-        return success_response(data=response.data, status_code=status.HTTP_200_OK)
+        return conditional_response(
+            request,
+            catalog.etag,
+            lambda: success_response(data=department, status_code=status.HTTP_200_OK),
+        )
 
 
-class DepartmentInstructorListAPIView(BadRequestSerializerMixin, ListAPIView):
+class DepartmentInstructorListAPIView(
+    BadRequestSerializerMixin, QueryPlanMixin, ListAPIView
+):
     permission_classes = [AllowAny]
     serializer_class = InstructorListSerializer
 
@@ -148,19 +173,35 @@ class DepartmentInstructorListAPIView(BadRequestSerializerMixin, ListAPIView):
         """
         get list of the instructors of a department
         """
+        return department_instructors_cache.get_response(
+            request, lambda: self.build_response(request, *args, **kwargs)
+        )
+
+    def build_response(self, request, *args, **kwargs):
         try:
-            return super().get(request, *args, **kwargs)
+            response = super().get(request, *args, **kwargs)
         except Department.DoesNotExist:
-            return error_response(
+            response = error_response(
                 error=ErrorObject.DEPARTMENT_NOT_EXISTS,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+            return response, []
+        tags = [model_tag(Department, kwargs.get("department_id"))]
+        for instructor in self.page:
+            tags.append(model_tag(Instructor, instructor.id))
+            tags.append(model_tag(User, instructor.user_id))
+        return response, tags
+
+    def paginate_queryset(self, queryset):
+        self.page = super().paginate_queryset(queryset)
+        return self.page
 
 
-class InstructorListAPIView(BadRequestSerializerMixin, ListAPIView):
+class InstructorListAPIView(BadRequestSerializerMixin, QueryPlanMixin, ListAPIView):
     permission_classes = [IsAuthenticatedAndActive]
+    pagination_class = CustomLimitOffsetOrCursorPagination
     serializer_class = InstructorListSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, InstructorSearchFilter]
     filterset_fields = [
         "department",
         "department__faculty",
@@ -179,7 +220,8 @@ class InstructorListAPIView(BadRequestSerializerMixin, ListAPIView):
     )
     def get(self, request, *args, **kwargs):
         """
-        get list of the instructors
+        get list of the instructors, `q` searches them by name, department and
+        rank and orders them by relevance
         """
         return super().get(request, *args, **kwargs)
 
@@ -199,12 +241,84 @@ class InstructorByIDAPIView(BadRequestSerializerMixin, APIView):
         """
         get instructor details by id
         """
+        return instructor_cache.get_response(
+            request, lambda: self.build_response(kwargs.get("instructor_id"))
+        )
+
+    def build_response(self, instructor_id):
         try:
-            instructor_obj = Instructor.objects.get(id=kwargs.get("instructor_id"))
+            instructor_obj = Instructor.objects.select_related(
+                "department__faculty"
+            ).get(id=instructor_id)
         except Instructor.DoesNotExist:
-            return error_response(
+            response = error_response(
                 error=ErrorObject.NOT_FOUND,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+            return response, []
         response = InstructorSerializer(instructor_obj)
-        return success_response(data=response.data, status_code=status.HTTP_200_OK)
+        tags = [
+            model_tag(Instructor, instructor_obj.id),
+            model_tag(Department, instructor_obj.department_id),
+            model_tag(Faculty, instructor_obj.department.faculty_id),
+        ]
+        return (
+            success_response(data=response.data, status_code=status.HTTP_200_OK),
+            tags,
+        )
+
+
+class InstructorExportAPIView(BadRequestSerializerMixin, APIView):
+    permission_classes = [IsAuthenticatedAndActive]
+
+    @extend_schema(
+        request=None,
+        parameters=[
+            OpenApiParameter(
+                "since",
+                int,
+                description="Only the instructors with a greater id, the last "
+                "one received to resume an export",
+            )
+        ],
+        responses={200: OpenApiTypes.BINARY},
+        auth=None,
+        operation_id="InstructorsExport",
+        tags=["Faculty"],
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        stream every instructor with its department, faculty and weekly
+        schedules as `ndjson`, a document per instructor, or `csv`, a row per
+        schedule, ordered by id and gzip compressed when accepted
+        """
+        file_format = kwargs.get("file_format")
+        if file_format not in EXPORT_FORMATS:
+            return error_response(
+                error=ErrorObject.NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return error_response(
+                    error=ErrorObject.BAD_REQUEST,
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+
+        write, content_type = EXPORT_FORMATS[file_format]
+        content = (
+            chunk.encode() for chunk in write(iter_instructor_chunks(since=since))
+        )
+        response = StreamingHttpResponse(content_type=content_type)
+        if re_accepts_gzip.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            content = compress_sequence(content)
+            response["Content-Encoding"] = "gzip"
+        response.streaming_content = content
+        patch_vary_headers(response, ("Accept-Encoding",))
+        response["Content-Disposition"] = (
+            f'attachment; filename="instructors.{file_format}"'
+        )
+        return response
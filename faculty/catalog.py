@@ -0,0 +1,88 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+from faculty.api.v1.serializers import DepartmentSerializer, FacultySerializer
+from faculty.models import Department, Faculty
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+class Catalog:
+    """
+    A snapshot of the whole faculty -> department tree, serialized once.
+    """
+
+    def __init__(self, version, faculties, departments):
+        self.version = version
+        self.faculties = faculties
+        self.faculty_by_id = {faculty["id"]: faculty for faculty in faculties}
+        self.department_by_id = {}
+        self.faculty_departments = {faculty["id"]: [] for faculty in faculties}
+        for department in departments:
+            self.department_by_id[department["id"]] = department
+            self.faculty_departments[department["faculty"]["id"]].append(department)
+
+        content = json.dumps([faculties, departments], sort_keys=True)
+        # A response is a function of the catalog and its url, so the digest
+        # of the catalog is a strong validator of every catalog response
+        self.etag = quote_etag(hashlib.sha1(content.encode()).hexdigest())
+
+    @classmethod
+    def load(cls, version):
+        faculties = FacultySerializer(Faculty.objects.order_by("id"), many=True).data
+        departments = DepartmentSerializer(
+            Department.objects.select_related("faculty").order_by("id"), many=True
+        ).data
+        # Plain dicts, the serializers return ordered ones
+        return cls(version, *json.loads(json.dumps([faculties, departments])))
+
+
+class CatalogCache:
+    """
+    The catalog held in the memory of every worker. Writers bump a version
+    counter in redis and the workers reload when they see it change. The
+    version is read at most every CATALOG_VERSION_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.catalog = None
+        self.checked_at = 0
+
+    def get(self):
+        now = time.monotonic()
+        catalog = self.catalog
+        if (
+            catalog is not None
+            and now - self.checked_at < settings.CATALOG_VERSION_CHECK_INTERVAL
+        ):
+            return catalog
+
+        with self.lock:
+            version = cache.get(CATALOG_VERSION_KEY)
+            if version is None:
+                # Seeded from the clock, a flushed redis must not bring back
+                # a version some worker still holds
+                cache.add(CATALOG_VERSION_KEY, int(time.time()), timeout=None)
+                version = cache.get(CATALOG_VERSION_KEY)
+            if self.catalog is None or self.catalog.version != version:
+                self.catalog = Catalog.load(version)
+            self.checked_at = now
+            return self.catalog
+
+    def bump_version(self):
+        try:
+            cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.add(CATALOG_VERSION_KEY, int(time.time()), timeout=None)
+        # This worker does not wait for its next version check
+        self.catalog = None
+
+
+catalog_cache = CatalogCache()
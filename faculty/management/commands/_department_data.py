@@ -1,31 +1,33 @@
-import json
-
-from django.db import transaction
+from functools import cached_property
 
 from faculty.models import Department, Faculty
+from users.models import Instructor
+from users.profile import invalidate_profiles
+from users.search import search_index
 
+from ._reference_data import ReferenceDataImporter
 
-class DataImporter:
-    @classmethod
-    @transaction.atomic
-    def importer(cls):
-        data = cls._read_data()
-        cls._create_department(data)
-
-    @classmethod
-    def _read_data(cls):
-        with open("faculty/fixtures/department_data.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
-
-    @classmethod
-    def _create_department(cls, data) -> None:
-        for instance in data:
-            faculty_object = Faculty.objects.get(
-                id=instance.get("fields").get("faculty")
-            )
-            Department.objects.get_or_create(
-                pk=instance.get("pk"),
-                name=instance.get("fields").get("name"),
-                faculty=faculty_object,
+
+class DataImporter(ReferenceDataImporter):
+    model = Department
+    fixture_path = "faculty/fixtures/department_data.json"
+
+    @cached_property
+    def faculties(self):
+        # Only read when a row is written, the faculties of unchanged rows
+        # exist already
+        return Faculty.objects.in_bulk()
+
+    def get_values(self, fields):
+        return {"name": fields["name"], "faculty_id": int(fields["faculty"])}
+
+    def validate(self, pk, values):
+        if values["faculty_id"] not in self.faculties:
+            raise ValueError(
+                f"Faculty {values['faculty_id']} of department {pk} does not exist"
             )
+
+    def after_update(self, ids):
+        instructors = Instructor.objects.filter(department_id__in=ids)
+        invalidate_profiles(list(instructors.values_list("user_id", flat=True)))
+        search_index.update(department_id__in=ids)
@@ -1,27 +1,17 @@
-import json
-
-from django.db import transaction
-
 from faculty.models import Faculty
+from users.models import Instructor
+from users.profile import invalidate_profiles
+
+from ._reference_data import ReferenceDataImporter
 
 
-class DataImporter:
-    @classmethod
-    @transaction.atomic
-    def importer(cls):
-        data = cls._read_data()
-        cls._create_faculty(data)
+class DataImporter(ReferenceDataImporter):
+    model = Faculty
+    fixture_path = "faculty/fixtures/faculty_data.json"
 
-    @classmethod
-    def _read_data(cls):
-        with open("faculty/fixtures/faculty_data.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
+    def get_values(self, fields):
+        return {"name": fields["name"]}
 
-    @classmethod
-    def _create_faculty(cls, data) -> None:
-        for instance in data:
-            Faculty.objects.get_or_create(
-                pk=instance.get("pk"),
-                defaults=instance.get("fields"),
-            )
+    def after_update(self, ids):
+        instructors = Instructor.objects.filter(department__faculty_id__in=ids)
+        invalidate_profiles(list(instructors.values_list("user_id", flat=True)))
@@ -0,0 +1,151 @@
+import json
+from dataclasses import dataclass, field
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from faculty.catalog import catalog_cache
+from utils.api.response_cache import model_tag, purge_tags
+
+
+def iter_fixture(path, chunk_size=64 * 1024):
+    """
+    Yield the objects of a json array file one at a time, reading it in
+    chunks instead of as a whole.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} is not a json array")
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(",").lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                instance, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Most likely an object cut by the end of the chunk
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield instance
+            buffer = buffer[end:]
+
+
+@dataclass
+class ImportReport:
+    # (pk, name)
+    created: list = field(default_factory=list)
+    # (pk, {field: (old value, new value)})
+    updated: list = field(default_factory=list)
+    unchanged: int = 0
+
+    def lines(self):
+        for pk, name in self.created:
+            yield f"+ {pk} {name}"
+        for pk, changes in self.updated:
+            for name, (old, new) in changes.items():
+                yield f"~ {pk} {name}: {old} -> {new}"
+
+    def summary(self):
+        return (
+            f"{len(self.created)} created, {len(self.updated)} updated, "
+            f"{self.unchanged} unchanged"
+        )
+
+
+class ReferenceDataImporter:
+    """
+    Make the table of `model` match a fixture of it by pk. The existing rows
+    are read with one query and diffed against the fixture as it streams.
+    The changes are then written with a bulk_update and a bulk_create in one
+    transaction, so an unchanged fixture takes that one query only.
+    """
+
+    model = None
+    fixture_path = None
+    batch_size = 500
+
+    def __init__(self, path=None, dry_run=False):
+        self.path = path or self.fixture_path
+        self.dry_run = dry_run
+        self.report = ImportReport()
+
+    def get_values(self, fields):
+        """
+        The model field values of the `fields` of a fixture object.
+        """
+        raise NotImplementedError
+
+    def validate(self, pk, values):
+        """
+        Check the values of a row that is going to be written.
+        """
+
+    def after_update(self, ids):
+        """
+        Called once the updates of rows of these ids are committed. Bulk
+        writes send no signals.
+        """
+
+    def run(self):
+        existing = self.model.objects.in_bulk()
+        new_objects = []
+        updated_objects = []
+        for instance in iter_fixture(self.path):
+            pk = int(instance["pk"])
+            values = self.get_values(instance["fields"])
+            obj = existing.get(pk)
+            if obj is None:
+                self.validate(pk, values)
+                new_objects.append(self.model(pk=pk, **values))
+                self.report.created.append((pk, values["name"]))
+                continue
+
+            changes = {
+                name: (getattr(obj, name), value)
+                for name, value in values.items()
+                if getattr(obj, name) != value
+            }
+            if not changes:
+                self.report.unchanged += 1
+                continue
+            self.validate(pk, values)
+            for name, value in values.items():
+                setattr(obj, name, value)
+            updated_objects.append(obj)
+            self.report.updated.append((pk, changes))
+
+        if not self.dry_run and (new_objects or updated_objects):
+            self.save(new_objects, updated_objects)
+        return self.report
+
+    @transaction.atomic
+    def save(self, new_objects, updated_objects):
+        fields = [
+            model_field.name
+            for model_field in self.model._meta.concrete_fields
+            if not model_field.primary_key
+        ]
+        # Updates first, a renamed row may free the name of a new one
+        self.model.objects.bulk_update(
+            updated_objects, fields, batch_size=self.batch_size
+        )
+        self.model.objects.bulk_create(new_objects, batch_size=self.batch_size)
+        if new_objects:
+            # The pks come from the fixture, not from the sequence
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [self.model]):
+                    cursor.execute(sql)
+
+        updated_ids = [obj.pk for obj in updated_objects]
+        purge_tags(*[model_tag(self.model, pk) for pk in updated_ids])
+        catalog_cache.bump_version()
+        transaction.on_commit(catalog_cache.bump_version)
+        transaction.on_commit(lambda: self.after_update(updated_ids))
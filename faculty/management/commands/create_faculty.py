@@ -4,11 +4,29 @@ from ._faculty_data import DataImporter
 
 
 class Command(BaseCommand):
-    help = "Create faculties Data"
+    help = "Create or update faculties from their fixture"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", default=DataImporter.fixture_path, help="The fixture file"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the changes without writing them",
+        )
 
     def handle(self, *args, **options):
+        importer = DataImporter(path=options["path"], dry_run=options["dry_run"])
         try:
-            DataImporter.importer()
+            report = importer.run()
         except Exception as e:
             raise CommandError(e)
+
+        for line in report.lines():
+            self.stdout.write(line)
+        if options["dry_run"]:
+            self.stdout.write(f"Dry run, nothing written: {report.summary()}")
+            return
+        self.stdout.write(report.summary())
         self.stdout.write(self.style.SUCCESS("Successfully import Faculty Data!"))
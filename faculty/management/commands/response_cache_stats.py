@@ -0,0 +1,23 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.api.response_cache import ResponseCache
+
+
+class Command(BaseCommand):
+    help = "Show the hits and misses of the cached API responses"
+
+    def handle(self, *args, **options):
+        # The caches are created along with their views
+        import_module(settings.ROOT_URLCONF)
+
+        for name, response_cache in sorted(ResponseCache.registry.items()):
+            stats = response_cache.get_stats()
+            hit_ratio = stats["hit_ratio"]
+            hit_ratio = "-" if hit_ratio is None else f"{hit_ratio:.1%}"
+            self.stdout.write(
+                f"{name}: {stats['hits']} hits, {stats['misses']} misses, "
+                f"hit ratio {hit_ratio}"
+            )
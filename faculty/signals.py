@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from faculty.catalog import catalog_cache
+from faculty.models import Department, Faculty
+from utils.api.response_cache import model_tag, purge_tags
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def bump_catalog_version(sender, instance, **kwargs):
+    catalog_cache.bump_version()
+    # Again once committed, a worker may have reloaded the old rows meanwhile
+    transaction.on_commit(catalog_cache.bump_version)
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def purge_cached_responses(sender, instance, **kwargs):
+    purge_tags(model_tag(sender, instance.pk))
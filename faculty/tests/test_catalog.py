@@ -0,0 +1,92 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from faculty.catalog import CatalogCache
+from faculty.factories import DepartmentFactory, FacultyFactory
+
+
+class TestCatalogCache(TestCase):
+    def test_worker_reloads_on_version_change(self):
+        faculty = FacultyFactory(name="engineering")
+        worker = CatalogCache()
+        catalog = worker.get()
+        self.assertEqual(catalog.faculty_departments[faculty.id], [])
+
+        department = DepartmentFactory(name="computer", faculty=faculty)
+
+        # Served from memory until the next version check
+        self.assertIs(worker.get(), catalog)
+        worker.checked_at = 0
+        catalog = worker.get()
+        self.assertEqual(
+            catalog.faculty_departments[faculty.id],
+            [
+                {
+                    "id": department.id,
+                    "name": "computer",
+                    "faculty": {"id": faculty.id, "name": "engineering"},
+                }
+            ],
+        )
+
+    def test_etag_follows_content(self):
+        faculty = FacultyFactory(name="engineering")
+        worker = CatalogCache()
+        etag = worker.get().etag
+
+        worker.checked_at = 0
+        self.assertEqual(worker.get().etag, etag)
+
+        faculty.name = "science"
+        faculty.save()
+        worker.checked_at = 0
+        self.assertNotEqual(worker.get().etag, etag)
+
+
+class TestCatalogViews(APITestCase):
+    def setUp(self):
+        self.department = DepartmentFactory()
+        self.faculty = self.department.faculty
+
+    def test_served_from_memory(self):
+        urls = [
+            reverse("faculty:v1:faculty_list"),
+            reverse("faculty:v1:faculty_by_id", kwargs={"faculty_id": self.faculty.id}),
+            reverse(
+                "faculty:v1:department_list", kwargs={"faculty_id": self.faculty.id}
+            ),
+            reverse(
+                "faculty:v1:department_by_id",
+                kwargs={"department_id": self.department.id},
+            ),
+        ]
+        self.client.get(urls[0])
+
+        with self.assertNumQueries(0):
+            for url in urls:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        url = reverse(
+            "faculty:v1:department_list", kwargs={"faculty_id": self.faculty.id}
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.json()["data"]["count"], 1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_modified_after_change(self):
+        url = reverse("faculty:v1:faculty_list")
+        etag = self.client.get(url)["ETag"]
+
+        FacultyFactory(name="new-faculty")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["count"], 2)
@@ -0,0 +1,124 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from schedule.factories import ScheduleFactory
+from schedule.models import Schedule
+from users.factories import InstructorFactory, UserFactory
+
+
+class TestInstructorExportAPIView(APITestCase):
+    def setUp(self):
+        self.client.force_login(UserFactory())
+        self.instructors = InstructorFactory.create_batch(5)
+        self.first = self.instructors[0]
+        self.late = ScheduleFactory(
+            instructor=self.first,
+            day_of_week=Schedule.DAY_MONDAY,
+            start_time=datetime.time(14, 0),
+            end_time=datetime.time(16, 0),
+        )
+        self.early = ScheduleFactory(
+            instructor=self.first,
+            day_of_week=Schedule.DAY_SATURDAY,
+            start_time=datetime.time(8, 0),
+            end_time=datetime.time(10, 0),
+        )
+
+    def export(self, file_format, **kwargs):
+        url = reverse(
+            "faculty:v1:instructors_export", kwargs={"file_format": file_format}
+        )
+        response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson(self):
+        response, content = self.export("ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        documents = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(
+            [document["id"] for document in documents],
+            [instructor.id for instructor in self.instructors],
+        )
+        first = documents[0]
+        self.assertEqual(first["first_name"], self.first.user.first_name)
+        self.assertEqual(
+            first["department"],
+            {
+                "id": self.first.department_id,
+                "name": self.first.department.name,
+                "faculty": {
+                    "id": self.first.department.faculty_id,
+                    "name": self.first.department.faculty.name,
+                },
+            },
+        )
+        self.assertEqual(
+            [schedule["code"] for schedule in first["schedules"]],
+            [self.early.code, self.late.code],
+        )
+        self.assertEqual(first["schedules"][0]["start_time"], "08:00:00")
+        self.assertEqual(documents[1]["schedules"], [])
+
+    def test_csv_has_a_row_per_schedule(self):
+        response, content = self.export("csv")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(len(rows), len(self.instructors) + 1)
+        self.assertEqual(
+            [row["schedule_code"] for row in rows[:2]],
+            [self.early.code, self.late.code],
+        )
+        self.assertEqual(rows[2]["instructor_id"], str(self.instructors[1].id))
+        self.assertEqual(rows[2]["schedule_code"], "")
+
+    def test_gzip_when_accepted(self):
+        _, plain = self.export("ndjson")
+
+        response, content = self.export(
+            "ndjson", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(content), plain)
+
+    def test_since_resumes_after_an_id(self):
+        _, content = self.export("ndjson", data={"since": self.instructors[2].id})
+
+        self.assertEqual(
+            [json.loads(line)["id"] for line in content.decode().splitlines()],
+            [instructor.id for instructor in self.instructors[3:]],
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_queries_grow_by_chunk(self):
+        url = reverse("faculty:v1:instructors_export", kwargs={"file_format": "csv"})
+        response = self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            b"".join(response.streaming_content)
+
+        # The instructors, then the schedules of each of the 3 chunks
+        self.assertEqual(len(context.captured_queries), 4)
+
+    def test_invalid_requests(self):
+        url = reverse("faculty:v1:instructors_export", kwargs={"file_format": "csv"})
+        self.assertEqual(self.client.get(url, {"since": "x"}).status_code, 400)
+        url = reverse("faculty:v1:instructors_export", kwargs={"file_format": "xml"})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.logout()
+        url = reverse("faculty:v1:instructors_export", kwargs={"file_format": "csv"})
+        self.assertEqual(self.client.get(url).status_code, 401)
@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from faculty.management.commands._department_data import (
+    DataImporter as DepartmentImporter,
+)
+from faculty.management.commands._faculty_data import DataImporter as FacultyImporter
+from faculty.management.commands._reference_data import iter_fixture
+from faculty.models import Department, Faculty
+from users.factories import InstructorFactory
+from users.models import Instructor
+from users.search import search_index
+
+
+class TestReferenceDataImport(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_fixture(self, objects):
+        path = os.path.join(self.directory.name, "fixture.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(objects, f, ensure_ascii=False, indent=4)
+        return path
+
+    def import_fixtures(self):
+        call_command("create_faculty", stdout=io.StringIO())
+        call_command("create_department", stdout=io.StringIO())
+
+    def test_imports_the_fixtures(self):
+        self.import_fixtures()
+
+        self.assertEqual(Faculty.objects.count(), 6)
+        self.assertEqual(Department.objects.count(), 21)
+        self.assertEqual(Department.objects.get(pk=1).faculty_id, 1)
+
+    def test_unchanged_rerun_takes_one_query(self):
+        self.import_fixtures()
+
+        with self.assertNumQueries(1):
+            report = FacultyImporter().run()
+        self.assertEqual(report.summary(), "0 created, 0 updated, 6 unchanged")
+        with self.assertNumQueries(1):
+            report = DepartmentImporter().run()
+        self.assertEqual(report.summary(), "0 created, 0 updated, 21 unchanged")
+
+    def test_dry_run_reports_changes(self):
+        faculty = Faculty.objects.create(pk=1, name="science")
+        Department.objects.create(pk=1, name="physics", faculty=faculty)
+        path = self.write_fixture(
+            [
+                {"pk": "1", "fields": {"name": "chemistry", "faculty": 1}},
+                {"pk": "2", "fields": {"name": "biology", "faculty": "1"}},
+            ]
+        )
+        stdout = io.StringIO()
+
+        call_command("create_department", f"--path={path}", "--dry-run", stdout=stdout)
+
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            [
+                "+ 2 biology",
+                "~ 1 name: physics -> chemistry",
+                "Dry run, nothing written: 1 created, 1 updated, 0 unchanged",
+            ],
+        )
+        self.assertEqual(Department.objects.get(pk=1).name, "physics")
+        self.assertFalse(Department.objects.filter(pk=2).exists())
+
+    def test_updates_keep_dependents_in_sync(self):
+        instructor = InstructorFactory()
+        department = instructor.department
+        path = self.write_fixture(
+            [
+                {
+                    "pk": str(department.pk),
+                    "fields": {
+                        "name": "astronomy",
+                        "faculty": department.faculty_id,
+                    },
+                }
+            ]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DepartmentImporter(path=path).run()
+
+        department.refresh_from_db()
+        self.assertEqual(department.name, "astronomy")
+        self.assertEqual(
+            list(search_index.search(Instructor.objects.all(), "astro")),
+            [instructor],
+        )
+
+    def test_unknown_faculty(self):
+        path = self.write_fixture([{"pk": "1", "fields": {"name": "x", "faculty": 9}}])
+
+        with self.assertRaisesMessage(CommandError, "Faculty 9 of department 1"):
+            call_command("create_department", f"--path={path}", stdout=io.StringIO())
+
+        self.assertFalse(Department.objects.exists())
+
+    def test_iter_fixture_in_small_chunks(self):
+        path = "faculty/fixtures/department_data.json"
+        with open(path, encoding="utf-8") as f:
+            expected = json.load(f)
+
+        self.assertEqual(list(iter_fixture(path, chunk_size=7)), expected)
@@ -0,0 +1,154 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from faculty.api.v1.views import department_instructors_cache, instructor_cache
+from faculty.factories import DepartmentFactory
+from users.availability import update_instructors_availability
+from users.factories import InstructorFactory, UserFactory
+from users.models import Instructor
+
+
+class TestDepartmentInstructorsCache(APITestCase):
+    def setUp(self):
+        self.department = DepartmentFactory()
+        self.instructor = InstructorFactory(department=self.department)
+        self.url = reverse(
+            "faculty:v1:department_instructors",
+            kwargs={"department_id": self.department.id},
+        )
+
+    def get_names(self, data=None):
+        response = self.client.get(self.url, data)
+        return response, [
+            result["name"] for result in response.json()["data"]["results"]
+        ]
+
+    def test_second_request_is_a_hit(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.json(), response.json())
+
+    def test_query_strings_are_cached_apart(self):
+        InstructorFactory(department=self.department)
+        self.client.get(self.url, {"limit": 1, "offset": 0})
+
+        response = self.client.get(self.url, {"offset": 0, "limit": 2})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()["data"]["results"]), 2)
+        # The order of the parameters does not matter
+        response = self.client.get(self.url, {"offset": 0, "limit": 1})
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_purged_by_user_change(self):
+        self.get_names()
+        user = self.instructor.user
+        user.first_name = "Parvin"
+        user.save()
+
+        response, names = self.get_names()
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(names, [f"Parvin {user.last_name}"])
+
+    def test_purged_by_instructors_joining_and_leaving(self):
+        self.get_names()
+        newcomer = InstructorFactory(department=self.department)
+
+        response, names = self.get_names()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(names), 2)
+
+        newcomer.department = DepartmentFactory()
+        newcomer.save()
+        self.assertEqual(len(self.get_names()[1]), 1)
+
+    def test_not_found_is_not_cached(self):
+        url = reverse(
+            "faculty:v1:department_instructors", kwargs={"department_id": 999}
+        )
+        self.client.get(url)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_stats(self):
+        before = department_instructors_cache.get_stats()
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        stats = department_instructors_cache.get_stats()
+
+        self.assertEqual(stats["hits"] - before["hits"], 2)
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+        stdout = io.StringIO()
+        call_command("response_cache_stats", stdout=stdout)
+        self.assertIn(
+            f"department_instructors: {stats['hits']} hits", stdout.getvalue()
+        )
+
+
+class TestInstructorCache(APITestCase):
+    def setUp(self):
+        self.client.force_login(UserFactory())
+        self.instructor = InstructorFactory()
+        self.url = reverse(
+            "faculty:v1:instructor_details",
+            kwargs={"instructor_id": self.instructor.id},
+        )
+
+    def test_second_request_is_a_hit(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_purged_by_department_and_faculty_changes(self):
+        self.client.get(self.url)
+        department = self.instructor.department
+        department.name = "astronomy"
+        department.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.client.get(self.url)
+
+        faculty = department.faculty
+        faculty.name = "sciences"
+        faculty.save()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+
+    def test_purged_by_bulk_availability_update(self):
+        Instructor.objects.filter(pk=self.instructor.pk).update(
+            is_available_now=False
+        )
+        self.client.get(self.url)
+
+        with mock.patch(
+            "users.availability.get_instructors_busy",
+            return_value={self.instructor.id: []},
+        ):
+            update_instructors_availability([self.instructor.id])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertTrue(response.json()["data"]["is_available_now"])
+
+    def test_hits_counted_apart(self):
+        before = instructor_cache.get_stats()
+        self.client.get(self.url)
+
+        self.assertEqual(instructor_cache.get_stats()["misses"] - before["misses"], 1)
@@ -1,3 +1,6 @@
+import base64
+import json
+
 from django.urls import resolve, reverse
 from rest_framework.test import APITestCase
 
@@ -8,6 +11,7 @@ from faculty.api.v1.views import (DepartmentByIdAPIView,
                                   FacultyListAPIView)
 from faculty.factories import DepartmentFactory, FacultyFactory
 from users.factories import InstructorFactory, UserFactory
+from utils.testing import QueryCountTestMixin
 
 
 class TestFacultyListAPIView(APITestCase):
@@ -133,7 +137,7 @@ class TestDepartmentByIdAPIView(APITestCase):
         self.assertEqual(resolver.url_name, "department_by_id")
 
 
-class TestDepartmentInstructorListAPIView(APITestCase):
+class TestDepartmentInstructorListAPIView(QueryCountTestMixin, APITestCase):
     def setUp(self):
         self.faculty = FacultyFactory()
         self.department = DepartmentFactory(faculty=self.faculty)
@@ -172,3 +176,52 @@ class TestDepartmentInstructorListAPIView(APITestCase):
         self.assertEqual(resolver.func.view_class, DepartmentInstructorListAPIView)
         self.assertEqual(resolver.namespace, "faculty:v1")
         self.assertEqual(resolver.url_name, "department_instructors")
+
+    def test_constant_queries(self):
+        InstructorFactory.create_batch(3, department=self.department)
+
+        self.assertConstantQueries(self.url)
+
+
+class TestInstructorListAPIView(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.url = reverse("faculty:v1:instructors")
+        self.client.force_login(UserFactory())
+        self.instructors = InstructorFactory.create_batch(5)
+
+    def test_constant_queries(self):
+        self.assertConstantQueries(self.url)
+
+    def test_filter_by_faculty(self):
+        faculty_id = self.instructors[0].department.faculty_id
+        response = self.client.get(self.url, {"department__faculty": faculty_id})
+        results = response.json()["data"]["results"]
+        self.assertEqual([result["id"] for result in results], [self.instructors[0].id])
+        self.assertEqual(results[0]["name"], self.instructors[0].user.get_full_name())
+
+    def test_cursor_pages_keep_search_ranks(self):
+        department = DepartmentFactory(name="nasir studies")
+        named = InstructorFactory(
+            user=UserFactory(first_name="Nasir", last_name="Tusi")
+        )
+        others = InstructorFactory.create_batch(3, department=department)
+
+        response = self.client.get(self.url, {"q": "nasir", "cursor": "", "limit": 2})
+        data = response.json()["data"]
+        ids = [result["id"] for result in data["results"]]
+        response = self.client.get(data["next"])
+        ids += [result["id"] for result in response.json()["data"]["results"]]
+
+        self.assertEqual(ids[0], named.id)
+        self.assertEqual(sorted(ids[1:]), [instructor.id for instructor in others])
+        self.assertIsNone(response.json()["data"]["next"])
+
+    def test_tampered_search_cursor(self):
+        for position in [["abc", 1], [{"a": 1}, 1], [1.5, "abc"]]:
+            cursor = base64.urlsafe_b64encode(json.dumps({"p": position}).encode())
+            with self.subTest(position=position):
+                response = self.client.get(
+                    self.url, {"q": "nasir", "cursor": cursor.decode()}
+                )
+
+                self.assertEqual(response.status_code, 404)
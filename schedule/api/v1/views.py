@@ -10,12 +10,14 @@ from schedule.api.v1.serializers import (InstructorScheduleSerializer,
 from schedule.models import Schedule
 from users.models import Instructor
 from utils.api.error_objects import ErrorObject
-from utils.api.mixins import BadRequestSerializerMixin
+from utils.api.mixins import BadRequestSerializerMixin, QueryPlanMixin
 from utils.api.responses import error_response, success_response
 from utils.permissions import IsAuthenticatedAndActive, IsInstructor
 
 
-class InstructorScheduleListAPIView(BadRequestSerializerMixin, ListAPIView):
+class InstructorScheduleListAPIView(
+    BadRequestSerializerMixin, QueryPlanMixin, ListAPIView
+):
     permission_classes = [IsAuthenticatedAndActive, IsInstructor]
     serializer_class = InstructorScheduleSerializer
 
@@ -153,7 +155,9 @@ class InstructorScheduleByIdAPIView(BadRequestSerializerMixin, APIView):
         return success_response(data={}, status_code=status.HTTP_204_NO_CONTENT)
 
 
-class ScheduleByInstructorAPIView(BadRequestSerializerMixin, ListAPIView):
+class ScheduleByInstructorAPIView(
+    BadRequestSerializerMixin, QueryPlanMixin, ListAPIView
+):
     permission_classes = [IsAuthenticatedAndActive]
     serializer_class = ScheduleSerializer
 
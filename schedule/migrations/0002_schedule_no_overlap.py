@@ -0,0 +1,79 @@
+# Generated by Django 3.2.9 on 2026-10-18 14:05
+
+from django.db import migrations
+
+# Rows with an empty or inverted time range overlap nothing, as in
+# Schedule.clean(), and the ranges are half open so back to back schedules
+# are allowed
+POSTGRESQL_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE schedule_schedule ADD CONSTRAINT schedule_no_overlap
+    EXCLUDE USING gist (
+        instructor_id WITH =,
+        day_of_week WITH =,
+        tsrange(DATE '2000-01-01' + start_time, DATE '2000-01-01' + end_time) WITH &&
+    ) WHERE (start_time < end_time)
+    """,
+]
+POSTGRESQL_DROP = [
+    "ALTER TABLE schedule_schedule DROP CONSTRAINT schedule_no_overlap",
+]
+
+# SQLite has a single writer, a trigger checks the other rows while holding
+# the write lock
+SQLITE_OVERLAP_CHECK = """
+    WHEN NEW.start_time < NEW.end_time AND EXISTS (
+        SELECT 1 FROM schedule_schedule
+        WHERE instructor_id = NEW.instructor_id
+        AND day_of_week = NEW.day_of_week
+        AND start_time < end_time
+        AND start_time < NEW.end_time
+        AND end_time > NEW.start_time
+        {exclude}
+    )
+    BEGIN SELECT RAISE(ABORT, 'schedule_no_overlap'); END
+"""
+SQLITE_CREATE = [
+    "CREATE TRIGGER schedule_no_overlap_insert BEFORE INSERT ON schedule_schedule"
+    + SQLITE_OVERLAP_CHECK.format(exclude=""),
+    "CREATE TRIGGER schedule_no_overlap_update BEFORE UPDATE OF instructor_id, "
+    "day_of_week, start_time, end_time ON schedule_schedule"
+    + SQLITE_OVERLAP_CHECK.format(exclude="AND id != NEW.id"),
+]
+SQLITE_DROP = [
+    "DROP TRIGGER schedule_no_overlap_insert",
+    "DROP TRIGGER schedule_no_overlap_update",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRESQL_CREATE, POSTGRESQL_DROP),
+    "sqlite": (SQLITE_CREATE, SQLITE_DROP),
+}
+
+
+def execute(schema_editor, create):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[0 if create else 1]:
+        schema_editor.execute(sql)
+
+
+def create_overlap_constraint(apps, schema_editor):
+    execute(schema_editor, create=True)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    execute(schema_editor, create=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_overlap_constraint, drop_overlap_constraint),
+    ]
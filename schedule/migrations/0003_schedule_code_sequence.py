@@ -0,0 +1,28 @@
+# Generated by Django 3.2.9 on 2026-10-18 15:10
+
+from django.db import migrations
+
+# Only PostgreSQL has sequences, the other databases count in redis
+CREATE_SEQUENCE = "CREATE SEQUENCE IF NOT EXISTS schedule_code_seq MINVALUE 0 START 0"
+DROP_SEQUENCE = "DROP SEQUENCE IF EXISTS schedule_code_seq"
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEQUENCE)
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEQUENCE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schedule", "0002_schedule_no_overlap"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
@@ -1,11 +1,11 @@
-import random
-import string
+import contextlib
 
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.utils import timezone
+from django.db import IntegrityError, models, router, transaction
 from django.utils.translation import gettext_lazy as _
 
+from utils.identifiers import next_schedule_code
+
 
 class Schedule(models.Model):
     DAY_SATURDAY = 1
@@ -36,6 +36,8 @@ class Schedule(models.Model):
 
     class Meta:
         unique_together = ("instructor", "day_of_week", "start_time", "end_time")
+        # Overlaps are refused by the database too, see the
+        # schedule_no_overlap migration
 
     def __str__(self):
         return f"{self.instructor.user.username} - {self.DAY_CHOICES[self.day_of_week - 1][1]}: {self.start_time} to {self.end_time}"
@@ -61,32 +63,24 @@ class Schedule(models.Model):
             )
 
     def save(self, *args, **kwargs):
-        self.clean()
         if not self.code:
-            # Generate a unique code
-            self.code = self._generate_unique_code()
-        super().save(*args, **kwargs)
-
-    @classmethod
-    def _generate_unique_code(cls):
-        while True:
-            code = cls._generate_code()
-            if not cls.objects.filter(code=code).exists():
-                return code
+            self.code = next_schedule_code()
+        # The database checks the overlaps as the row is written, so
+        # concurrent writes can not both pass
+        try:
+            with self._savepoint(kwargs.get("using")):
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            # Raises the ValidationError of an overlap, any other error goes on
+            self.clean()
+            raise
 
-    @staticmethod
-    def _generate_code():
+    def _savepoint(self, using):
         """
-        This method is used to generate a unique code for the schedule in this format:
-        schedule-2023-11-01-A123
-        Last 4 chars are random.
+        A failed statement aborts the transaction it is in on PostgreSQL, so
+        the write gets a savepoint inside one.
         """
-        # Generate a random uppercase letter from A-Z
-        random_letter = random.choice(string.ascii_uppercase)
-
-        # Generate a random 3 digit number
-        random_number = random.randint(100, 999)
-        now = timezone.now()
-        return (
-            f"schedule-{now.year}-{now.month}-{now.day}-{random_letter}{random_number}"
-        )
+        using = using or router.db_for_write(Schedule, instance=self)
+        if transaction.get_connection(using).in_atomic_block:
+            return transaction.atomic(using=using)
+        return contextlib.nullcontext()
@@ -0,0 +1,118 @@
+import datetime
+import threading
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from schedule.factories import ScheduleFactory
+from schedule.models import Schedule
+from users.factories import InstructorFactory
+
+
+def make_schedule(instructor, start_hour, end_hour, day_of_week=1):
+    return Schedule(
+        title="class",
+        instructor=instructor,
+        day_of_week=day_of_week,
+        start_time=datetime.time(start_hour),
+        end_time=datetime.time(end_hour),
+    )
+
+
+class TestScheduleOverlap(TestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+        self.schedule = ScheduleFactory(
+            instructor=self.instructor,
+            day_of_week=1,
+            start_time=datetime.time(10),
+            end_time=datetime.time(12),
+        )
+
+    def test_overlap_is_refused(self):
+        with self.assertRaises(ValidationError):
+            make_schedule(self.instructor, 11, 13).save()
+        with self.assertRaises(ValidationError):
+            make_schedule(self.instructor, 10, 12).save()
+
+        self.assertEqual(Schedule.objects.count(), 1)
+
+    def test_adjacent_and_other_slots_are_allowed(self):
+        make_schedule(self.instructor, 12, 14).save()
+        make_schedule(self.instructor, 8, 10).save()
+        make_schedule(self.instructor, 10, 12, day_of_week=2).save()
+        make_schedule(InstructorFactory(), 10, 12).save()
+
+        self.assertEqual(Schedule.objects.count(), 5)
+
+    def assertOneStatement(self, context):
+        # Besides the savepoint of the test transaction, and on PostgreSQL the
+        # nextval of the code of a new schedule
+        statements = [
+            query["sql"]
+            for query in context.captured_queries
+            if "SAVEPOINT" not in query["sql"] and "nextval" not in query["sql"]
+        ]
+        self.assertEqual(len(statements), 1, statements)
+
+    def test_writes_are_one_statement(self):
+        self.schedule.end_time = datetime.time(13)
+        with CaptureQueriesContext(connection) as context:
+            self.schedule.save()
+        self.assertOneStatement(context)
+
+        with CaptureQueriesContext(connection) as context:
+            make_schedule(self.instructor, 14, 16).save()
+        self.assertOneStatement(context)
+
+        other = Schedule.objects.get(start_time=datetime.time(14))
+        other.start_time = datetime.time(12)
+        with self.assertRaises(ValidationError):
+            other.save()
+
+    def test_transaction_survives_an_overlap(self):
+        with transaction.atomic():
+            with self.assertRaises(ValidationError):
+                make_schedule(self.instructor, 11, 13).save()
+            make_schedule(self.instructor, 13, 14).save()
+
+        self.assertEqual(Schedule.objects.count(), 2)
+
+    def test_bulk_writes_are_checked(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Schedule.objects.bulk_create([make_schedule(self.instructor, 9, 11)])
+
+
+class TestConcurrentScheduleWrites(TransactionTestCase):
+    def test_one_of_concurrent_overlapping_writes_wins(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("The threads need a database they all see")
+        instructor = InstructorFactory()
+        writers = 8
+        barrier = threading.Barrier(writers)
+        outcomes = []
+
+        def write(start_hour):
+            try:
+                barrier.wait()
+                make_schedule(instructor, start_hour, start_hour + 2).save()
+                outcomes.append("saved")
+            except ValidationError:
+                outcomes.append("overlap")
+            finally:
+                connection.close()
+
+        # Every slot overlaps the ones next to it
+        threads = [
+            threading.Thread(target=write, args=(8 + i % 2,)) for i in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count("saved"), 1)
+        self.assertEqual(outcomes.count("overlap"), writers - 1)
+        self.assertEqual(Schedule.objects.count(), 1)
@@ -8,6 +8,7 @@ from schedule.factories import ScheduleFactory
 from schedule.models import Schedule
 from users.factories import InstructorFactory, UserFactory
 from utils.api.error_objects import ErrorObject
+from utils.testing import QueryCountTestMixin
 
 
 class TestInstructorScheduleListAPIView(APITestCase):
@@ -155,7 +156,7 @@ class TestInstructorScheduleByIdAPIView(APITestCase):
         self.assertEqual(resolver.url_name, "instructor_schedule")
 
 
-class TestScheduleByInstructorAPIView(APITestCase):
+class TestScheduleByInstructorAPIView(QueryCountTestMixin, APITestCase):
     def setUp(self):
         self.user = UserFactory()
         self.user2 = UserFactory()
@@ -183,6 +184,13 @@ class TestScheduleByInstructorAPIView(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 401)
 
+    def test_constant_queries(self):
+        for day_of_week in range(2, 6):
+            ScheduleFactory(instructor=self.instructor, day_of_week=day_of_week)
+        self.client.force_login(self.user2)
+
+        self.assertConstantQueries(self.url)
+
     def test_resolve_url(self):
         resolver = resolve("/api/v1/instructor/5/schedules/")
         self.assertEqual(resolver.view_name, "schedule:v1:schedule_list_by_instructor")
@@ -16,13 +16,14 @@ from ticket.api.v1.serializers import (
     OutputTicketListSerializer,
 )
 from ticket.models import Ticket
+from utils.api.custom_pagination import CustomLimitOffsetOrCursorPagination
 from utils.api.error_objects import ErrorObject
-from utils.api.mixins import BadRequestSerializerMixin
+from utils.api.mixins import BadRequestSerializerMixin, QueryPlanMixin
 from utils.api.responses import error_response, success_response
 from utils.permissions import IsInstructor, IsAuthenticatedAndActive
 
 
-class TicketListAPIView(BadRequestSerializerMixin, ListAPIView):
+class TicketListAPIView(BadRequestSerializerMixin, QueryPlanMixin, ListAPIView):
     """
     Get List of Tickets.
 
@@ -30,6 +31,7 @@ class TicketListAPIView(BadRequestSerializerMixin, ListAPIView):
     """
 
     permission_classes = [IsAuthenticatedAndActive]
+    pagination_class = CustomLimitOffsetOrCursorPagination
     serializer_class = OutputTicketListSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = [
@@ -130,7 +132,9 @@ class TicketByIDAPIView(BadRequestSerializerMixin, APIView):
         return success_response(data=None, status_code=status.HTTP_201_CREATED)
 
 
-class InstructorTicketListAPIView(BadRequestSerializerMixin, ListAPIView):
+class InstructorTicketListAPIView(
+    BadRequestSerializerMixin, QueryPlanMixin, ListAPIView
+):
     """
     Get list of all tickets for Instructor with filtering on status
 
@@ -138,6 +142,7 @@ class InstructorTicketListAPIView(BadRequestSerializerMixin, ListAPIView):
     """
 
     permission_classes = [IsInstructor]
+    pagination_class = CustomLimitOffsetOrCursorPagination
     serializer_class = InstructorOutputTicketListSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = [
@@ -0,0 +1,22 @@
+import factory
+
+from ticket.models import Ticket, TicketMessage
+from users.factories import InstructorFactory, UserFactory
+
+
+class TicketFactory(factory.django.DjangoModelFactory):
+    title = factory.Faker("sentence", nb_words=4)
+    user = factory.SubFactory(UserFactory)
+    instructor = factory.SubFactory(InstructorFactory)
+
+    class Meta:
+        model = Ticket
+
+
+class TicketMessageFactory(factory.django.DjangoModelFactory):
+    ticket = factory.SubFactory(TicketFactory)
+    user = factory.SelfAttribute("ticket.user")
+    message = factory.Faker("paragraph")
+
+    class Meta:
+        model = TicketMessage
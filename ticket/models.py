@@ -5,7 +5,8 @@ from django.utils.translation import gettext_lazy as _
 
 from model_utils.models import TimeStampedModel
 
-from utils.helpers import create_random_digits, get_hash
+from utils.helpers import get_hash
+from utils.identifiers import next_ticket_number
 
 
 def attachment_path(instance, filename):
@@ -50,7 +51,7 @@ class Ticket(TimeStampedModel):
 
     def save(self, *args, **kwargs):
         if not self.pk:
-            self.ticket_number = "#" + create_random_digits(length=8)
+            self.ticket_number = next_ticket_number()
         super().save(*args, **kwargs)
 
 
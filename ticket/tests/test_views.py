@@ -0,0 +1,157 @@
+import base64
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from ticket.api.v1.serializers import (
+    InstructorOutputTicketListSerializer,
+    OutputTicketMessageSerializer,
+)
+from ticket.factories import TicketFactory, TicketMessageFactory
+from ticket.models import Ticket
+from users.factories import InstructorFactory, UserFactory
+from utils.api.query_plan import QueryPlan
+from utils.testing import QueryCountTestMixin
+
+
+class TestQueryPlan(TestCase):
+    def test_nested_serializers_are_selected(self):
+        plan = QueryPlan.for_serializer(InstructorOutputTicketListSerializer())
+
+        self.assertEqual(
+            plan.select_related,
+            {
+                "user",
+                "user__instructor",
+                "user__instructor__department",
+                "user__instructor__department__faculty",
+            },
+        )
+        self.assertIn("user__phone", plan.fields)
+        self.assertIn("user__instructor__department__faculty__name", plan.fields)
+        self.assertNotIn("user__password", plan.fields)
+
+    def test_many_serializers_are_prefetched(self):
+        plan = QueryPlan.for_serializer(OutputTicketMessageSerializer())
+
+        attachments = plan.prefetches["attachments"]
+        self.assertEqual(
+            attachments.fields, {"id", "ticket_message", "created", "file"}
+        )
+        # get_is_mine declares nothing, so the whole message is loaded
+        self.assertIn("user", plan.fields)
+
+    def test_applied_queryset_renders_without_queries(self):
+        message = TicketMessageFactory()
+        queryset = QueryPlan.for_serializer(
+            InstructorOutputTicketListSerializer()
+        ).apply(Ticket.objects.all())
+
+        with self.assertNumQueries(1):
+            data = InstructorOutputTicketListSerializer(queryset, many=True).data
+
+        self.assertEqual(data[0]["user"]["first_name"], message.user.first_name)
+        self.assertFalse(data[0]["user"]["is_instructor"])
+
+
+class TestTicketListAPIView(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        TicketFactory.create_batch(5, user=self.user)
+        self.client.force_login(self.user)
+
+    def test_constant_queries(self):
+        self.assertConstantQueries(reverse("ticket:v1:ticket_list"))
+
+
+class TestInstructorTicketListAPIView(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+        TicketFactory.create_batch(3, instructor=self.instructor)
+        # Tickets of users who are instructors themselves
+        for instructor in InstructorFactory.create_batch(2):
+            TicketFactory(instructor=self.instructor, user=instructor.user)
+        self.client.force_login(self.instructor.user)
+
+    def test_constant_queries(self):
+        self.assertConstantQueries(reverse("ticket:v1:instructor_ticket_list"))
+
+
+class TestTicketListCursorPagination(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.tickets = TicketFactory.create_batch(7, user=self.user)
+        # Tickets created at the same time are ordered by id
+        tied_ids = [ticket.id for ticket in self.tickets[2:5]]
+        Ticket.objects.filter(id__in=tied_ids).update(created=self.tickets[2].created)
+        self.client.force_login(self.user)
+        self.url = reverse("ticket:v1:ticket_list")
+
+    def get_ids(self, data):
+        return [ticket["id"] for ticket in data["results"]]
+
+    def test_pages_through_ties(self):
+        expected = list(
+            Ticket.objects.order_by("-created", "-id").values_list("id", flat=True)
+        )
+
+        ids = []
+        pages = []
+        url = self.url + "?cursor=&limit=3"
+        while url:
+            data = self.client.get(url).json()["data"]
+            pages.append(data)
+            ids += self.get_ids(data)
+            url = data["next"]
+
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page["results"]) for page in pages], [3, 3, 1])
+        self.assertIsNone(pages[0]["previous"])
+        self.assertIsNone(pages[0]["count"])
+
+        data = self.client.get(pages[2]["previous"]).json()["data"]
+        self.assertEqual(self.get_ids(data), expected[3:6])
+        data = self.client.get(data["previous"]).json()["data"]
+        self.assertEqual(self.get_ids(data), expected[:3])
+        self.assertIsNone(data["previous"])
+
+    def test_ordering_filter_and_count(self):
+        response = self.client.get(
+            self.url,
+            {"cursor": "", "ordering": "created", "limit": 2, "count": "exact"},
+        )
+
+        data = response.json()["data"]
+        oldest = Ticket.objects.order_by("created", "id").values_list("id", flat=True)
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(self.get_ids(data), list(oldest[:2]))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        positions = [
+            ["notadate", 1],
+            [None, 1],
+            [{"a": 1}, 1],
+            ["2026-10-18T12:00:00+00:00", "abc"],
+            ["2026-10-18T12:00:00+00:00", None],
+        ]
+        for position in positions:
+            cursor = base64.urlsafe_b64encode(json.dumps({"p": position}).encode())
+            with self.subTest(position=position):
+                response = self.client.get(self.url, {"cursor": cursor.decode()})
+
+                self.assertEqual(response.status_code, 404)
+
+    def test_limit_offset_without_cursor(self):
+        response = self.client.get(self.url, {"limit": 3, "offset": 3})
+
+        data = response.json()["data"]
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(len(data["results"]), 3)
+        self.assertIn("offset=6", data["next"])
@@ -1,9 +1,13 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 from faculty.api.v1.serializers import DepartmentSerializer, FacultySerializer
+from users.authentication import DenylistRefreshToken, RoleRefreshToken
 from users.models import Instructor
 
 User = get_user_model()
@@ -24,7 +28,7 @@ class LoginOutputSerializer(serializers.ModelSerializer):
 
     def _get_token(self, obj):
         # This method only called once
-        self.refresh_token = RefreshToken.for_user(obj)
+        self.refresh_token = RoleRefreshToken.for_user(obj)
         self.access_token = self.refresh_token.access_token
 
     def get_access(self, obj) -> str:
@@ -71,6 +75,24 @@ class LoginOutputSerializer(serializers.ModelSerializer):
         ]
 
 
+class DenylistTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = DenylistRefreshToken(attrs["refresh"])
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Losing the race to deny the token means it was already rotated
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                raise TokenError(_("Token is blacklisted"))
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 class LogOutSerializer(serializers.Serializer):
     refresh = serializers.CharField(required=True)
 
@@ -86,6 +108,7 @@ class InstructorListSerializer(serializers.ModelSerializer):
             "profile_photo",
             "rank",
         ]
+        field_dependencies = {"name": ["user__first_name", "user__last_name"]}
 
     def get_name(self, obj):
         return obj.user.get_full_name()
@@ -122,6 +145,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "is_instructor",
             "instructor",
         ]
+        field_dependencies = {"phone": ["phone"], "is_instructor": ["instructor"]}
 
     def get_phone(self, obj):
         user_phone = obj.phone
@@ -4,22 +4,25 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
-from social_django.models import UserSocialAuth
-from social_django.utils import load_strategy
 
-from users.api.v1.serializers import (GoogleAuthExistsSerializer,
+from eventcalendar.models import GoogleCredentialStatus
+from users.api.v1.serializers import (DenylistTokenRefreshSerializer,
+                                      GoogleAuthExistsSerializer,
                                       InstructorSerializer,
                                       LoginOutputSerializer,
                                       LoginPasswordSerializer,
                                       LogOutSerializer,
                                       UserProfileInputSerializer,
                                       UserProfileSerializer)
+from users.authentication import DenylistRefreshToken
+from users.passwords import PasswordHasherBusy, verify_password
+from users.profile import PROFILE_SELECT_RELATED, get_profile
+from users.writebehind import record_login
 from utils.api.error_objects import ErrorObject
 from utils.api.mixins import BadRequestSerializerMixin
-from utils.api.responses import error_response, success_response
+from utils.api.responses import (conditional_response, error_response,
+                                 success_response)
 from utils.permissions import IsAuthenticatedAndActive, IsInstructor
 
 User = get_user_model()
@@ -48,19 +51,31 @@ class LoginPasswordAPIView(BadRequestSerializerMixin, APIView):
         password = serializer.validated_data.get("password")
 
         try:
-            user_obj = User.objects.get(username=username, is_active=True)
+            user_obj = User.objects.select_related(*PROFILE_SELECT_RELATED).get(
+                username=username, is_active=True
+            )
         except User.DoesNotExist:
             return error_response(
                 error=ErrorObject.USER_NOT_FOUND, status_code=status.HTTP_404_NOT_FOUND
             )
 
         # User can log in with their password
-        if not user_obj.check_password(password):
+        try:
+            is_correct = verify_password(user_obj, password)
+        except PasswordHasherBusy:
+            response = error_response(
+                error=ErrorObject.SERVICE_UNAVAILABLE,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response["Retry-After"] = "1"
+            return response
+        if not is_correct:
             return error_response(
                 error=ErrorObject.UN_AUTH, status_code=status.HTTP_401_UNAUTHORIZED
             )
 
         output = LoginOutputSerializer(user_obj, context={"request": request})
+        record_login(user_obj)
         return success_response(data=output.data, status_code=status.HTTP_200_OK)
 
 
@@ -69,12 +84,12 @@ class DecoratedRefreshTokenView(TokenRefreshView):
     Refresh Token
     """
 
-    serializer_class = TokenRefreshSerializer
+    serializer_class = DenylistTokenRefreshSerializer
     permission_classes = [AllowAny]
 
     @extend_schema(
-        request=TokenRefreshSerializer,
-        responses={200: TokenRefreshSerializer},
+        request=DenylistTokenRefreshSerializer,
+        responses={200: DenylistTokenRefreshSerializer},
         operation_id="RefreshToken",
         tags=["Auth"],
     )
@@ -112,7 +127,7 @@ class LogOutAPIView(BadRequestSerializerMixin, APIView):
             return self.serializer_error_response(serializer)
         refresh_token = serializer.validated_data.get("refresh")
         try:
-            token = RefreshToken(refresh_token)
+            token = DenylistRefreshToken(refresh_token)
             token.blacklist()
         except Exception:
             return error_response(
@@ -138,9 +153,18 @@ class UserProfileAPIView(BadRequestSerializerMixin, APIView):
 
         gender ==> `1:Male`, `2:Female`
         """
-        user = request.user
-        response = UserProfileSerializer(user)
-        return success_response(data=response.data)
+        profile = get_profile(request.user.pk)
+        if profile is None:
+            return error_response(
+                error=ErrorObject.USER_NOT_FOUND, status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        response = conditional_response(
+            request, profile["etag"], lambda: success_response(data=profile["data"])
+        )
+        # Clients may keep it, but have to revalidate every time
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     @extend_schema(
         request=UserProfileInputSerializer,
@@ -203,39 +227,12 @@ class CheckGoogleAuthAPIView(BadRequestSerializerMixin, APIView):
         Check if Google Credential exists.
         """
 
-        user_social_auth: UserSocialAuth = UserSocialAuth.objects.filter(
-            user_id=request.user.id, provider="google-oauth2"
+        # Tokens are refreshed in the background, see
+        # eventcalendar.tasks.refresh_expiring_google_credentials
+        google_credential_exist = GoogleCredentialStatus.objects.filter(
+            user_id=request.user.id, is_valid=True
         ).exists()
-        if not user_social_auth:
-            return success_response(
-                data={"google_credential_exist": False},
-                status_code=status.HTTP_200_OK,
-            )
-
-        user_social_auth = UserSocialAuth.objects.filter(
-            user_id=request.user.id, provider="google-oauth2"
-        ).last()
-        try:
-            if user_social_auth.access_token_expired():
-                    # Load strategy and backend
-                    strategy = load_strategy(request)
-
-                    # Refresh the token
-                    user_social_auth.refresh_token(strategy=strategy)
-
-                    # Update the access token and expiration time
-                    user_social_auth.save()
-                    return success_response(
-                        data={"google_credential_exist": True},
-                        status_code=status.HTTP_200_OK,
-                    )
-        except Exception:
-            return success_response(
-                data={"google_credential_exist": False},
-                status_code=status.HTTP_200_OK,
-            )
-
         return success_response(
-            data={"google_credential_exist": True},
+            data={"google_credential_exist": google_credential_exist},
             status_code=status.HTTP_200_OK,
         )
@@ -0,0 +1,78 @@
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken, TokenError)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+
+from users.denylist import token_denylist
+from users.principal import PrincipalUser, get_principal, get_role_claims
+from users.writebehind import record_outstanding_token
+
+
+class CachedPrincipalJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the user query: the user is answered from the
+    cached principal snapshot and only loaded when a view needs more of it.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        principal = get_principal(user_id)
+        if principal is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not principal["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return PrincipalUser(principal)
+
+
+class CachedPrincipalJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.CachedPrincipalJWTAuthentication"
+
+
+class DenylistRefreshToken(RefreshToken):
+    """
+    Refresh token denied through the redis denylist instead of the
+    token_blacklist tables. Its outstanding token row is written behind.
+    """
+
+    @classmethod
+    def get_user_claims(cls, user):
+        return {}
+
+    @classmethod
+    def for_user(cls, user):
+        # Skips the OutstandingToken insert of BlacklistMixin.for_user
+        token = super(BlacklistMixin, cls).for_user(user)
+        for claim, value in cls.get_user_claims(user).items():
+            token[claim] = value
+        record_outstanding_token(user, token)
+        return token
+
+    def check_blacklist(self):
+        if token_denylist.contains(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Deny this token. Returns False when it was denied already, which for
+        a rotation means the token was used twice.
+        """
+        return token_denylist.add(self[api_settings.JTI_CLAIM], self["exp"])
+
+
+class RoleRefreshToken(DenylistRefreshToken):
+    """
+    Refresh token carrying the role claims of the user, which its access
+    tokens inherit.
+    """
+
+    @classmethod
+    def get_user_claims(cls, user):
+        return get_role_claims(user)
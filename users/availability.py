@@ -0,0 +1,121 @@
+from datetime import time, timedelta
+
+from django.utils import timezone
+
+from eventcalendar.async_client import get_instructors_busy
+from eventcalendar.models import CalendarChannel, CalendarEvent
+from schedule.models import Schedule
+from users.models import Instructor
+from users.profile import invalidate_profiles
+from utils.api.response_cache import model_tag, purge_tags
+from utils.loggers import stdout_logger
+
+# An instructor is busy when something overlaps the next hour
+AVAILABILITY_WINDOW = timedelta(hours=1)
+
+
+def get_day_of_week(value):
+    """
+    Convert a date to Schedule.day_of_week (Saturday is 1, Friday has no value).
+    """
+    return (value.weekday() + 2) % 7 + 1
+
+
+def _get_scheduled_ids(instructor_ids, now, window_end):
+    local_now = timezone.localtime(now)
+    local_end = timezone.localtime(window_end)
+    end_time = local_end.time() if local_end.date() == local_now.date() else time.max
+    return set(
+        Schedule.objects.filter(
+            instructor_id__in=instructor_ids,
+            day_of_week=get_day_of_week(local_now),
+            start_time__lt=end_time,
+            end_time__gt=local_now.time(),
+        ).values_list("instructor_id", flat=True)
+    )
+
+
+def _get_watched_busy(instructor_ids, now, window_end):
+    """
+    Instructors with a live push channel and a synced store have an up to
+    date local calendar, so their busy state is read from the stored events
+    instead of google.
+    """
+    watched_ids = set(
+        CalendarChannel.objects.filter(
+            instructor_id__in=instructor_ids,
+            expiration__gt=now,
+            instructor__calendar_sync__synced_at__isnull=False,
+        ).values_list("instructor_id", flat=True)
+    )
+    busy_ids = set(
+        CalendarEvent.objects.filter(
+            instructor_id__in=watched_ids, start__lt=window_end, end__gt=now
+        ).values_list("instructor_id", flat=True)
+    )
+    return {instructor_id: instructor_id in busy_ids for instructor_id in watched_ids}
+
+
+def compute_availability(instructors, now=None):
+    """
+    Return {instructor_id: is_available_now}. An instructor is unavailable if a
+    google calendar busy interval or one of their schedules overlaps the next
+    hour, instructors not connected to google only have their schedules.
+    None means their calendar could not be read, so it is unknown.
+    """
+    now = now or timezone.now()
+    window_end = now + AVAILABILITY_WINDOW
+    instructor_ids = [instructor.id for instructor in instructors]
+
+    calendar_busy = _get_watched_busy(instructor_ids, now, window_end)
+    busy_intervals = get_instructors_busy(
+        [i for i in instructors if i.id not in calendar_busy], now, window_end
+    )
+    for instructor_id, intervals in busy_intervals.items():
+        # freeBusy already clips the intervals to the requested window
+        calendar_busy[instructor_id] = None if intervals is None else bool(intervals)
+
+    scheduled_ids = _get_scheduled_ids(instructor_ids, now, window_end)
+    return {
+        instructor_id: (
+            None
+            if calendar_busy[instructor_id] is None
+            else not (calendar_busy[instructor_id] or instructor_id in scheduled_ids)
+        )
+        for instructor_id in instructor_ids
+    }
+
+
+def update_instructors_availability(instructor_ids, now=None):
+    """
+    Recompute is_available_now of the instructors and save the changed rows
+    with one bulk update. Returns the counters of the run.
+    """
+    instructor_objs = list(
+        Instructor.objects.filter(id__in=instructor_ids).only(
+            "id", "user", "is_available_now"
+        )
+    )
+    availability = compute_availability(instructor_objs, now=now)
+
+    changed_objs = []
+    for instructor in instructor_objs:
+        is_available = availability[instructor.id]
+        if is_available is None or is_available == instructor.is_available_now:
+            continue
+        instructor.is_available_now = is_available
+        changed_objs.append(instructor)
+    Instructor.objects.bulk_update(changed_objs, ["is_available_now"])
+    # bulk_update sends no post_save
+    invalidate_profiles([instructor.user_id for instructor in changed_objs])
+    purge_tags(*[model_tag(Instructor, instructor.id) for instructor in changed_objs])
+
+    result = {
+        "instructors": len(instructor_objs),
+        "busy": sum(1 for value in availability.values() if value is False),
+        "updated": len(changed_objs),
+        "failed": sum(1 for value in availability.values() if value is None),
+    }
+    if result["failed"]:
+        stdout_logger.error(f"Availability of {result['failed']} instructors unknown.")
+    return result
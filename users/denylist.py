@@ -0,0 +1,136 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.settings import api_settings
+
+DENYLIST_KEY_PREFIX = "jwt-denylist:jti:"
+# Sorted set of every denied jti scored by the time it was denied, the
+# processes read it to keep their bloom filters in step
+DENYLIST_LOG_KEY = "jwt-denylist:log"
+# Overlap of the incremental log reads, for clock skew between the servers
+DENYLIST_SYNC_OVERLAP = 5
+DENYLIST_LOAD_CHUNK_SIZE = 10000
+
+
+def _refresh_lifetime():
+    # A token denied longer ago than this has expired since
+    return api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing (Kirsch-Mitzenmacher), one digest gives every position
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenDenylist:
+    """
+    Denied refresh token jtis, kept in redis with a ttl of the remaining
+    lifetime of the token instead of the token_blacklist tables.
+
+    Every process holds a bloom filter of the denied jtis, so checking a
+    token that was never denied usually costs no redis call. The filter
+    catches up with the other processes every JWT_DENYLIST_SYNC_INTERVAL
+    seconds. That is safe because `add` is atomic: a rotated or logged out
+    refresh token the stale filter lets through fails when the refresh
+    denies it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.built_at = 0
+        self.synced_at = 0
+
+    @property
+    def redis(self):
+        return get_redis_connection("default")
+
+    def add(self, jti, exp):
+        """
+        Deny a token until it expires. Returns False if it was denied already.
+        """
+        ttl = int(exp - time.time())
+        if ttl <= 0:
+            # Expired tokens are refused anyway
+            return True
+        if not self.redis.set(DENYLIST_KEY_PREFIX + jti, 1, nx=True, ex=ttl):
+            return False
+        self.redis.zadd(DENYLIST_LOG_KEY, {jti: time.time()})
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+        return True
+
+    def contains(self, jti):
+        self.sync()
+        if jti not in self.bloom:
+            return False
+        return bool(self.redis.exists(DENYLIST_KEY_PREFIX + jti))
+
+    def sync(self):
+        now = time.time()
+        with self.lock:
+            if (
+                self.bloom is None
+                or now - self.built_at >= settings.JWT_DENYLIST_REBUILD_INTERVAL
+            ):
+                # Rebuilt from scratch now and then, expired jtis fall out
+                self.bloom = BloomFilter(
+                    settings.JWT_DENYLIST_BLOOM_CAPACITY,
+                    settings.JWT_DENYLIST_BLOOM_ERROR_RATE,
+                )
+                self._load(now - _refresh_lifetime())
+                self.built_at = self.synced_at = now
+            elif now - self.synced_at >= settings.JWT_DENYLIST_SYNC_INTERVAL:
+                self._load(self.synced_at - DENYLIST_SYNC_OVERLAP)
+                self.synced_at = now
+
+    def _load(self, since):
+        start = 0
+        while True:
+            jtis = self.redis.zrangebyscore(
+                DENYLIST_LOG_KEY,
+                since,
+                "+inf",
+                start=start,
+                num=DENYLIST_LOAD_CHUNK_SIZE,
+            )
+            for jti in jtis:
+                self.bloom.add(jti.decode())
+            if len(jtis) < DENYLIST_LOAD_CHUNK_SIZE:
+                return
+            start += DENYLIST_LOAD_CHUNK_SIZE
+
+    def prune(self):
+        """
+        Drop the log entries of tokens that have expired by now. Their keys
+        expire on their own.
+        """
+        expired_before = time.time() - _refresh_lifetime()
+        return self.redis.zremrangebyscore(DENYLIST_LOG_KEY, "-inf", expired_before)
+
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from schedule.models import Schedule
+from users.models import Instructor
+
+CSV_COLUMNS = [
+    "instructor_id",
+    "first_name",
+    "last_name",
+    "rank",
+    "room_phone",
+    "room_number",
+    "is_available_now",
+    "department_id",
+    "department",
+    "faculty_id",
+    "faculty",
+    "schedule_code",
+    "schedule_title",
+    "day_of_week",
+    "start_time",
+    "end_time",
+]
+
+
+def iter_instructor_chunks(since=None, chunk_size=None):
+    """
+    Yield the instructors after the id `since` in lists of `chunk_size`, in
+    id order, each with its department and faculty and its schedules as
+    `export_schedules`. The instructors are read through a server-side
+    cursor and the schedules with one query per chunk, so the memory used
+    does not grow with the table.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = (
+        Instructor.objects.select_related("user", "department__faculty")
+        .only(
+            "id",
+            "rank",
+            "room_phone",
+            "room_number",
+            "is_available_now",
+            "user__first_name",
+            "user__last_name",
+            "department__name",
+            "department__faculty__name",
+        )
+        .order_by("id")
+    )
+    if since is not None:
+        queryset = queryset.filter(id__gt=since)
+
+    instructors = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(instructors, chunk_size))
+        if not chunk:
+            return
+        schedules = {instructor.id: [] for instructor in chunk}
+        for schedule in Schedule.objects.filter(
+            instructor_id__in=list(schedules)
+        ).order_by("day_of_week", "start_time", "id"):
+            schedules[schedule.instructor_id].append(schedule)
+        for instructor in chunk:
+            instructor.export_schedules = schedules[instructor.id]
+        yield chunk
+
+
+def instructor_document(instructor):
+    department = instructor.department
+    return {
+        "id": instructor.id,
+        "first_name": instructor.user.first_name,
+        "last_name": instructor.user.last_name,
+        "rank": instructor.rank,
+        "room_phone": instructor.room_phone,
+        "room_number": instructor.room_number,
+        "is_available_now": instructor.is_available_now,
+        "department": {
+            "id": department.id,
+            "name": department.name,
+            "faculty": {"id": department.faculty_id, "name": department.faculty.name},
+        },
+        "schedules": [
+            {
+                "code": schedule.code,
+                "title": schedule.title,
+                "day_of_week": schedule.day_of_week,
+                "start_time": schedule.start_time,
+                "end_time": schedule.end_time,
+            }
+            for schedule in instructor.export_schedules
+        ],
+    }
+
+
+def iter_ndjson(chunks):
+    """
+    One json document of an instructor per line, a string per chunk.
+    """
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(instructor_document(instructor), cls=DjangoJSONEncoder)
+            + "\n"
+            for instructor in chunk
+        )
+
+
+def iter_csv(chunks):
+    """
+    A row per schedule, or one with empty schedule columns for an instructor
+    without schedules, a string per chunk.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for chunk in chunks:
+        for instructor in chunk:
+            document = instructor_document(instructor)
+            department = document["department"]
+            row = [
+                document["id"],
+                document["first_name"],
+                document["last_name"],
+                document["rank"],
+                document["room_phone"],
+                document["room_number"],
+                document["is_available_now"],
+                department["id"],
+                department["name"],
+                department["faculty"]["id"],
+                department["faculty"]["name"],
+            ]
+            for schedule in document["schedules"] or [{}]:
+                writer.writerow(
+                    row
+                    + [
+                        schedule.get("code"),
+                        schedule.get("title"),
+                        schedule.get("day_of_week"),
+                        schedule.get("start_time"),
+                        schedule.get("end_time"),
+                    ]
+                )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
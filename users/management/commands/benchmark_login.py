@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from eventcalendar.benchmark import BenchmarkResult
+
+
+class Command(BaseCommand):
+    help = (
+        "Storm a running server with password logins and measure the latency "
+        "of cheap authenticated requests sent to it at the same time"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8888")
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--logins", type=int, default=500)
+        parser.add_argument("--login-concurrency", type=int, default=50)
+        parser.add_argument("--probes", type=int, default=200)
+        parser.add_argument("--probe-concurrency", type=int, default=4)
+        parser.add_argument("--json", action="store_true")
+
+    def handle(self, *args, **options):
+        base_url = options["url"].rstrip("/")
+        self.login_url = base_url + "/api/v1/auth/login-password/"
+        self.probe_url = base_url + "/api/v1/auth/me/"
+        self.credentials = {
+            "username": options["username"],
+            "password": options["password"],
+        }
+
+        response = httpx.post(self.login_url, json=self.credentials, timeout=30)
+        if response.status_code != 200:
+            raise CommandError(f"Login failed with {response.status_code}")
+        self.access_token = response.json()["data"]["access"]
+
+        results = [self.probe("probe_idle", options)]
+
+        storm_result = {}
+        storm = threading.Thread(
+            target=lambda: storm_result.update(login=self.login_storm(options))
+        )
+        storm.start()
+        results.append(self.probe("probe_under_storm", options))
+        storm.join()
+        results.append(storm_result["login"])
+
+        results = [result.as_dict() for result in results]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                "{scenario:<18} count={count:<5} errors={errors:<4} "
+                "{throughput:>9.2f}/s  p50={p50:.4f}s p95={p95:.4f}s "
+                "p99={p99:.4f}s max={max:.4f}s".format(**result)
+            )
+
+    def _run(self, scenario, count, concurrency, send):
+        local = threading.local()
+
+        def run(index):
+            if not hasattr(local, "client"):
+                local.client = httpx.Client(timeout=30)
+            started = time.perf_counter()
+            try:
+                failed = send(local.client).status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            return time.perf_counter() - started, failed
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(run, range(count)))
+        return BenchmarkResult(
+            scenario=scenario,
+            instructors=0,
+            count=count,
+            seconds=time.perf_counter() - started,
+            latencies=[latency for latency, _ in results],
+            errors=sum(failed for _, failed in results),
+        )
+
+    def probe(self, scenario, options):
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        return self._run(
+            scenario,
+            options["probes"],
+            options["probe_concurrency"],
+            lambda client: client.get(self.probe_url, headers=headers),
+        )
+
+    def login_storm(self, options):
+        # Rejected logins (503) count as errors, their latency is the point
+        return self._run(
+            "login_storm",
+            options["logins"],
+            options["login_concurrency"],
+            lambda client: client.post(self.login_url, json=self.credentials),
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from users.denylist import token_denylist
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the unexpired tokens blacklisted in the database to the redis "
+        "denylist, e.g. after redis lost its data. Safe to run again."
+    )
+
+    def handle(self, *args, **options):
+        blacklisted = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("token__jti", "token__expires_at")
+        added = 0
+        for jti, expires_at in blacklisted.iterator():
+            added += bool(token_denylist.add(jti, expires_at.timestamp()))
+        self.stdout.write(
+            self.style.SUCCESS(f"Added {added} blacklisted tokens to the denylist.")
+        )
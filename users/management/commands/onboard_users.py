@@ -0,0 +1,57 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.onboarding import UserOnboarding, iter_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update users, and instructors, from a csv or jsonl file. "
+        "Columns: username, email, phone, first_name, last_name, gender, "
+        "password, faculty, is_instructor, department, bio, room_phone, "
+        "room_number, rank. Faculty and department are names."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=None,
+            help="Password hashing processes, defaults to the number of cpus",
+        )
+        parser.add_argument("--report", help="Write the rejected rows to this csv file")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or (
+            "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+        )
+
+        started = time.monotonic()
+        onboarding = UserOnboarding(
+            batch_size=options["batch_size"], hash_workers=options["hash_workers"]
+        )
+        try:
+            with open(path, newline="", encoding="utf-8") as file:
+                report = onboarding.run(iter_rows(file, file_format))
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(["line", "username", "error"])
+                writer.writerows(report.errors)
+        else:
+            for line, username, error in report.errors:
+                self.stderr.write(f"line {line} ({username}): {error}")
+
+        summary = report.as_dict()
+        summary["seconds"] = round(time.monotonic() - started, 2)
+        self.stdout.write(self.style.SUCCESS(json.dumps(summary)))
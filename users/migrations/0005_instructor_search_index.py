@@ -0,0 +1,109 @@
+# Generated by Django 3.2.9 on 2026-10-18 16:20
+
+from django.db import migrations
+
+# The index of users.search as it was made here, kept apart from the live
+# classes so that later changes to them do not change this migration
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_instructor_search USING fts5(
+        first_name, last_name, department, academic_rank,
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO users_instructor_search
+        (rowid, first_name, last_name, department, academic_rank)
+    SELECT
+        users_instructor.id,
+        COALESCE(users_user.first_name, ''),
+        COALESCE(users_user.last_name, ''),
+        COALESCE(faculty_department.name, ''),
+        COALESCE(users_instructor.rank, '')
+    FROM users_instructor
+    JOIN users_user ON users_user.id = users_instructor.user_id
+    LEFT JOIN faculty_department
+        ON faculty_department.id = users_instructor.department_id
+    """,
+]
+SQLITE_DROP = [
+    "DROP TABLE IF EXISTS users_instructor_search",
+]
+
+POSTGRESQL_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE TABLE IF NOT EXISTS users_instructor_search (
+        instructor_id bigint PRIMARY KEY REFERENCES users_instructor (id)
+            ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        document tsvector NOT NULL,
+        name text NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS users_instructor_search_document
+    ON users_instructor_search USING gin (document)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS users_instructor_search_name
+    ON users_instructor_search USING gin (name gin_trgm_ops)
+    """,
+    """
+    INSERT INTO users_instructor_search (instructor_id, document, name)
+    SELECT
+        id,
+        setweight(to_tsvector('simple', name), 'A')
+        || setweight(to_tsvector('simple', department), 'B')
+        || setweight(to_tsvector('simple', rank), 'C'),
+        name
+    FROM (
+        SELECT
+            users_instructor.id,
+            COALESCE(users_user.first_name, '') || ' '
+            || COALESCE(users_user.last_name, '') AS name,
+            COALESCE(faculty_department.name, '') AS department,
+            COALESCE(users_instructor.rank, '') AS rank
+        FROM users_instructor
+        JOIN users_user ON users_user.id = users_instructor.user_id
+        LEFT JOIN faculty_department
+            ON faculty_department.id = users_instructor.department_id
+    ) AS documents
+    ON CONFLICT (instructor_id) DO NOTHING
+    """,
+]
+POSTGRESQL_DROP = [
+    "DROP TABLE IF EXISTS users_instructor_search",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRESQL_CREATE, POSTGRESQL_DROP),
+    "sqlite": (SQLITE_CREATE, SQLITE_DROP),
+}
+
+
+def execute(schema_editor, create):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[0 if create else 1]:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    execute(schema_editor, create=True)
+
+
+def drop_search_index(apps, schema_editor):
+    execute(schema_editor, create=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_blacklist', '0011_linearizes_history'),
+        ('users', '0004_auto_20250131_1944'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
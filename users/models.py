@@ -1,13 +1,13 @@
+import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from rest_framework import status
 
+from eventcalendar.clients import calendar_service
 from users.managers import CustomUserManager
 from utils.api.error_objects import ErrorObject
 from utils.helpers import convert_datetime_timezone, get_hash
@@ -71,34 +71,22 @@ class User(AbstractBaseUser, PermissionsMixin):
         return time_min, time_max
 
     def get_google_calendar_events(self):
-        social_user = self.social_auth.filter(provider="google-oauth2").last()
-
-        credentials = Credentials(
-            token=social_user.extra_data["access_token"],
-            refresh_token=social_user.extra_data["refresh_token"],
-            client_id=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY,
-            client_secret=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET,
-            token_uri="https://oauth2.googleapis.com/token",
-        )
-
-        # Build Google Calendar API client
-        service = build("calendar", "v3", credentials=credentials)
-
         time_min, time_max = self.get_current_week_range()
 
         stdout_logger.info(f"Geting {self.username} events from google calender...")
         try:
-            events_result = (
-                service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=time_min,  # From now (to exclude past events)
-                    timeMax=time_max,  # Until Thursday
-                    singleEvents=True,
-                    orderBy="startTime",
+            with calendar_service(self) as service:
+                events_result = (
+                    service.events()
+                    .list(
+                        calendarId="primary",
+                        timeMin=time_min,  # From now (to exclude past events)
+                        timeMax=time_max,  # Until Thursday
+                        singleEvents=True,
+                        orderBy="startTime",
+                    )
+                    .execute()
                 )
-                .execute()
-            )
         except HttpError as error:
             # Catch the HttpError
             error_details = error.content.decode("utf-8")
@@ -112,20 +100,20 @@ class User(AbstractBaseUser, PermissionsMixin):
         return events
 
     def create_google_calendar_event(
-        self, summary, start, end, attendees_emails, time_zone="Asia/Tehran"
+        self,
+        summary,
+        start,
+        end,
+        attendees_emails,
+        time_zone="Asia/Tehran",
+        request_id=None,
+        event_id=None,
     ):
-        social_user = self.social_auth.filter(provider="google-oauth2").last()
-
-        credentials = Credentials(
-            token=social_user.extra_data["access_token"],
-            refresh_token=social_user.extra_data["refresh_token"],
-            client_id=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY,
-            client_secret=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET,
-            token_uri="https://oauth2.googleapis.com/token",
-        )
-
-        service = build("calendar", "v3", credentials=credentials)
-
+        """
+        Insert an event with a google meet conference. Pass the same event_id
+        and request_id when retrying, so google neither duplicates the event
+        nor generates a second meet link.
+        """
         event = {
             "summary": summary,
             "start": {
@@ -146,33 +134,60 @@ class User(AbstractBaseUser, PermissionsMixin):
             },
             "conferenceData": {
                 "createRequest": {
-                    "requestId": "7qxalsvy0e",
+                    "requestId": request_id or uuid.uuid4().hex,
                     "conferenceSolutionKey": {"type": "hangoutsMeet"},
                 }
             },
         }
+        if event_id:
+            event["id"] = event_id
 
         stdout_logger.info(f"Creating event for {self.username} by google calender...")
         try:
             # Create the event with Google Meet conference data
-            created_event = (
-                service.events()
-                .insert(calendarId="primary", body=event, conferenceDataVersion=1)
-                .execute()
-            )
+            with calendar_service(self) as service:
+                created_event = (
+                    service.events()
+                    .insert(calendarId="primary", body=event, conferenceDataVersion=1)
+                    .execute()
+                )
 
             return created_event
 
         except HttpError as error:
-            # Catch the HttpError
-            error_details = error.content.decode("utf-8")
-            stdout_logger.error(
-                f"Creating event for f{self.username} faild.{error_details}"
-            )
-            raise CustomValidationError(
+            if error.resp.status != 409 or not event_id:
+                raise self._calendar_event_error(error)
+
+        # Created by an earlier attempt
+        try:
+            with calendar_service(self) as service:
+                return (
+                    service.events()
+                    .get(calendarId="primary", eventId=event_id)
+                    .execute()
+                )
+        except HttpError as error:
+            raise self._calendar_event_error(error)
+
+    def _calendar_event_error(self, error):
+        """
+        The CustomValidationError of a google HttpError, rate limits and
+        server errors are SERVICE_UNAVAILABLE.
+        """
+        error_details = error.content.decode("utf-8")
+        stdout_logger.error(
+            f"Creating event for f{self.username} faild.{error_details}"
+        )
+        if error.resp.status == 429 or error.resp.status >= 500:
+            return CustomValidationError(
                 detail=error_details,
-                error_object=ErrorObject.BAD_REQUEST,
+                error_object=ErrorObject.SERVICE_UNAVAILABLE,
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
+        return CustomValidationError(
+            detail=error_details,
+            error_object=ErrorObject.BAD_REQUEST,
+        )
 
 
 class Instructor(models.Model):
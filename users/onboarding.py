@@ -0,0 +1,267 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from faculty.models import Department, Faculty
+from users.models import Instructor
+from users.principal import invalidate_principal
+from users.profile import invalidate_profiles
+from users.search import search_index
+from utils.api.response_cache import model_tag, purge_tags
+
+User = get_user_model()
+
+USER_FIELDS = ["email", "phone", "first_name", "last_name", "gender", "faculty"]
+INSTRUCTOR_FIELDS = ["department", "bio", "room_phone", "room_number", "rank"]
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+def given_fields(row, names):
+    """
+    The fields of `names` set in the row. A missing or blank column leaves
+    the field of an existing user as it is.
+    """
+    return {name: row[name] for name in names if row.get(name) not in (None, "")}
+
+
+def iter_rows(file, file_format):
+    """
+    Yield (line number, row dict) of a csv or jsonl file, one line at a time.
+    Lines that are not a json object give None.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+@dataclass
+class OnboardingReport:
+    created: int = 0
+    updated: int = 0
+    instructors: int = 0
+    # (line number, username, error)
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "instructors": self.instructors,
+            "errors": len(self.errors),
+        }
+
+
+@dataclass
+class OnboardingRow:
+    line: int
+    username: str
+    user_fields: dict
+    password: str = None
+    instructor_fields: dict = None
+    encoded_password: str = None
+
+
+class UserOnboarding:
+    """
+    Upsert users, and instructors, by username in batches: one query to find
+    the existing users of a batch, then a bulk_create and a bulk_update.
+    Passwords are hashed in a process pool. A batch that hits a unique
+    constraint is retried row by row, so only the bad rows fail.
+    """
+
+    def __init__(self, batch_size=1000, hash_workers=None):
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers
+        self.report = OnboardingReport()
+        self.faculties = {faculty.name: faculty for faculty in Faculty.objects.all()}
+        self.departments = {
+            department.name: department for department in Department.objects.all()
+        }
+        self.seen = set()
+
+    def run(self, rows):
+        # Django has to be set up in the workers when they are spawned
+        with ProcessPoolExecutor(self.hash_workers, initializer=django.setup) as pool:
+            batch = []
+            for line, row in rows:
+                onboarding_row = self.parse(line, row)
+                if onboarding_row is None:
+                    continue
+                batch.append(onboarding_row)
+                if len(batch) == self.batch_size:
+                    self.save_batch(batch, pool)
+                    batch = []
+            if batch:
+                self.save_batch(batch, pool)
+        return self.report
+
+    def error(self, line, username, message):
+        self.report.errors.append((line, username, message))
+
+    def parse(self, line, row):
+        if not isinstance(row, dict):
+            return self.error(line, "", "not a json object")
+        row = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in row.items()
+        }
+        username = row.get("username")
+        if not username:
+            return self.error(line, "", "username is required")
+        if username in self.seen:
+            return self.error(line, username, "duplicate username in the file")
+        if not row.get("email") and not row.get("phone"):
+            return self.error(line, username, "email or phone must be set")
+
+        user_fields = given_fields(row, USER_FIELDS)
+        if "email" in user_fields:
+            user_fields["email"] = User.objects.normalize_email(user_fields["email"])
+        if "gender" in user_fields:
+            genders = {str(gender): gender for gender, _ in User.GENDERS}
+            if str(user_fields["gender"]) not in genders:
+                return self.error(line, username, "unknown gender")
+            user_fields["gender"] = genders[str(user_fields["gender"])]
+        if "faculty" in user_fields:
+            if user_fields["faculty"] not in self.faculties:
+                return self.error(line, username, "unknown faculty")
+            user_fields["faculty"] = self.faculties[user_fields["faculty"]]
+
+        instructor_fields = None
+        if str(row.get("is_instructor") or "").lower() in TRUE_VALUES:
+            instructor_fields = given_fields(row, INSTRUCTOR_FIELDS)
+            if instructor_fields.get("department") not in self.departments:
+                return self.error(line, username, "unknown department")
+            instructor_fields["department"] = self.departments[
+                instructor_fields["department"]
+            ]
+            if "room_number" in instructor_fields:
+                room_number = instructor_fields["room_number"]
+                if not str(room_number).isdigit():
+                    return self.error(line, username, "room_number is not a number")
+                instructor_fields["room_number"] = int(room_number)
+
+        self.seen.add(username)
+        return OnboardingRow(
+            line=line,
+            username=username,
+            user_fields=user_fields,
+            password=row.get("password") or None,
+            instructor_fields=instructor_fields,
+        )
+
+    def save_batch(self, batch, pool):
+        passwords = pool.map(
+            make_password,
+            [row.password for row in batch],
+            chunksize=max(1, len(batch) // (4 * (self.hash_workers or 1))),
+        )
+        for row, encoded_password in zip(batch, passwords):
+            row.encoded_password = encoded_password
+
+        try:
+            self.save_rows(batch)
+        except IntegrityError:
+            for row in batch:
+                try:
+                    self.save_rows([row])
+                except IntegrityError as e:
+                    self.error(row.line, row.username, str(e))
+
+    @transaction.atomic
+    def save_rows(self, rows):
+        existing = User.objects.in_bulk(
+            [row.username for row in rows], field_name="username"
+        )
+        new_users = []
+        updated_users = []
+        for row in rows:
+            user = existing.get(row.username)
+            if user is None:
+                user = User(username=row.username, password=row.encoded_password)
+                new_users.append(user)
+            else:
+                updated_users.append(user)
+                if row.password:
+                    user.password = row.encoded_password
+            for name, value in row.user_fields.items():
+                setattr(user, name, value)
+
+        User.objects.bulk_create(new_users)
+        # Only the fields some row sets, the others keep what the users have
+        updated_fields = {
+            name
+            for row in rows
+            if row.username in existing
+            for name in row.user_fields
+        }
+        if any(row.password for row in rows if row.username in existing):
+            updated_fields.add("password")
+        if updated_fields:
+            User.objects.bulk_update(updated_users, sorted(updated_fields))
+        instructors = self.save_instructors(rows)
+        # bulk writes send no signals
+        search_index.update(user__username__in=[row.username for row in rows])
+        purge_tags(*[model_tag(User, user.pk) for user in updated_users])
+
+        self.report.created += len(new_users)
+        self.report.updated += len(updated_users)
+        self.report.instructors += instructors
+        updated_ids = [user.pk for user in updated_users]
+        transaction.on_commit(lambda: self.invalidate(updated_ids))
+
+    def save_instructors(self, rows):
+        rows = [row for row in rows if row.instructor_fields is not None]
+        if not rows:
+            return 0
+        # sqlite gives bulk_create no pks back, so read them again
+        users = User.objects.filter(username__in=[row.username for row in rows])
+        user_ids = dict(users.values_list("username", "id"))
+        existing = Instructor.objects.in_bulk(
+            list(user_ids.values()), field_name="user_id"
+        )
+        new_instructors = []
+        updated_instructors = []
+        for row in rows:
+            instructor = existing.get(user_ids[row.username])
+            if instructor is None:
+                instructor = Instructor(user_id=user_ids[row.username])
+                new_instructors.append(instructor)
+            else:
+                updated_instructors.append(instructor)
+            for name, value in row.instructor_fields.items():
+                setattr(instructor, name, value)
+
+        Instructor.objects.bulk_create(new_instructors)
+        updated_fields = {
+            name
+            for row in rows
+            if user_ids[row.username] in existing
+            for name in row.instructor_fields
+        }
+        if updated_fields:
+            Instructor.objects.bulk_update(updated_instructors, sorted(updated_fields))
+        purge_tags(
+            *[model_tag(Instructor, obj.pk) for obj in updated_instructors],
+            *{model_tag(Department, obj.department_id) for obj in new_instructors},
+        )
+        return len(rows)
+
+    def invalidate(self, user_ids):
+        for user_id in user_ids:
+            invalidate_principal(user_id)
+        invalidate_profiles(user_ids)
@@ -0,0 +1,101 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (check_password, get_hasher,
+                                         identify_hasher, make_password)
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPool as GeventThreadPool
+except ImportError:  # gevent is only installed where gunicorn runs with it
+    monkey = None
+    GeventThreadPool = None
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Every hashing thread is busy and the wait queue is full.
+    """
+
+
+def _gevent_patched():
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+class PasswordHasherPool:
+    """
+    A small pool of native threads for password hashing, so a login storm does
+    not stall the other requests of a gevent worker. PBKDF2 drops the GIL
+    while it runs, which is what lets a thread (rather than a process) keep
+    the hub free. At most `workers + queue_size` checks are in flight per
+    worker process, anything past that is rejected right away.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        # Under gevent this is a cooperative semaphore, as it should be
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self):
+        # Created lazily and again after a fork, gunicorn forks its workers
+        # from a master that may have imported this module already
+        if self._pool is None or self._pid != os.getpid():
+            if _gevent_patched():
+                self._pool = GeventThreadPool(maxsize=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+            self._pid = os.getpid()
+        return self._pool
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            if not settings.PASSWORD_HASHER_OFFLOAD:
+                return func(*args)
+            pool = self._get_pool()
+            if isinstance(pool, ThreadPoolExecutor):
+                return pool.submit(func, *args).result()
+            # Blocks only the calling greenlet
+            return pool.apply(func, args)
+        finally:
+            self._slots.release()
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASHER_WORKERS,
+    queue_size=settings.PASSWORD_HASHER_QUEUE_SIZE,
+)
+
+
+def _must_update(encoded):
+    preferred = get_hasher("default")
+    hasher = identify_hasher(encoded)
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def verify_password(user, raw_password):
+    """
+    Same as `user.check_password`, with the hashing done in the hasher pool.
+    Raises PasswordHasherBusy when the pool is saturated.
+
+    Hashes are upgraded to the preferred hasher here and not in the pool, the
+    pool threads must not touch the database connection of the request.
+    """
+    encoded = user.password
+    is_correct = password_hasher.run(check_password, raw_password, encoded)
+    if is_correct and _must_update(encoded):
+        try:
+            user.password = password_hasher.run(make_password, raw_password)
+        except PasswordHasherBusy:
+            # The upgrade can wait for the next login
+            return is_correct
+        user.save(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+PRINCIPAL_SALT = "users.principal"
+
+
+def _principal_key(user_id):
+    return f"principal:{user_id}"
+
+
+def build_principal(user):
+    """
+    The snapshot of a user that authentication and permissions need.
+    """
+    instructor = getattr(user, "instructor", None)
+    return {
+        "id": user.pk,
+        "is_active": user.is_active,
+        "instructor_id": instructor.id if instructor else None,
+        "department_id": instructor.department_id if instructor else None,
+    }
+
+
+def get_principal(user_id):
+    """
+    Return the principal snapshot of the user from the cache, loading it from
+    the database on a miss. None if the user does not exist.
+    """
+    key = _principal_key(user_id)
+    signed = cache.get(key)
+    if signed is not None:
+        try:
+            return signing.loads(signed, salt=PRINCIPAL_SALT)
+        except signing.BadSignature:
+            cache.delete(key)
+
+    User = get_user_model()
+    user = User.objects.select_related("instructor").filter(pk=user_id).first()
+    if user is None:
+        return None
+    principal = build_principal(user)
+    cache.set(
+        key,
+        signing.dumps(principal, salt=PRINCIPAL_SALT),
+        timeout=settings.PRINCIPAL_CACHE_TIMEOUT,
+    )
+    return principal
+
+
+def invalidate_principal(user_id):
+    cache.delete(_principal_key(user_id))
+
+
+def get_role_claims(user):
+    principal = build_principal(user)
+    return {
+        "is_instructor": principal["instructor_id"] is not None,
+        "instructor_id": principal["instructor_id"],
+        "department_id": principal["department_id"],
+    }
+
+
+class PrincipalUser(SimpleLazyObject):
+    """
+    request.user of token authenticated requests. The principal fields are
+    answered from the snapshot; anything else loads the real user, once.
+    """
+
+    def __init__(self, principal):
+        User = get_user_model()
+        self.__dict__["_principal"] = principal
+        super().__init__(
+            lambda: User.objects.select_related("instructor").get(pk=principal["id"])
+        )
+
+    # Both would load the user otherwise, e.g. `request.user and ...`
+    def __bool__(self):
+        return True
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    @property
+    def pk(self):
+        return self._principal["id"]
+
+    id = pk
+
+    @property
+    def is_active(self):
+        return self._principal["is_active"]
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    @property
+    def is_instructor(self):
+        return self._principal["instructor_id"] is not None
+
+    @property
+    def instructor_id(self):
+        return self._principal["instructor_id"]
+
+    @property
+    def department_id(self):
+        return self._principal["department_id"]
@@ -0,0 +1,54 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import quote_etag
+
+from users.api.v1.serializers import UserProfileSerializer
+
+# Everything the profile and login serializers read, in one query
+PROFILE_SELECT_RELATED = ["faculty", "instructor__department__faculty"]
+
+
+def _profile_key(user_id):
+    return f"profile:{user_id}"
+
+
+def build_profile(user):
+    """
+    The /auth/me document of the user and its ETag.
+    """
+    data = UserProfileSerializer(user).data
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return {
+        "data": json.loads(content),
+        "etag": quote_etag(hashlib.sha1(content.encode()).hexdigest()),
+    }
+
+
+def get_profile(user_id):
+    """
+    Return the cached profile document of the user, building it with a single
+    query on a miss. None if the user does not exist.
+    """
+    key = _profile_key(user_id)
+    profile = cache.get(key)
+    if profile is not None:
+        return profile
+
+    User = get_user_model()
+    user = (
+        User.objects.select_related(*PROFILE_SELECT_RELATED).filter(pk=user_id).first()
+    )
+    if user is None:
+        return None
+    profile = build_profile(user)
+    cache.set(key, profile, timeout=settings.PROFILE_CACHE_TIMEOUT)
+    return profile
+
+
+def invalidate_profiles(user_ids):
+    cache.delete_many([_profile_key(user_id) for user_id in user_ids])
@@ -0,0 +1,199 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+from users.models import Instructor
+
+SEARCH_TABLE = "users_instructor_search"
+INSTRUCTOR_TABLE = Instructor._meta.db_table
+
+# Only words are searched, anything else would be query syntax
+TERM_RE = re.compile(r"\w+")
+MAX_TERMS = 5
+
+
+class SqliteSearchIndex:
+    """
+    An FTS5 table with a row per instructor, the rowid is the instructor id.
+    The table is made by the users migrations.
+    """
+
+    def remove(self, cursor, instructor_ids):
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(instructor_id,) for instructor_id in instructor_ids],
+        )
+
+    def write(self, cursor, documents):
+        # FTS5 tables have no upsert
+        self.remove(cursor, [document[0] for document in documents])
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} "
+            "(rowid, first_name, last_name, department, academic_rank) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            documents,
+        )
+
+    def search(self, queryset, terms):
+        match = " ".join(f'"{term}"*' for term in terms)
+        # bm25 is lower for better matches, names weigh the most
+        rank = RawSQL(
+            f"-bm25({SEARCH_TABLE}, 10, 10, 4, 2)", [], output_field=FloatField()
+        )
+        return queryset.annotate(search_rank=rank).extra(
+            tables=[SEARCH_TABLE],
+            where=[
+                f"{SEARCH_TABLE} MATCH %s",
+                f"{SEARCH_TABLE}.rowid = {INSTRUCTOR_TABLE}.id",
+            ],
+            params=[match],
+        )
+
+
+class PostgresSearchIndex:
+    """
+    A table with the weighted search vector of each instructor under a GIN
+    index, and the full name under a trigram index for misspelled names.
+    The table is made by the users migrations.
+    """
+
+    def remove(self, cursor, instructor_ids):
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE instructor_id = ANY(%s)",
+            [list(instructor_ids)],
+        )
+
+    def write(self, cursor, documents):
+        rows = []
+        for instructor_id, first_name, last_name, department, rank in documents:
+            name = f"{first_name} {last_name}"
+            rows.append((instructor_id, name, department, rank, name))
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (instructor_id, document, name) VALUES "
+            "(%s, setweight(to_tsvector('simple', %s), 'A') "
+            "|| setweight(to_tsvector('simple', %s), 'B') "
+            "|| setweight(to_tsvector('simple', %s), 'C'), %s) "
+            "ON CONFLICT (instructor_id) DO UPDATE "
+            "SET document = EXCLUDED.document, name = EXCLUDED.name",
+            rows,
+        )
+
+    def search(self, queryset, terms):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        text = " ".join(terms)
+        # Both are real, widened so the rank a cursor stores as a python
+        # float compares equal to the one the database computes again
+        rank = RawSQL(
+            f"(ts_rank({SEARCH_TABLE}.document, to_tsquery('simple', %s)) "
+            f"+ similarity({SEARCH_TABLE}.name, %s))::double precision",
+            [tsquery, text],
+            output_field=FloatField(),
+        )
+        return queryset.annotate(search_rank=rank).extra(
+            tables=[SEARCH_TABLE],
+            where=[
+                f"{SEARCH_TABLE}.instructor_id = {INSTRUCTOR_TABLE}.id",
+                f"({SEARCH_TABLE}.document @@ to_tsquery('simple', %s) "
+                f"OR {SEARCH_TABLE}.name %% %s)",
+            ],
+            params=[tsquery, text],
+        )
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchIndex(),
+    "postgresql": PostgresSearchIndex(),
+}
+
+
+def get_backend(vendor=None):
+    return BACKENDS.get(vendor or connection.vendor)
+
+
+def iter_documents(instructors, batch_size=1000):
+    """
+    Yield batches of (id, first name, last name, department, rank) rows.
+    """
+    rows = instructors.values_list(
+        "id", "user__first_name", "user__last_name", "department__name", "rank"
+    ).order_by("id")
+    batch = []
+    for instructor_id, *fields in rows.iterator(chunk_size=batch_size):
+        batch.append((instructor_id, *(field or "" for field in fields)))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class InstructorSearchIndex:
+    """
+    The search index of instructors by name, department and rank. Writes go
+    with the transaction of the change that made them.
+    """
+
+    def update(self, **filters):
+        backend = get_backend()
+        if backend is None:
+            return
+        # One transaction, sqlite would commit every row on its own
+        with transaction.atomic(), connection.cursor() as cursor:
+            for documents in iter_documents(Instructor.objects.filter(**filters)):
+                backend.write(cursor, documents)
+
+    def remove(self, instructor_ids):
+        backend = get_backend()
+        if backend is None:
+            return
+        with connection.cursor() as cursor:
+            backend.remove(cursor, instructor_ids)
+
+    def search(self, queryset, query):
+        """
+        Filter the instructors of the queryset by the words of the query, as
+        prefixes, and order them by relevance.
+        """
+        terms = TERM_RE.findall(query.lower())[:MAX_TERMS]
+        if not terms:
+            return queryset
+        backend = get_backend()
+        if backend is not None:
+            return backend.search(queryset, terms).order_by("-search_rank", "id")
+        for term in terms:
+            queryset = queryset.filter(
+                Q(user__first_name__icontains=term)
+                | Q(user__last_name__icontains=term)
+                | Q(department__name__icontains=term)
+                | Q(rank__icontains=term)
+            )
+        return queryset
+
+
+search_index = InstructorSearchIndex()
+
+
+class InstructorSearchFilter(BaseFilterBackend):
+    """
+    `?q=` search of the instructors, ranked by relevance.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        return search_index.search(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Words of an instructor name, department or rank",
+                "schema": {"type": "string"},
+            }
+        ]
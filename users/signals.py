@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from faculty.models import Department, Faculty
+from users.models import Instructor
+from users.principal import invalidate_principal
+from users.profile import invalidate_profiles
+from users.search import search_index
+from utils.api.response_cache import model_tag, purge_tags
+
+User = get_user_model()
+
+SEARCHED_USER_FIELDS = {"first_name", "last_name"}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+    invalidate_profiles([instance.pk])
+
+
+@receiver(post_save, sender=Instructor)
+@receiver(post_delete, sender=Instructor)
+def invalidate_instructor_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.user_id)
+    invalidate_profiles([instance.user_id])
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_department_profiles(sender, instance, **kwargs):
+    instructors = Instructor.objects.filter(department=instance)
+    invalidate_profiles(instructors.values_list("user_id", flat=True))
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+def invalidate_faculty_profiles(sender, instance, **kwargs):
+    instructors = Instructor.objects.filter(department__faculty=instance)
+    invalidate_profiles(instructors.values_list("user_id", flat=True))
+
+
+@receiver(post_save, sender=User)
+def update_user_search_index(sender, instance, created, update_fields, **kwargs):
+    # A new user is not an instructor yet
+    if created or (update_fields and not SEARCHED_USER_FIELDS & update_fields):
+        return
+    search_index.update(user=instance)
+
+
+@receiver(post_save, sender=Instructor)
+def update_instructor_search_index(sender, instance, **kwargs):
+    search_index.update(id=instance.id)
+
+
+@receiver(post_delete, sender=Instructor)
+def remove_instructor_search_index(sender, instance, **kwargs):
+    search_index.remove([instance.id])
+
+
+@receiver(post_save, sender=Department)
+def update_department_search_index(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields and "name" not in update_fields):
+        return
+    search_index.update(department=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def purge_user_responses(sender, instance, **kwargs):
+    purge_tags(model_tag(User, instance.pk))
+
+
+@receiver(post_save, sender=Instructor)
+@receiver(post_delete, sender=Instructor)
+def purge_instructor_responses(sender, instance, **kwargs):
+    # The list of a department it leaves is tagged with the instructor
+    purge_tags(
+        model_tag(Instructor, instance.pk),
+        model_tag(Department, instance.department_id),
+    )
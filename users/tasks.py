@@ -1,64 +1,147 @@
-from datetime import timedelta
+import time
 
-from celery import shared_task
-from datetime import datetime, timedelta
+from celery import chain, chord, shared_task
+from celery.signals import worker_shutdown
 from django.conf import settings
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 
-from utils.loggers import stdout_logger
+from users.availability import update_instructors_availability
+from users.denylist import token_denylist
 from users.models import Instructor
+from users.writebehind import flush_last_logins, flush_outstanding_tokens
+from utils.loggers import stdout_logger
+
+MEETINGS_SWEEP_SUMMARY_KEY = "meetings-sweep:last-run"
+AUTH_WRITES_FLUSH_LOCK_KEY = "auth-writes:flush-lock"
+
+
+def _split_into_lanes(shards, lanes):
+    """
+    Deal the shards round robin into at most `lanes` lists.
+    """
+    return [shards[i::lanes] for i in range(min(lanes, len(shards)))]
+
+
+def _iter_instructor_shards(shard_size):
+    shard = []
+    instructor_ids = (
+        Instructor.objects.order_by("id")
+        .values_list("id", flat=True)
+        .iterator(chunk_size=shard_size)
+    )
+    for instructor_id in instructor_ids:
+        shard.append(instructor_id)
+        if len(shard) == shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
 
 
 @shared_task
 def check_instructors_meetings():
-    instructor_objs = Instructor.objects.all()
-
-    for instructor in instructor_objs:
-        user = instructor.user
-        try:
-            social_user = user.social_auth.filter(provider="google-oauth2").last()
-
-            credentials = Credentials(
-                token=social_user.extra_data["access_token"],
-                refresh_token=social_user.extra_data["refresh_token"],
-                client_id=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY,
-                client_secret=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET,
-                token_uri="https://oauth2.googleapis.com/token",
-            )
-
-            # Build Google Calendar API client
-            service = build("calendar", "v3", credentials=credentials)
-
-            now = datetime.utcnow()
-            one_hours_later = now + timedelta(hours=1)
-            time_min = now.isoformat() + "Z"
-            time_max = one_hours_later.isoformat() + "Z"
-
-            stdout_logger.info(f"Geting {user.username} events from google calender...")
-            try:
-                events_result = (
-                    service.events()
-                    .list(
-                        calendarId="primary",
-                        timeMin=time_min,  # From now (to exclude past events)
-                        timeMax=time_max,  # Until 1 hour from now
-                        singleEvents=True,
-                        orderBy="startTime",
-                    )
-                    .execute()
-                )
-            except HttpError as error:
-                # Catch the HttpError
-                error_details = error.content.decode("utf-8")
-                stdout_logger.error(f"Get f{user.username} faild.{error_details}")
-
-            events = events_result.get("items", [])
-            if len(events) > 0 and instructor.is_available_now:
-                instructor.is_available_now = False
-                instructor.save()
-
-        except Exception:
-            stdout_logger.error(f"Cred for f{user.username} not available!")
-            continue
+    """
+    Coordinator of the meetings sweep. Instructor ids are split into shards,
+    and the shards run as a chord of MEETINGS_SWEEP_CONCURRENCY chains, so at
+    most that many shards are in flight at once.
+    """
+    shards = list(_iter_instructor_shards(settings.MEETINGS_SWEEP_SHARD_SIZE))
+    if not shards:
+        return
+
+    lanes = [
+        chain(
+            check_instructors_meetings_shard.s([], lane[0]),
+            *[check_instructors_meetings_shard.s(shard) for shard in lane[1:]],
+        )
+        for lane in _split_into_lanes(shards, settings.MEETINGS_SWEEP_CONCURRENCY)
+    ]
+    chord(lanes)(summarize_instructors_meetings.s(time.time()))
+
+
+@shared_task
+def check_instructors_meetings_shard(previous_results, instructor_ids):
+    """
+    Update the availability of a shard of instructors. Returns the results of
+    the previous shards of the same lane plus this shard timing and counters.
+    """
+    started = time.monotonic()
+    shard_result = update_instructors_availability(instructor_ids)
+    shard_result["seconds"] = round(time.monotonic() - started, 3)
+    return previous_results + [shard_result]
+
+
+@shared_task
+def summarize_instructors_meetings(lane_results, started_at):
+    shard_results = [result for lane in lane_results for result in lane]
+    summary = {
+        "started_at": started_at,
+        "seconds": round(time.time() - started_at, 3),
+        "shards": shard_results,
+    }
+    for counter in ["instructors", "busy", "updated", "failed"]:
+        summary[counter] = sum(result[counter] for result in shard_results)
+
+    cache.set(MEETINGS_SWEEP_SUMMARY_KEY, summary, timeout=None)
+    stdout_logger.info(
+        f"Meetings sweep checked {summary['instructors']} instructors in "
+        f"{len(shard_results)} shards, {summary['seconds']}s."
+    )
+    return summary
+
+
+@shared_task
+def purge_expired_tokens():
+    """
+    Delete the expired outstanding tokens (and their blacklist rows) in
+    chunks, so the deletes never hold long locks, and prune the denylist log.
+    """
+    batch_size = settings.OUTSTANDING_TOKEN_PURGE_BATCH_SIZE
+    now = timezone.now()
+    deleted = 0
+    while True:
+        token_ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not token_ids:
+            break
+        OutstandingToken.objects.filter(id__in=token_ids).delete()
+        deleted += len(token_ids)
+
+    pruned = token_denylist.prune()
+    stdout_logger.info(
+        f"Purged {deleted} expired outstanding tokens and {pruned} denylist entries."
+    )
+    return {"tokens": deleted, "denylist": pruned}
+
+
+@shared_task
+def flush_auth_writes():
+    """
+    Write the buffered last_login updates and outstanding tokens to the
+    database in bulk.
+    """
+    if not cache.add(AUTH_WRITES_FLUSH_LOCK_KEY, 1, timeout=5 * 60):
+        return None
+    try:
+        summary = {
+            "last_logins": flush_last_logins(),
+            "outstanding_tokens": flush_outstanding_tokens(),
+        }
+    finally:
+        cache.delete(AUTH_WRITES_FLUSH_LOCK_KEY)
+    return summary
+
+
+@worker_shutdown.connect
+def drain_auth_writes(**kwargs):
+    # Whatever is still buffered is safe in redis, this only saves waiting
+    # for the first flush after the workers come back
+    try:
+        flush_auth_writes()
+    except Exception as e:
+        stdout_logger.error(f"Draining the auth writes faild: {e}")
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import RoleRefreshToken
+from users.factories import InstructorFactory, UserFactory
+from users.principal import _principal_key, get_principal
+
+
+class TestCachedPrincipalJWTAuthentication(APITestCase):
+    def setUp(self):
+        self.url = reverse("users:v1:check_google_auth")
+        self.instructor_obj = InstructorFactory()
+        self.user_obj = self.instructor_obj.user
+        cache.delete(_principal_key(self.user_obj.pk))
+
+    def authenticate(self, user_obj):
+        token = RoleRefreshToken.for_user(user_obj).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_token_has_role_claims(self):
+        token = AccessToken(str(RoleRefreshToken.for_user(self.user_obj).access_token))
+        self.assertTrue(token["is_instructor"])
+        self.assertEqual(token["instructor_id"], self.instructor_obj.id)
+        self.assertEqual(token["department_id"], self.instructor_obj.department_id)
+
+    def test_warm_principal_costs_no_queries(self):
+        self.authenticate(self.user_obj)
+        self.client.get(self.url)
+        # Only the view's own credential lookup is left
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_instructor_delete_invalidates_principal(self):
+        self.authenticate(self.user_obj)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.instructor_obj.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_inactive_user_fail(self):
+        self.authenticate(self.user_obj)
+        self.client.get(self.url)
+        self.user_obj.is_active = False
+        self.user_obj.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_tampered_principal_is_reloaded(self):
+        cache.set(_principal_key(self.user_obj.pk), "forged")
+        principal = get_principal(self.user_obj.pk)
+        self.assertEqual(principal["instructor_id"], self.instructor_obj.id)
+
+    def test_views_can_use_the_full_user(self):
+        user_obj = UserFactory()
+        self.authenticate(user_obj)
+        response = self.client.get(reverse("users:v1:user_profile"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["email"], user_obj.email)
+
+    def test_views_can_update_the_full_user(self):
+        self.authenticate(self.user_obj)
+        response = self.client.patch(
+            reverse("users:v1:user_profile"), {"first_name": "updated"}
+        )
+        self.assertEqual(response.status_code, 204)
+        self.user_obj.refresh_from_db()
+        self.assertEqual(self.user_obj.first_name, "updated")
@@ -0,0 +1,113 @@
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+import pytz
+from django.test import TestCase
+
+from eventcalendar.models import CalendarChannel, CalendarEvent, CalendarSync
+from schedule.factories import ScheduleFactory
+from schedule.models import Schedule
+from users.availability import get_day_of_week, update_instructors_availability
+from users.factories import InstructorFactory
+from users.models import Instructor
+
+# A Saturday morning in Tehran
+NOW = pytz.timezone("Asia/Tehran").localize(datetime(2024, 10, 5, 10, 30))
+
+
+class TestUpdateInstructorsAvailability(TestCase):
+    def setUp(self):
+        self.free = InstructorFactory(is_available_now=False)
+        self.google_busy = InstructorFactory(is_available_now=True)
+        self.in_class = InstructorFactory(is_available_now=True)
+        self.unknown = InstructorFactory(is_available_now=True)
+        self.watched = InstructorFactory(is_available_now=True)
+        ScheduleFactory(
+            instructor=self.in_class,
+            day_of_week=Schedule.DAY_SATURDAY,
+            start_time=time(10, 0),
+            end_time=time(12, 0),
+        )
+        CalendarChannel.objects.create(
+            instructor=self.watched,
+            channel_id="channel",
+            resource_id="resource",
+            token="token",
+            expiration=NOW + timedelta(days=1),
+        )
+        self.calendar_sync = CalendarSync.objects.create(
+            instructor=self.watched, synced_at=NOW
+        )
+        CalendarEvent.objects.create(
+            instructor=self.watched,
+            google_id="event",
+            start=NOW + timedelta(minutes=10),
+            end=NOW + timedelta(minutes=40),
+        )
+
+    def fake_busy(self, instructors, time_min, time_max):
+        busy = {
+            self.free.id: [],
+            self.google_busy.id: [{"start": time_min, "end": time_max}],
+            self.in_class.id: [],
+            self.unknown.id: None,
+        }
+        return {instructor.id: busy[instructor.id] for instructor in instructors}
+
+    def test_day_of_week(self):
+        self.assertEqual(get_day_of_week(NOW), Schedule.DAY_SATURDAY)
+        self.assertEqual(
+            get_day_of_week(NOW + timedelta(days=2)), Schedule.DAY_MONDAY
+        )
+
+    def test_availability_is_merged_and_saved_in_bulk(self):
+        with mock.patch(
+            "users.availability.get_instructors_busy", side_effect=self.fake_busy
+        ) as get_instructors_busy:
+            result = update_instructors_availability(
+                Instructor.objects.values_list("id", flat=True), now=NOW
+            )
+
+        # The watched instructor is answered from the local store
+        self.assertNotIn(
+            self.watched.id, [i.id for i in get_instructors_busy.call_args[0][0]]
+        )
+        availability = dict(
+            Instructor.objects.values_list("id", "is_available_now")
+        )
+        self.assertEqual(availability[self.free.id], True)
+        self.assertEqual(availability[self.google_busy.id], False)
+        self.assertEqual(availability[self.in_class.id], False)
+        self.assertEqual(availability[self.unknown.id], True)
+        self.assertEqual(availability[self.watched.id], False)
+        self.assertEqual(
+            result, {"instructors": 5, "busy": 3, "updated": 4, "failed": 1}
+        )
+
+    def test_watched_but_never_synced_asks_google(self):
+        self.calendar_sync.synced_at = None
+        self.calendar_sync.save()
+
+        with mock.patch(
+            "users.availability.get_instructors_busy",
+            return_value={self.watched.id: []},
+        ) as get_instructors_busy:
+            update_instructors_availability([self.watched.id], now=NOW)
+
+        self.assertEqual(
+            [i.id for i in get_instructors_busy.call_args[0][0]], [self.watched.id]
+        )
+
+    def test_instructors_without_google_follow_their_schedules(self):
+        result = update_instructors_availability(
+            [self.free.id, self.in_class.id], now=NOW
+        )
+
+        availability = dict(
+            Instructor.objects.values_list("id", "is_available_now")
+        )
+        self.assertEqual(availability[self.free.id], True)
+        self.assertEqual(availability[self.in_class.id], False)
+        self.assertEqual(
+            result, {"instructors": 2, "busy": 1, "updated": 2, "failed": 0}
+        )
@@ -0,0 +1,133 @@
+import io
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import (BlacklistedToken,
+                                                             OutstandingToken)
+
+from users.authentication import RoleRefreshToken
+from users.denylist import BloomFilter, TokenDenylist, token_denylist
+from users.factories import UserFactory
+from users.tasks import purge_expired_tokens
+from utils.api.error_objects import ErrorObject
+
+
+class TestBloomFilter(TestCase):
+    def test_membership(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        added = [uuid.uuid4().hex for _ in range(1000)]
+        for item in added:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in added))
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(1000))
+        self.assertLess(false_positives, 50)
+
+
+class TestTokenDenylist(TestCase):
+    def test_load_command_copies_blacklisted_tokens(self):
+        user = UserFactory()
+        live = OutstandingToken.objects.create(
+            user=user,
+            jti=uuid.uuid4().hex,
+            token="live",
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        expired = OutstandingToken.objects.create(
+            user=user,
+            jti=uuid.uuid4().hex,
+            token="expired",
+            expires_at=timezone.now() - timedelta(days=1),
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token=live), BlacklistedToken(token=expired)]
+        )
+
+        call_command("load_token_denylist", stdout=io.StringIO())
+
+        self.assertTrue(token_denylist.contains(live.jti))
+        self.assertFalse(token_denylist.contains(expired.jti))
+
+    def test_add_is_atomic(self):
+        jti = uuid.uuid4().hex
+        exp = time.time() + 60
+
+        self.assertFalse(token_denylist.contains(jti))
+        self.assertTrue(token_denylist.add(jti, exp))
+        self.assertFalse(token_denylist.add(jti, exp))
+        self.assertTrue(token_denylist.contains(jti))
+
+    def test_other_process_catches_up(self):
+        other = TokenDenylist()
+        other.sync()
+        jti = uuid.uuid4().hex
+
+        token_denylist.add(jti, time.time() + 60)
+
+        # Stale until its next sync, but it can not deny the token again
+        self.assertFalse(other.contains(jti))
+        self.assertFalse(other.add(jti, time.time() + 60))
+        other.synced_at -= 60
+        self.assertTrue(other.contains(jti))
+
+
+class TestRefreshTokenDenylist(APITestCase):
+    def setUp(self):
+        self.refresh_url = reverse("users:v1:token_refresh")
+        self.logout_url = reverse("users:v1:logout")
+        self.refresh = RoleRefreshToken.for_user(UserFactory())
+
+    def test_rotated_token_is_denied(self):
+        response = self.client.post(self.refresh_url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("refresh", response.json()["data"])
+
+        response = self.client.post(self.refresh_url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, 406)
+        self.assertEqual(
+            response.json()["error"]["code"], ErrorObject.INVALID_TOKEN["code"]
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_logged_out_token_is_denied(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+        response = self.client.post(self.logout_url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(self.refresh_url, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, 406)
+
+
+class TestPurgeExpiredTokens(TestCase):
+    def test_purges_expired_tokens_in_batches(self):
+        user = UserFactory()
+        now = timezone.now()
+        OutstandingToken.objects.bulk_create(
+            [
+                OutstandingToken(
+                    user=user,
+                    jti=uuid.uuid4().hex,
+                    token="token",
+                    expires_at=now + timedelta(days=1 if index < 2 else -1),
+                )
+                for index in range(7)
+            ]
+        )
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.filter(expires_at__lte=now).first()
+        )
+
+        with self.settings(OUTSTANDING_TOKEN_PURGE_BATCH_SIZE=2):
+            summary = purge_expired_tokens()
+
+        self.assertEqual(summary["tokens"], 5)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertFalse(BlacklistedToken.objects.exists())
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from faculty.factories import DepartmentFactory
+from users.factories import InstructorFactory, UserFactory
+from users.models import Instructor, User
+from users.onboarding import UserOnboarding, iter_rows
+
+
+class TestUserOnboarding(TestCase):
+    def setUp(self):
+        self.department = DepartmentFactory(name="computer")
+
+    def run_onboarding(self, rows, batch_size=2):
+        onboarding = UserOnboarding(batch_size=batch_size, hash_workers=1)
+        return onboarding.run(enumerate(rows, start=2))
+
+    def test_creates_users_and_instructors(self):
+        report = self.run_onboarding(
+            [
+                {"username": "ali", "email": "ali@didar.com", "password": "pass-1"},
+                {"username": "sara", "phone": "+989120000001", "gender": "2"},
+                {
+                    "username": "reza",
+                    "email": "reza@didar.com",
+                    "is_instructor": "true",
+                    "department": "computer",
+                    "room_number": "12",
+                },
+            ]
+        )
+
+        self.assertEqual(report.as_dict()["created"], 3)
+        self.assertEqual(report.errors, [])
+        self.assertTrue(User.objects.get(username="ali").check_password("pass-1"))
+        self.assertFalse(User.objects.get(username="sara").has_usable_password())
+        instructor = Instructor.objects.get(user__username="reza")
+        self.assertEqual(instructor.department, self.department)
+        self.assertEqual(instructor.room_number, 12)
+
+    def test_updates_existing_users(self):
+        instructor = InstructorFactory(user=UserFactory(password="old-pass"))
+        username = instructor.user.username
+
+        report = self.run_onboarding(
+            [
+                {
+                    "username": username,
+                    "email": "new@didar.com",
+                    "first_name": "new",
+                    "is_instructor": "1",
+                    "department": "computer",
+                    "rank": "professor",
+                }
+            ]
+        )
+
+        self.assertEqual(report.as_dict()["updated"], 1)
+        user = User.objects.get(username=username)
+        self.assertEqual(user.first_name, "new")
+        self.assertTrue(user.check_password("old-pass"))
+        instructor.refresh_from_db()
+        self.assertEqual(instructor.rank, "professor")
+        self.assertEqual(instructor.department, self.department)
+
+    def test_partial_rows_keep_the_other_fields(self):
+        instructor = InstructorFactory(
+            department=self.department, bio="bio", room_number=12, rank="professor"
+        )
+        user = instructor.user
+        other = UserFactory(first_name="other")
+
+        report = self.run_onboarding(
+            [
+                # No email and a blank last name
+                {
+                    "username": user.username,
+                    "phone": user.phone,
+                    "first_name": "new",
+                    "last_name": "",
+                    "is_instructor": "1",
+                    "department": "computer",
+                    "bio": "",
+                },
+                {"username": other.username, "email": other.email},
+            ]
+        )
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.as_dict()["updated"], 2)
+        updated = User.objects.get(pk=user.pk)
+        self.assertEqual(updated.first_name, "new")
+        self.assertEqual(updated.last_name, user.last_name)
+        self.assertEqual(updated.email, user.email)
+        self.assertEqual(User.objects.get(pk=other.pk).first_name, "other")
+        instructor.refresh_from_db()
+        self.assertEqual(instructor.bio, "bio")
+        self.assertEqual(instructor.room_number, 12)
+        self.assertEqual(instructor.rank, "professor")
+
+    def test_reports_bad_rows(self):
+        UserFactory(email="taken@didar.com")
+
+        report = self.run_onboarding(
+            [
+                {"username": "", "email": "a@didar.com"},
+                {"username": "no-contact"},
+                {"username": "ok", "email": "ok@didar.com"},
+                {"username": "ok", "email": "ok2@didar.com"},
+                {"username": "taken", "email": "taken@didar.com"},
+                {"username": "teacher", "email": "t@didar.com", "is_instructor": "1"},
+            ]
+        )
+
+        self.assertEqual(report.as_dict()["created"], 1)
+        self.assertEqual(
+            [(line, username) for line, username, _ in report.errors],
+            [(2, ""), (3, "no-contact"), (5, "ok"), (6, "taken"), (7, "teacher")],
+        )
+        self.assertTrue(User.objects.filter(username="ok").exists())
+        self.assertFalse(User.objects.filter(username="taken").exists())
+
+
+class TestOnboardUsersCommand(TestCase):
+    def test_imports_jsonl_and_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.jsonl")
+            report_path = os.path.join(directory, "report.csv")
+            with open(path, "w") as file:
+                file.write(json.dumps({"username": "u1", "email": "u1@didar.com"}))
+                file.write("\nnot json\n")
+
+            call_command(
+                "onboard_users",
+                path,
+                "--hash-workers=1",
+                f"--report={report_path}",
+                stdout=io.StringIO(),
+            )
+
+            with open(report_path) as file:
+                rows = list(csv.reader(file))
+
+        self.assertTrue(User.objects.filter(username="u1").exists())
+        self.assertEqual(
+            rows, [["line", "username", "error"], ["2", "", "not a json object"]]
+        )
+
+    def test_iter_csv_rows(self):
+        file = io.StringIO("username,email\nali,ali@didar.com\n")
+
+        self.assertEqual(
+            list(iter_rows(file, "csv")),
+            [(2, {"username": "ali", "email": "ali@didar.com"})],
+        )
@@ -0,0 +1,82 @@
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from users.factories import UserFactory
+from users.passwords import (PasswordHasherBusy, PasswordHasherPool,
+                             verify_password)
+from utils.api.error_objects import ErrorObject
+
+
+class TestPasswordHasherPool(TestCase):
+    def test_runs_in_pool_thread(self):
+        pool = PasswordHasherPool(workers=1, queue_size=0)
+
+        thread_name = pool.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(thread_name.startswith("password-hasher"))
+
+    def test_rejects_when_saturated(self):
+        pool = PasswordHasherPool(workers=1, queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            started.set()
+            release.wait(5)
+
+        holders = [threading.Thread(target=pool.run, args=(hold,)) for _ in range(2)]
+        for holder in holders:
+            holder.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                pool.run(lambda: None)
+        finally:
+            release.set()
+            for holder in holders:
+                holder.join()
+
+        self.assertEqual(pool.run(lambda: "free"), "free")
+
+
+class TestVerifyPassword(TestCase):
+    def test_checks_password(self):
+        user = UserFactory(password="secret-pass")
+
+        self.assertTrue(verify_password(user, "secret-pass"))
+        self.assertFalse(verify_password(user, "wrong-pass"))
+
+    def test_upgrades_outdated_hash(self):
+        user = UserFactory()
+        hasher = PBKDF2PasswordHasher()
+        user.password = hasher.encode("secret-pass", hasher.salt(), iterations=1000)
+        user.save()
+
+        self.assertTrue(verify_password(user, "secret-pass"))
+
+        user.refresh_from_db()
+        self.assertEqual(hasher.decode(user.password)["iterations"], hasher.iterations)
+
+
+class TestLoginPasswordHasherBusy(APITestCase):
+    def test_login_rejected_when_hasher_busy(self):
+        user = UserFactory(password="secret-pass")
+
+        with patch(
+            "users.passwords.password_hasher.run", side_effect=PasswordHasherBusy
+        ):
+            response = self.client.post(
+                reverse("users:v1:login_password"),
+                {"username": user.username, "password": "secret-pass"},
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(
+            response.json()["error"]["code"], ErrorObject.SERVICE_UNAVAILABLE["code"]
+        )
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.availability import update_instructors_availability
+from users.factories import InstructorFactory, UserFactory
+from users.profile import get_profile, invalidate_profiles
+
+
+class TestProfileCache(TestCase):
+    def setUp(self):
+        self.instructor = InstructorFactory()
+        self.user_id = self.instructor.user_id
+
+    def test_built_with_one_query(self):
+        invalidate_profiles([self.user_id])
+
+        with self.assertNumQueries(1):
+            profile = get_profile(self.user_id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_profile(self.user_id), profile)
+
+        department = profile["data"]["instructor"]["department"]
+        self.assertEqual(department["id"], self.instructor.department_id)
+        self.assertEqual(
+            department["faculty"]["id"], self.instructor.department.faculty_id
+        )
+
+    def test_invalidated_on_related_changes(self):
+        etag = get_profile(self.user_id)["etag"]
+
+        self.instructor.bio = "new bio"
+        self.instructor.save()
+        profile = get_profile(self.user_id)
+        self.assertEqual(profile["data"]["instructor"]["bio"], "new bio")
+        self.assertNotEqual(profile["etag"], etag)
+
+        faculty = self.instructor.department.faculty
+        faculty.name = "renamed-faculty"
+        faculty.save()
+        profile = get_profile(self.user_id)
+        self.assertEqual(
+            profile["data"]["instructor"]["department"]["faculty"]["name"],
+            "renamed-faculty",
+        )
+
+    def test_invalidated_on_availability_update(self):
+        get_profile(self.user_id)
+
+        with patch(
+            "users.availability.compute_availability",
+            return_value={self.instructor.id: True},
+        ):
+            update_instructors_availability([self.instructor.id])
+
+        profile = get_profile(self.user_id)
+        self.assertTrue(profile["data"]["instructor"]["is_available_now"])
+
+
+class TestUserProfileETag(APITestCase):
+    def setUp(self):
+        self.url = reverse("users:v1:user_profile")
+        self.user_obj = UserFactory()
+        access_token = RefreshToken.for_user(self.user_obj).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_modified_after_update(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.client.patch(self.url, {"first_name": "changed"})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["first_name"], "changed")
+
+
+class TestLoginQueries(APITestCase):
+    def test_login_reads_the_user_once(self):
+        instructor = InstructorFactory(user=UserFactory(password="secret-pass"))
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                reverse("users:v1:login_password"),
+                {"username": instructor.user.username, "password": "secret-pass"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["is_instructor"])
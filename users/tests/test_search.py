@@ -0,0 +1,113 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from faculty.factories import DepartmentFactory
+from users.factories import InstructorFactory, UserFactory
+from users.models import Instructor
+from users.onboarding import UserOnboarding
+from users.search import search_index
+
+
+class TestInstructorSearchIndex(TestCase):
+    def setUp(self):
+        self.computer = DepartmentFactory(name="computer engineering")
+        self.physics = DepartmentFactory(name="physics")
+        self.ali = InstructorFactory(
+            user=UserFactory(first_name="Ali", last_name="Rezaei"),
+            department=self.physics,
+            rank="assistant professor",
+        )
+        self.sara = InstructorFactory(
+            user=UserFactory(first_name="Sara", last_name="Alavi"),
+            department=self.computer,
+            rank="professor",
+        )
+
+    def search(self, query):
+        return list(search_index.search(Instructor.objects.all(), query))
+
+    def test_matches_word_prefixes(self):
+        self.assertEqual(self.search("rez"), [self.ali])
+        self.assertEqual(self.search("comp eng"), [self.sara])
+        self.assertEqual(self.search("assistant"), [self.ali])
+        self.assertEqual(self.search("phys ali"), [self.ali])
+        self.assertEqual(self.search("chemistry"), [])
+
+    def test_names_rank_first(self):
+        omid = InstructorFactory(
+            user=UserFactory(first_name="Omid", last_name="Karimi"),
+            department=DepartmentFactory(name="sara institute"),
+        )
+
+        results = self.search("sara")
+
+        self.assertEqual(results, [self.sara, omid])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_query_syntax_is_ignored(self):
+        self.assertEqual(self.search('"sara*) ('), [self.sara])
+        self.assertEqual(len(self.search("!!")), 2)
+
+    def test_follows_changes(self):
+        user = self.ali.user
+        user.last_name = "Karimi"
+        user.save()
+        self.physics.name = "chemistry"
+        self.physics.save()
+
+        self.assertEqual(self.search("karimi chem"), [self.ali])
+        self.assertEqual(self.search("rezaei"), [])
+
+        self.sara.delete()
+        self.assertEqual(self.search("sara"), [])
+
+    def test_onboarded_instructors_are_indexed(self):
+        onboarding = UserOnboarding(batch_size=10, hash_workers=1)
+        onboarding.run(
+            [
+                (
+                    2,
+                    {
+                        "username": "bahram",
+                        "email": "bahram@didar.com",
+                        "first_name": "Bahram",
+                        "is_instructor": "1",
+                        "department": "physics",
+                    },
+                )
+            ]
+        )
+
+        self.assertEqual(
+            [instructor.user.username for instructor in self.search("bahram")],
+            ["bahram"],
+        )
+
+
+class TestInstructorListSearch(APITestCase):
+    def setUp(self):
+        self.url = reverse("faculty:v1:instructors")
+        self.client.force_login(UserFactory())
+        self.department = DepartmentFactory(name="mathematics")
+        self.instructor = InstructorFactory(
+            user=UserFactory(first_name="Maryam", last_name="Mirzakhani"),
+            department=self.department,
+        )
+        self.other = InstructorFactory(
+            user=UserFactory(first_name="Omar", last_name="Khayyam")
+        )
+
+    def test_search(self):
+        response = self.client.get(self.url, {"q": "maryam"})
+
+        results = response.json()["data"]["results"]
+        self.assertEqual([result["id"] for result in results], [self.instructor.id])
+        self.assertEqual(results[0]["name"], "Maryam Mirzakhani")
+
+    def test_search_with_filters(self):
+        response = self.client.get(
+            self.url, {"q": "mirza", "department": self.other.department_id}
+        )
+
+        self.assertEqual(response.json()["data"]["results"], [])
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from users.factories import InstructorFactory
+from users.tasks import (_iter_instructor_shards, _split_into_lanes,
+                         check_instructors_meetings,
+                         check_instructors_meetings_shard,
+                         summarize_instructors_meetings)
+
+
+class TestInstructorsMeetingsSweep(TestCase):
+    def setUp(self):
+        self.instructors = InstructorFactory.create_batch(5)
+
+    def test_shards_cover_all_instructors(self):
+        shards = list(_iter_instructor_shards(2))
+        self.assertEqual([len(shard) for shard in shards], [2, 2, 1])
+        self.assertEqual(
+            sorted(sum(shards, [])), sorted(i.id for i in self.instructors)
+        )
+
+    def test_lanes_cap_concurrency(self):
+        lanes = _split_into_lanes([[1], [2], [3], [4], [5]], 2)
+        self.assertEqual(lanes, [[[1], [3], [5]], [[2], [4]]])
+
+    @override_settings(MEETINGS_SWEEP_SHARD_SIZE=2, MEETINGS_SWEEP_CONCURRENCY=2)
+    def test_coordinator_dispatches_capped_chord(self):
+        with mock.patch("users.tasks.chord") as chord:
+            check_instructors_meetings()
+        lanes = chord.call_args[0][0]
+        self.assertEqual(len(lanes), 2)
+
+    @mock.patch("users.availability.get_instructors_busy")
+    def test_shard_reports_counters_and_timing(self, get_instructors_busy):
+        get_instructors_busy.side_effect = lambda instructors, *args: {
+            instructor.id: [] for instructor in instructors
+        }
+        results = check_instructors_meetings_shard(
+            [{"instructors": 1}], [instructor.id for instructor in self.instructors]
+        )
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1]["instructors"], 5)
+        self.assertEqual(results[1]["updated"], 5)
+        self.assertIn("seconds", results[1])
+
+    def test_summary_aggregates_shards(self):
+        shard = {"instructors": 2, "busy": 1, "updated": 1, "failed": 0, "seconds": 1}
+        summary = summarize_instructors_meetings(
+            [[shard, shard], [shard]], timezone.now().timestamp()
+        )
+        self.assertEqual(summary["instructors"], 6)
+        self.assertEqual(len(summary["shards"]), 3)
@@ -1,6 +1,10 @@
 from django.urls import resolve, reverse
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
+from social_django.models import UserSocialAuth
+
+from eventcalendar.clients import GOOGLE_PROVIDER
+from eventcalendar.models import GoogleCredentialStatus
 
 from users.api.v1.views import (InstructorProfileAPIView, LoginPasswordAPIView,
                                 LogOutAPIView, UserProfileAPIView)
@@ -241,3 +245,36 @@ class TestInstructorProfileAPIView(APITestCase):
         self.assertEqual(resolver.func.view_class, InstructorProfileAPIView)
         self.assertEqual(resolver.namespace, "users:v1")
         self.assertEqual(resolver.url_name, "instructor_profile")
+
+
+class TestCheckGoogleAuthAPIView(APITestCase):
+    def setUp(self):
+        self.url = reverse("users:v1:check_google_auth")
+        self.instructor_obj = InstructorFactory()
+        self.client.force_authenticate(user=self.instructor_obj.user)
+
+    def create_social_user(self):
+        UserSocialAuth.objects.create(
+            user=self.instructor_obj.user,
+            provider=GOOGLE_PROVIDER,
+            uid=self.instructor_obj.user.email,
+            extra_data={"access_token": "access", "refresh_token": "refresh"},
+        )
+
+    def test_valid_credential(self):
+        self.create_social_user()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["google_credential_exist"])
+
+    def test_invalid_credential(self):
+        self.create_social_user()
+        GoogleCredentialStatus.objects.update(is_valid=False)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["data"]["google_credential_exist"])
+
+    def test_no_credential(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["data"]["google_credential_exist"])
@@ -0,0 +1,78 @@
+from django.test import TestCase
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from users.authentication import RoleRefreshToken
+from users.factories import UserFactory
+from users.tasks import flush_auth_writes
+from users.writebehind import (FLUSHING_SUFFIX, LAST_LOGIN_KEY,
+                               OUTSTANDING_TOKENS_KEY, record_login)
+
+
+class WriteBehindTestMixin:
+    def setUp(self):
+        self.redis = get_redis_connection("default")
+        for key in [LAST_LOGIN_KEY, OUTSTANDING_TOKENS_KEY]:
+            self.redis.delete(key, key + FLUSHING_SUFFIX)
+
+
+class TestLoginWriteBehind(WriteBehindTestMixin, APITestCase):
+    def test_login_writes_are_buffered(self):
+        user = UserFactory(password="secret-pass")
+
+        response = self.client.post(
+            reverse("users:v1:login_password"),
+            {"username": user.username, "password": "secret-pass"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertIsNone(user.last_login)
+        self.assertFalse(OutstandingToken.objects.exists())
+
+        summary = flush_auth_writes()
+
+        self.assertEqual(summary, {"last_logins": 1, "outstanding_tokens": 1})
+        user.refresh_from_db()
+        self.assertIsNotNone(user.last_login)
+        token = OutstandingToken.objects.get()
+        self.assertEqual(token.user, user)
+        self.assertEqual(token.token, response.json()["data"]["refresh"])
+
+
+class TestFlushAuthWrites(WriteBehindTestMixin, TestCase):
+    def test_flushes_in_batches(self):
+        users = [UserFactory() for _ in range(3)]
+        for user in users:
+            record_login(user)
+            RoleRefreshToken.for_user(user)
+            RoleRefreshToken.for_user(user)
+
+        with self.settings(AUTH_WRITE_BEHIND_BATCH_SIZE=2):
+            summary = flush_auth_writes()
+
+        self.assertEqual(summary, {"last_logins": 3, "outstanding_tokens": 6})
+        self.assertEqual(OutstandingToken.objects.count(), 6)
+        self.assertFalse(self.redis.exists(LAST_LOGIN_KEY, OUTSTANDING_TOKENS_KEY))
+
+    def test_resumes_interrupted_flush(self):
+        user = UserFactory()
+        RoleRefreshToken.for_user(user)
+        # A flush that died after taking the buffer
+        self.redis.rename(
+            OUTSTANDING_TOKENS_KEY, OUTSTANDING_TOKENS_KEY + FLUSHING_SUFFIX
+        )
+        RoleRefreshToken.for_user(user)
+
+        self.assertEqual(flush_auth_writes()["outstanding_tokens"], 1)
+        self.assertEqual(flush_auth_writes()["outstanding_tokens"], 1)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+
+    def test_skips_deleted_users(self):
+        user = UserFactory()
+        RoleRefreshToken.for_user(user)
+        user.delete()
+
+        self.assertEqual(flush_auth_writes()["outstanding_tokens"], 0)
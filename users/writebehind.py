@@ -0,0 +1,130 @@
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+User = get_user_model()
+
+# Buffered auth bookkeeping writes, flushed by users.tasks.flush_auth_writes.
+# A flush renames a buffer to its :flushing key before reading it and deletes
+# that key only after the database writes, so a flush that dies half way is
+# picked up again by the next one.
+LAST_LOGIN_KEY = "auth-writes:last-login"
+OUTSTANDING_TOKENS_KEY = "auth-writes:outstanding-tokens"
+FLUSHING_SUFFIX = ":flushing"
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def record_login(user):
+    """
+    Buffer the last_login update of a login, later logins of the same user
+    overwrite it before it is flushed.
+    """
+    if not api_settings.UPDATE_LAST_LOGIN:
+        return
+    _redis().hset(LAST_LOGIN_KEY, user.pk, time.time())
+
+
+def record_outstanding_token(user, token):
+    _redis().rpush(
+        OUTSTANDING_TOKENS_KEY,
+        json.dumps(
+            {
+                "user_id": user.pk,
+                "jti": token[api_settings.JTI_CLAIM],
+                "token": str(token),
+                "created_at": token["iat"],
+                "expires_at": token["exp"],
+            }
+        ),
+    )
+
+
+def _take(key):
+    """
+    Move the buffer to its flushing key, unless a failed flush left one there.
+    Returns the flushing key, or None when there is nothing to flush.
+    """
+    redis = _redis()
+    flushing_key = key + FLUSHING_SUFFIX
+    if redis.exists(flushing_key):
+        return flushing_key
+    if not redis.exists(key):
+        return None
+    # RENAME is atomic, writes racing with it land in a new buffer
+    redis.rename(key, flushing_key)
+    return flushing_key
+
+
+def flush_last_logins():
+    flushing_key = _take(LAST_LOGIN_KEY)
+    if flushing_key is None:
+        return 0
+
+    redis = _redis()
+    last_logins = {
+        int(user_id): datetime_from_epoch(float(timestamp))
+        for user_id, timestamp in redis.hgetall(flushing_key).items()
+    }
+    user_objs = list(User.objects.filter(id__in=last_logins).only("id"))
+    for user_obj in user_objs:
+        user_obj.last_login = last_logins[user_obj.id]
+    User.objects.bulk_update(
+        user_objs,
+        ["last_login"],
+        batch_size=settings.AUTH_WRITE_BEHIND_BATCH_SIZE,
+    )
+    redis.delete(flushing_key)
+    return len(user_objs)
+
+
+def flush_outstanding_tokens():
+    flushing_key = _take(OUTSTANDING_TOKENS_KEY)
+    if flushing_key is None:
+        return 0
+
+    redis = _redis()
+    batch_size = settings.AUTH_WRITE_BEHIND_BATCH_SIZE
+    created = 0
+    start = 0
+    while True:
+        entries = [
+            json.loads(entry)
+            for entry in redis.lrange(flushing_key, start, start + batch_size - 1)
+        ]
+        if not entries:
+            break
+        # Users deleted since their login have no token to keep
+        user_ids = set(
+            User.objects.filter(
+                id__in={entry["user_id"] for entry in entries}
+            ).values_list("id", flat=True)
+        )
+        tokens = [
+            OutstandingToken(
+                user_id=entry["user_id"],
+                jti=entry["jti"],
+                token=entry["token"],
+                created_at=datetime_from_epoch(entry["created_at"]),
+                expires_at=datetime_from_epoch(entry["expires_at"]),
+            )
+            for entry in entries
+            if entry["user_id"] in user_ids
+            and datetime_from_epoch(entry["expires_at"]) > timezone.now()
+        ]
+        # A retried flush writes the same jtis again
+        OutstandingToken.objects.bulk_create(tokens, ignore_conflicts=True)
+        created += len(tokens)
+        start += batch_size
+
+    redis.delete(flushing_key)
+    return created
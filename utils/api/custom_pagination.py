@@ -1,13 +1,32 @@
+import base64
+import datetime
+import json
 from collections import OrderedDict
+from functools import reduce
 
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 from utils.api.responses import success_response
 
 
-class CustomLimitOffsetPagination(LimitOffsetPagination):
-    max_limit = 50
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Keep the microseconds DjangoJSONEncoder drops, a position has to be
+        # exactly the value of its row
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class SuccessResponsePaginationMixin:
     available_filters = {}
 
     def get_available_filters(self):
@@ -27,7 +46,7 @@ class CustomLimitOffsetPagination(LimitOffsetPagination):
             status_code=status.HTTP_200_OK,
         )
 
-    def get_paginated_response_schema(self, schema):
+    def get_envelope_schema(self, schema, next_example, previous_example):
         return {
             "type": "object",
             "properties": {
@@ -39,19 +58,13 @@ class CustomLimitOffsetPagination(LimitOffsetPagination):
                     "type": "string",
                     "nullable": True,
                     "format": "uri",
-                    "example": "http://api.example.org/accounts/?{offset_param}=400&{limit_param}=100".format(
-                        offset_param=self.offset_query_param,
-                        limit_param=self.limit_query_param,
-                    ),
+                    "example": next_example,
                 },
                 "previous": {
                     "type": "string",
                     "nullable": True,
                     "format": "uri",
-                    "example": "http://api.example.org/accounts/?{offset_param}=200&{limit_param}=100".format(
-                        offset_param=self.offset_query_param,
-                        limit_param=self.limit_query_param,
-                    ),
+                    "example": previous_example,
                 },
                 "results": schema,
                 "available_filters": {
@@ -61,3 +74,255 @@ class CustomLimitOffsetPagination(LimitOffsetPagination):
                 },
             },
         }
+
+
+class CustomLimitOffsetPagination(
+    SuccessResponsePaginationMixin, LimitOffsetPagination
+):
+    max_limit = 50
+
+    def get_paginated_response_schema(self, schema):
+        return self.get_envelope_schema(
+            schema,
+            "http://api.example.org/accounts/?{offset_param}=400&{limit_param}=100".format(
+                offset_param=self.offset_query_param,
+                limit_param=self.limit_query_param,
+            ),
+            "http://api.example.org/accounts/?{offset_param}=200&{limit_param}=100".format(
+                offset_param=self.offset_query_param,
+                limit_param=self.limit_query_param,
+            ),
+        )
+
+
+class CustomCursorPagination(SuccessResponsePaginationMixin, BasePagination):
+    """
+    Keyset pagination, a page starts after the ordering values of the last row
+    of the previous page, so every page costs the same at any depth.
+
+    The ordering is the one of the queryset, as set by an ordering filter, or
+    `ordering`, and `id` is added to break ties. Ordering fields must not be
+    null. The count is skipped unless `?count=exact` or `?count=estimate` is
+    asked for, the estimate is the one of the query planner on PostgreSQL.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    count_query_param = "count"
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 50
+    ordering = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.key_fields = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self.get_position(queryset, position)
+
+        self.count = self.get_count(queryset, request)
+
+        ordering = self.key_fields
+        if reverse:
+            ordering = [self.flip(field) for field in ordering]
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, position))
+        rows = list(queryset.order_by(*ordering)[: self.limit + 1])
+        has_more = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        if reverse:
+            self.page.reverse()
+
+        # Coming back from a page means there is one after
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        return self.page
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field for field in queryset.query.order_by if isinstance(field, str)
+        ]
+        ordering = ordering or list(self.ordering)
+        if not {"id", "pk"} & {field.lstrip("-") for field in ordering}:
+            ordering.append("-id" if ordering[-1].startswith("-") else "id")
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def keyset_filter(ordering, position):
+        """
+        (a, b) after (x, y) is `a > x or (a = x and b > y)`, with the
+        comparisons turned for descending fields.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def get_count(self, queryset, request):
+        count = request.query_params.get(self.count_query_param)
+        if count == "estimate":
+            return self.estimate_count(queryset)
+        if count == "exact":
+            return queryset.count()
+        return None
+
+    @staticmethod
+    def estimate_count(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return queryset.count()
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]["Plan Rows"]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor["p"], bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.key_fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_position(self, queryset, position):
+        """
+        The values of a cursor as the types of their fields, a cursor can be
+        edited by hand.
+        """
+        query = queryset.query.chain()
+        values = []
+        for field, value in zip(self.key_fields, position):
+            output_field = query.resolve_ref(field.lstrip("-")).output_field
+            try:
+                value = output_field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            # Ordering fields are never null
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, row, reverse):
+        position = [
+            reduce(getattr, field.lstrip("-").split("__"), row)
+            for field in self.key_fields
+        ]
+        cursor = {"p": position, "r": reverse} if reverse else {"p": position}
+        encoded = json.dumps(cursor, cls=CursorEncoder, separators=(",", ":"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(encoded.encode()).decode(),
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # An empty cursor is the first page
+            return replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param, ""
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response_schema(self, schema):
+        url = f"http://api.example.org/accounts/?{self.cursor_query_param}="
+        envelope = self.get_envelope_schema(
+            schema, url + "eyJwIjpbNDhdfQ==", url + "eyJwIjpbMTNdLCJyIjp0cnVlfQ=="
+        )
+        envelope["properties"]["count"]["nullable"] = True
+        return envelope
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The cursor of a next or previous link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`exact` or `estimate` to count the results",
+                "schema": {"type": "string", "enum": ["exact", "estimate"]},
+            },
+        ]
+
+
+class CustomLimitOffsetOrCursorPagination(BasePagination):
+    """
+    Limit and offset pages, as the lists always had, or cursor pages for the
+    requests that ask for them with `?cursor=`, empty for the first page.
+    """
+
+    limit_offset_class = CustomLimitOffsetPagination
+    cursor_class = CustomCursorPagination
+
+    def __init__(self):
+        self.limit_offset = self.limit_offset_class()
+        self.cursor = self.cursor_class()
+        self.paginator = self.limit_offset
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor.cursor_query_param in request.query_params:
+            self.paginator = self.cursor
+        else:
+            self.paginator = self.limit_offset
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = {}
+        for paginator in (self.limit_offset, self.cursor):
+            for parameter in paginator.get_schema_operation_parameters(view):
+                parameters.setdefault(parameter["name"], parameter)
+        return list(parameters.values())
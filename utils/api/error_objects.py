@@ -21,6 +21,8 @@ class ErrorObject(dict, Enum):
     INSTRUCTOR_NOT_EXISTS = {"code": 1105, "msg": "INSTRUCTOR_NOT_EXISTS"}
     GOOGLE_CREDENTIAL_NOT_FOUND = {"code": 1106, "msg": "GOOGLE_CREDENTIAL_NOT_FOUND"}
     NOT_VALID_EVENTS_ERROR = {"code": 1107, "msg": "NOT_VALID_EVENTS_ERROR"}
+    IDEMPOTENCY_KEY_REUSED = {"code": 1108, "msg": "IDEMPOTENCY_KEY_REUSED"}
+    EVENT_JOB_NOT_FOUND = {"code": 1109, "msg": "EVENT_JOB_NOT_FOUND"}
     # Schedule app
     SCHEDULE_NOT_EXISTS = {"code": 2001, "msg": "SCHEDULE_NOT_EXISTS"}
     SCHEDULE_OVERLAPS = {"code": 2002, "msg": "SCHEDULE_OVERLAPS"}
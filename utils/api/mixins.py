@@ -1,6 +1,7 @@
 from rest_framework import status
 
 from utils.api.error_objects import ErrorObject
+from utils.api.query_plan import get_query_plan
 from utils.api.responses import error_response
 
 
@@ -19,3 +20,14 @@ class BadRequestSerializerMixin:
             status_code=status.HTTP_400_BAD_REQUEST,
             params=serializer.errors,
         )
+
+
+class QueryPlanMixin:
+    """
+    Load what the serializer renders along with the queryset of a generic
+    view, see utils.api.query_plan.QueryPlan.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return get_query_plan(self.get_serializer()).apply(queryset)
@@ -0,0 +1,139 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """
+    The select_related, prefetch_related and only() a queryset of `model`
+    needs so a serializer renders it without a query per object.
+
+    Serializer fields are followed through their source to the model fields.
+    Anything the model fields cannot tell, a SerializerMethodField or a
+    property, loads every column of its model unless the serializer lists
+    what it reads in `Meta.field_dependencies`:
+
+        field_dependencies = {"name": ["user__first_name", "user__last_name"]}
+
+    A dependency that ends on a relation only needs the related object.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.select_related = set()
+        self.prefetches = {}
+        self.fields = set()
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        plan = cls(serializer.Meta.model)
+        plan.add_serializer(serializer, plan.model, "")
+        return plan
+
+    def add_serializer(self, serializer, model, prefix):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        meta = getattr(serializer, "Meta", None)
+        dependencies = getattr(meta, "field_dependencies", {})
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in dependencies:
+                for path in dependencies[name]:
+                    self.add_path(model, prefix, path.split("__"))
+            elif isinstance(field, serializers.SerializerMethodField):
+                self.load_all(model, prefix)
+            elif field.source == "*":
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, model, prefix)
+                else:
+                    self.load_all(model, prefix)
+            else:
+                self.add_path(model, prefix, field.source_attrs, field)
+
+    def add_path(self, model, prefix, attrs, field=None):
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or a method, what it reads has to be loaded
+                self.load_all(model, prefix)
+                return
+            path = prefix + attr
+            if not model_field.is_relation:
+                self.fields.add(path)
+                return
+
+            rest = attrs[index + 1 :]
+            if model_field.one_to_many or model_field.many_to_many:
+                self.add_prefetch(path, model_field, rest, field)
+                return
+            if (
+                not rest
+                and model_field.concrete
+                and isinstance(field, serializers.RelatedField)
+                and field.use_pk_only_optimization()
+            ):
+                # The foreign key column is enough
+                self.fields.add(path)
+                return
+
+            if model_field.concrete:
+                self.fields.add(path)
+            self.select_related.add(path)
+            model = model_field.related_model
+            prefix = path + "__"
+
+        if isinstance(field, serializers.BaseSerializer):
+            self.add_serializer(field, model, prefix)
+        elif field is not None:
+            self.load_all(model, prefix)
+
+    def add_prefetch(self, path, model_field, rest, field):
+        related_model = model_field.related_model
+        plan = self.prefetches.setdefault(path, QueryPlan(related_model))
+        if model_field.one_to_many:
+            # Prefetched rows are matched back to their parent by this key
+            plan.fields.add(model_field.field.name)
+        if rest:
+            plan.add_path(related_model, "", rest, field)
+        elif isinstance(field, serializers.BaseSerializer):
+            plan.add_serializer(field, related_model, "")
+        elif field is not None and not isinstance(field, serializers.ManyRelatedField):
+            plan.load_all(related_model, "")
+
+    def load_all(self, model, prefix):
+        for model_field in model._meta.concrete_fields:
+            self.fields.add(prefix + model_field.name)
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        for path, plan in sorted(self.prefetches.items()):
+            prefetch_queryset = plan.apply(plan.model._default_manager.all())
+            queryset = queryset.prefetch_related(
+                Prefetch(path, queryset=prefetch_queryset)
+            )
+        if self.fields:
+            # A related manager sets its instance on each row by the key it
+            # filters on, which has to be loaded for that
+            related_keys = {field.name for field in queryset._known_related_objects}
+            queryset = queryset.only(*sorted(self.fields | related_keys))
+        return queryset
+
+
+_plans = {}
+
+
+def get_query_plan(serializer):
+    """
+    The plan of a serializer class, built once per process.
+    """
+    serializer_class = type(serializer)
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer_class = type(serializer.child)
+    if serializer_class not in _plans:
+        _plans[serializer_class] = QueryPlan.for_serializer(serializer)
+    return _plans[serializer_class]
@@ -0,0 +1,117 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def model_tag(model, pk):
+    """
+    The tag of the row `pk` of `model`, e.g. `faculty.department:3`.
+    """
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def _purged_key(tag):
+    return f"response-cache:purged:{tag}"
+
+
+def purge_tags(*tags):
+    """
+    Invalidate the cached responses built from any of these tags. Done again
+    once the transaction commits, a response may be built from the old rows
+    meanwhile.
+    """
+
+    def purge():
+        # A purge only has to outlive the responses built before it
+        cache.set_many(
+            {_purged_key(tag): time.time() for tag in tags},
+            timeout=settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+    purge()
+    transaction.on_commit(purge)
+
+
+class ResponseCache:
+    """
+    Cache of the 200 responses of a GET endpoint by path and query string.
+    Every response is stored with the tags of the rows it was built from and
+    the time the build started. It is served while none of its tags has
+    been purged since.
+    """
+
+    registry = {}
+
+    def __init__(self, name):
+        self.name = name
+        ResponseCache.registry[name] = self
+
+    def get_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        digest = hashlib.sha1(f"{request.path}?{query}".encode()).hexdigest()
+        # Bumping the namespace drops every cached response, e.g. when the
+        # responses change shape
+        namespace = settings.RESPONSE_CACHE_NAMESPACE
+        return f"response-cache:{namespace}:{self.name}:{digest}"
+
+    def _stats_key(self, outcome):
+        return f"response-cache:stats:{self.name}:{outcome}"
+
+    def count(self, outcome):
+        key = self._stats_key(outcome)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+    def get_stats(self):
+        counts = cache.get_many([self._stats_key("hit"), self._stats_key("miss")])
+        hits = counts.get(self._stats_key("hit"), 0)
+        misses = counts.get(self._stats_key("miss"), 0)
+        requests = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / requests if requests else None,
+        }
+
+    def is_fresh(self, entry):
+        purged = cache.get_many([_purged_key(tag) for tag in entry["tags"]])
+        return all(purged_at < entry["built_at"] for purged_at in purged.values())
+
+    def get_response(self, request, build_response):
+        """
+        The cached response of the request, or the one of `build_response()`,
+        which returns the response and the tags of the rows it read.
+        """
+        key = self.get_key(request)
+        entry = cache.get(key)
+        if entry is not None and self.is_fresh(entry):
+            self.count("hit")
+            response = Response(entry["data"], entry["status"])
+            response["X-Cache"] = "HIT"
+            return response
+
+        self.count("miss")
+        built_at = time.time()
+        response, tags = build_response()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                key,
+                {
+                    "data": response.data,
+                    "status": response.status_code,
+                    "tags": list(tags),
+                    "built_at": built_at,
+                },
+                timeout=settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        response["X-Cache"] = "MISS"
+        return response
@@ -1,3 +1,4 @@
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -24,3 +25,17 @@ def error_response(
         },
     }
     return Response(response_data, status_code)
+
+
+def conditional_response(request, etag: str, build_response) -> Response:
+    """
+    304 if the If-None-Match of the request matches `etag`, otherwise the
+    response of `build_response()`. Either way it carries the ETag.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build_response()
+    response["ETag"] = etag
+    return response
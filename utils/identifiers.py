@@ -0,0 +1,152 @@
+from django.apps import apps
+from django.db import connections
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+# Spreads consecutive values over a space of identifiers so they do not read
+# as a count. A prime, coprime with the size of every space, so that
+# `n * PERMUTATION_MULTIPLIER + PERMUTATION_OFFSET` modulo the size is a
+# permutation of the space.
+PERMUTATION_MULTIPLIER = 715827883
+PERMUTATION_OFFSET = 48271
+
+# `schedule-2024-5-1-A1234`, a letter and a number from 1000, one digit more
+# than the random codes that came before, so the two never meet
+SCHEDULE_CODE_LETTERS = 26
+SCHEDULE_CODE_NUMBER_START = 1000
+SCHEDULE_CODE_SPACE = SCHEDULE_CODE_LETTERS * 9000
+
+# `#123456789`, nine digits where the random ticket numbers before had eight
+TICKET_NUMBER_START = 10**8
+TICKET_NUMBER_SPACE = 9 * 10**8
+
+
+def permute(n, space):
+    return (n * PERMUTATION_MULTIPLIER + PERMUTATION_OFFSET) % space
+
+
+def unpermute(m, space):
+    inverse = pow(PERMUTATION_MULTIPLIER, -1, space)
+    return ((m - PERMUTATION_OFFSET) * inverse) % space
+
+
+class IdentifierSequence:
+    """
+    A counter shared by every process, from 0, each value is handed out once.
+    It is a sequence on PostgreSQL, which is durable and does not wait for
+    other transactions, and a redis counter on the other databases. Either
+    way it costs one round trip.
+
+    A redis counter can be lost to an eviction or a flush, so when its key is
+    missing it is set again from `start`, a callable returning the value after
+    the highest one in use.
+    """
+
+    # Increments the counter only if it is there, so that a lost counter is
+    # never started over from 0
+    INCREMENT = """
+        if redis.call("EXISTS", KEYS[1]) == 1 then
+            return redis.call("INCR", KEYS[1])
+        end
+        return false
+    """
+
+    def __init__(self, name, start=lambda: 0):
+        self.name = name
+        self.start = start
+
+    @property
+    def sequence_name(self):
+        return f"{self.name}_seq"
+
+    @property
+    def redis_key(self):
+        return f"identifiers:{self.name}"
+
+    def create(self, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"CREATE SEQUENCE IF NOT EXISTS {self.sequence_name} "
+                "MINVALUE 0 START 0"
+            )
+
+    def drop(self, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(f"DROP SEQUENCE IF EXISTS {self.sequence_name}")
+
+    def next_value(self, using="default"):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT nextval(%s)", [self.sequence_name])
+                return cursor.fetchone()[0]
+        redis = get_redis_connection("default")
+        while True:
+            value = redis.eval(self.INCREMENT, 1, self.redis_key)
+            if value is not None:
+                return value - 1
+            # Whichever process sets it first wins, values are only handed out
+            # once it is set
+            redis.set(self.redis_key, self.start(), nx=True)
+
+
+def _schedule_code_start():
+    Schedule = apps.get_model("schedule", "Schedule")
+    # Only the codes with four digit numbers or more come from the sequence
+    codes = Schedule.objects.filter(code__regex=r"-[A-Z][1-9][0-9]{3,}$")
+    values = codes.values_list("code", flat=True).iterator()
+    return max(map(decode_schedule_code, values), default=-1) + 1
+
+
+def _ticket_number_start():
+    Ticket = apps.get_model("ticket", "Ticket")
+    # Only the nine digit ticket numbers come from the sequence
+    tickets = Ticket.objects.filter(ticket_number__regex=r"^#[1-9][0-9]{8}$")
+    values = tickets.values_list("ticket_number", flat=True).iterator()
+    return max(map(decode_ticket_number, values), default=-1) + 1
+
+
+schedule_code_sequence = IdentifierSequence("schedule_code", _schedule_code_start)
+ticket_number_sequence = IdentifierSequence("ticket_number", _ticket_number_start)
+
+
+def encode_schedule_code(n, date):
+    """
+    The schedule code of the value `n` of its sequence. The values past the
+    space of four digit numbers go on with longer numbers.
+    """
+    if n < SCHEDULE_CODE_SPACE:
+        n = permute(n, SCHEDULE_CODE_SPACE)
+    letter = chr(ord("A") + n % SCHEDULE_CODE_LETTERS)
+    number = SCHEDULE_CODE_NUMBER_START + n // SCHEDULE_CODE_LETTERS
+    return f"schedule-{date.year}-{date.month}-{date.day}-{letter}{number}"
+
+
+def decode_schedule_code(code):
+    """
+    The value of the sequence a schedule code was made of.
+    """
+    suffix = code.rsplit("-", 1)[1]
+    letter, number = ord(suffix[0]) - ord("A"), int(suffix[1:])
+    n = (number - SCHEDULE_CODE_NUMBER_START) * SCHEDULE_CODE_LETTERS + letter
+    if n < SCHEDULE_CODE_SPACE:
+        n = unpermute(n, SCHEDULE_CODE_SPACE)
+    return n
+
+
+def encode_ticket_number(n):
+    if n >= TICKET_NUMBER_SPACE:
+        raise ValueError("Ticket numbers are used up")
+    return f"#{TICKET_NUMBER_START + permute(n, TICKET_NUMBER_SPACE)}"
+
+
+def decode_ticket_number(ticket_number):
+    return unpermute(int(ticket_number[1:]) - TICKET_NUMBER_START, TICKET_NUMBER_SPACE)
+
+
+def next_schedule_code():
+    return encode_schedule_code(schedule_code_sequence.next_value(), timezone.now())
+
+
+def next_ticket_number():
+    return encode_ticket_number(ticket_number_sequence.next_value())
@@ -0,0 +1,31 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin:
+    """
+    Assertions on the number of queries of the API test cases.
+    """
+
+    def assertConstantQueries(self, url, page_sizes=(1, 5), data=None):
+        """
+        Get full pages of `url` in each size and assert they all take the
+        same number of queries, so no query is made per object.
+        """
+        counts = {}
+        for page_size in page_sizes:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, {**(data or {}), "limit": page_size})
+            self.assertEqual(response.status_code, 200)
+            results = response.json()["data"]["results"]
+            self.assertEqual(
+                len(results), page_size, "Not enough objects for a full page"
+            )
+            counts[page_size] = len(context.captured_queries)
+
+        self.assertEqual(
+            len(set(counts.values())),
+            1,
+            f"Queries by page size {counts}, last page:\n"
+            + "\n".join(query["sql"] for query in context.captured_queries),
+        )
@@ -0,0 +1,100 @@
+import datetime
+import random
+import re
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django_redis import get_redis_connection
+
+from utils.identifiers import (SCHEDULE_CODE_SPACE, TICKET_NUMBER_SPACE,
+                               IdentifierSequence, decode_schedule_code,
+                               decode_ticket_number, encode_schedule_code,
+                               encode_ticket_number, ticket_number_sequence)
+from ticket.models import Ticket
+
+DAY = datetime.date(2026, 10, 18)
+SCHEDULE_CODE = re.compile(r"^schedule-2026-10-18-[A-Z][1-9]\d{3,}$")
+TICKET_NUMBER = re.compile(r"^#[1-9]\d{8}$")
+
+
+class TestIdentifierFormats(SimpleTestCase):
+    """
+    An encoding that decodes back to its value gives every value of the
+    sequence its own identifier.
+    """
+
+    def test_millions_of_ticket_numbers(self):
+        values = list(range(2_000_000))
+        values += random.Random(0).sample(range(TICKET_NUMBER_SPACE), 100_000)
+        values.append(TICKET_NUMBER_SPACE - 1)
+
+        for n in values:
+            ticket_number = encode_ticket_number(n)
+            self.assertTrue(TICKET_NUMBER.match(ticket_number), ticket_number)
+            self.assertEqual(decode_ticket_number(ticket_number), n)
+        with self.assertRaises(ValueError):
+            encode_ticket_number(TICKET_NUMBER_SPACE)
+
+    def test_every_schedule_code_of_the_space_and_past_it(self):
+        codes = set()
+        for n in range(SCHEDULE_CODE_SPACE * 4):
+            code = encode_schedule_code(n, DAY)
+            self.assertTrue(SCHEDULE_CODE.match(code), code)
+            codes.add(code)
+            self.assertEqual(decode_schedule_code(code), n)
+
+        self.assertEqual(len(codes), SCHEDULE_CODE_SPACE * 4)
+        self.assertLessEqual(len(encode_schedule_code(10**9, DAY)), 30)
+
+    def test_consecutive_values_are_spread(self):
+        self.assertNotEqual(
+            int(encode_ticket_number(1)[1:]) - int(encode_ticket_number(0)[1:]), 1
+        )
+
+    def test_apart_from_the_random_identifiers_before(self):
+        # Those were an 8 digit ticket number and a letter and 3 digits
+        self.assertEqual(len(encode_ticket_number(0)), 10)
+        self.assertRegex(encode_schedule_code(0, DAY), r"-[A-Z]\d{4}$")
+
+
+class TestIdentifierSequence(TestCase):
+    def setUp(self):
+        self.sequence = IdentifierSequence("test")
+        get_redis_connection("default").delete(self.sequence.redis_key)
+        # The schema editor of SQLite cannot run in the test transaction
+        if connection.vendor == "postgresql":
+            with connection.schema_editor() as schema_editor:
+                self.sequence.drop(schema_editor)
+                self.sequence.create(schema_editor)
+
+    def test_values_are_handed_out_once(self):
+        # A query for each value on PostgreSQL, none on redis
+        queries = 1000 if connection.vendor == "postgresql" else 0
+        with self.assertNumQueries(queries):
+            values = [self.sequence.next_value() for _ in range(1000)]
+
+        self.assertEqual(values, list(range(1000)))
+
+
+class TestIdentifierSequenceStart(TestCase):
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("A sequence is not lost like a redis counter")
+        get_redis_connection("default").delete(ticket_number_sequence.redis_key)
+
+    def test_lost_counter_goes_on_after_the_values_in_use(self):
+        Ticket.objects.bulk_create(
+            [
+                Ticket(title="new", ticket_number=encode_ticket_number(41)),
+                Ticket(title="new", ticket_number=encode_ticket_number(7)),
+                Ticket(title="old", ticket_number="#99999999"),
+            ]
+        )
+
+        self.assertEqual(ticket_number_sequence.next_value(), 42)
+        self.assertEqual(ticket_number_sequence.next_value(), 43)
+
+    def test_lost_counter_starts_from_0_without_values(self):
+        Ticket.objects.bulk_create([Ticket(title="old", ticket_number="#99999999")])
+
+        self.assertEqual(ticket_number_sequence.next_value(), 0)